@@ -1,203 +1,4085 @@
-﻿import os
+﻿import argparse
+import base64
+import cProfile
+import csv
+import gc
+import glob
+import hashlib
+import importlib
+import importlib.util
+import json
+import os
+import queue
 import re
+import shutil
+import signal
+import subprocess
+import sys
+import tarfile
+import tempfile
+import threading
+import time
+import urllib.parse
+import zipfile
+from collections import OrderedDict, deque, namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import ExitStack, contextmanager
 from datetime import datetime
-import tkinter as tk
-from tkinter import filedialog, messagebox, ttk
-from PyPDF2 import PdfReader, PdfWriter
+from http import HTTPStatus
+from io import BytesIO, StringIO
+
+# Imported on first use (load_pypdf2(), load_pikepdf()) so the window opens
+# without waiting for them
+PdfReader = PdfWriter = None
+ArrayObject = DictionaryObject = IndirectObject = NameObject = StreamObject = None
+pikepdf = None  # optional, faster backend
+PIKEPDF_INSTALLED = importlib.util.find_spec("pikepdf") is not None
+asyncio = None  # only the HTTP server (SplitServer) needs it
+tk = ttk = filedialog = messagebox = simpledialog = None  # only the window needs them, see load_tk()
+
+
+def load_pypdf2():
+    global PdfReader, PdfWriter, ArrayObject, DictionaryObject, IndirectObject, NameObject, StreamObject
+    if PdfReader is None:
+        from PyPDF2 import PdfReader, PdfWriter
+        from PyPDF2.generic import ArrayObject, DictionaryObject, IndirectObject, NameObject, StreamObject
+
+
+def load_pikepdf():
+    global pikepdf
+    if pikepdf is None:
+        import pikepdf
+
+
+def load_asyncio():
+    global asyncio
+    if asyncio is None:
+        import asyncio
+
+
+def load_tk():
+    # The CLI modes (split, check, serve, watch) must run on Pythons built without Tk
+    global tk, ttk, filedialog, messagebox, simpledialog
+    if tk is None:
+        import tkinter as tk
+        from tkinter import filedialog, messagebox, simpledialog, ttk
+
+
+TEXTS = {
+    "ko": {
+        "title": "PDF Cutter",
+        "input": "인풋 파일",
+        "output": "아웃풋 경로",
+        "browse": "찾기",
+        "filename": "파일명",
+        "start": "시작 페이지",
+        "end": "종료 페이지",
+        "switch": "전환",
+        "count": "페이지 수",
+        "add_row": "+ 행 추가",
+        "offset": "페이지 오프셋 (PDF와 목차 페이지가 다를 때)",
+        "append": "파일명에 페이지 범위 추가 (예: Filename_1p_to_5p.pdf)",
+        "run": "실행",
+        "toggle": "한/A",
+        "err_title": "오류",
+        "err_input_required": "인풋 파일을 선택하세요.",
+        "err_input_not_found": "인풋 파일을 찾을 수 없습니다.",
+        "err_output_required": "아웃풋 경로를 선택하세요.",
+        "err_output_create": "아웃풋 폴더 생성 실패: {detail}",
+        "err_offset_int": "페이지 오프셋은 정수여야 합니다.",
+        "err_pdf_open": "PDF 열기 실패: {detail}",
+        "err_backend": "사용할 수 없는 PDF 백엔드: {name}",
+        "err_row_int": "행 {row}: {field}은(는) 정수여야 합니다.",
+        "err_row_start_required": "행 {row}: 시작 페이지는 필수입니다.",
+        "err_row_start_min": "행 {row}: 시작 페이지는 1 이상이어야 합니다.",
+        "err_row_end_mode": "행 {row}: End Page 모드에서는 페이지 수를 비워야 합니다.",
+        "err_row_count_mode": "행 {row}: 페이지 수 모드에서는 End Page를 비워야 합니다.",
+        "err_row_end_min": "행 {row}: 종료 페이지는 1 이상이어야 합니다.",
+        "err_row_end_lt": "행 {row}: 종료 페이지는 시작 페이지보다 작을 수 없습니다.",
+        "err_row_count_min": "행 {row}: 페이지 수는 1 이상이어야 합니다.",
+        "err_row_required": "최소 1개 이상의 유효한 행이 필요합니다.",
+        "err_start_oob": "행 {row}: 시작 페이지가 범위를 벗어났습니다.",
+        "err_end_oob": "행 {row}: 종료 페이지가 범위를 벗어났습니다.",
+        "err_end_before": "행 {row}: 보정 후 종료 페이지가 시작 페이지보다 이릅니다.",
+        "err_row_label": "행 {row}: 인쇄된 페이지 '{label}'을(를) 찾을 수 없습니다.",
+        "done_title": "완료",
+        "done_saved": "{count}개 파일을 저장했습니다:\n{path}",
+        "cancel": "취소",
+        "import_bookmarks": "책갈피에서 가져오기",
+        "detect": "자동 감지",
+        "detect_labels": "PageLabels에서 감지: 오프셋 {offset}",
+        "detect_text": "본문 페이지 번호에서 감지: 오프셋 {offset}",
+        "err_detect_none": "페이지 번호를 감지하지 못했습니다.",
+        "printed": "시작/종료에 인쇄된 페이지 번호 사용 (예: iv, 12)",
+        "bookmark_depth_title": "책갈피 가져오기",
+        "bookmark_depth_prompt": "가져올 책갈피 깊이 (1 = 최상위만):",
+        "err_no_bookmarks": "가져올 책갈피가 없습니다.",
+        "warn_bookmarks_skipped": "인쇄된 1페이지 앞의 책갈피 {count}개는 가져오지 않았습니다: {titles}",
+        "optimize": "출력 최적화 (공유 리소스 중복 제거, 압축)",
+        "low_memory": "저메모리 모드 (수 GB 대용량 PDF용, 조금 느림)",
+        "size_summary": "입력 {input} → 출력 합계 {output}",
+        "incremental": "변경된 구간만 다시 쓰기 (이전 실행 결과 재사용)",
+        "incremental_summary": "새로 씀 {written}개, 변경 없음 {skipped}개, 이전 파일 삭제 {removed}개",
+        "status_progress": "파일 {segments_done}/{segments_total} · 페이지 {pages_done}/{pages_total} · {size} · 남은 시간 {eta}",
+        "cancelled_title": "취소됨",
+        "cancelled_saved": "취소되었습니다. 완료된 {count}개 파일은 유지됩니다:\n{path}",
+        "err_duplicate_name": "행 {row}: 출력 파일명 '{name}'이(가) 행 {other}와 같습니다.",
+        "warn_overlap": "행 {row}와 행 {other}의 범위가 겹칩니다 ({first}~{last}페이지).",
+        "warn_gap": "행 {row}와 행 {other} 사이의 {first}~{last}페이지는 어느 파일에도 들어가지 않습니다.",
+        "more_problems": "... 외 {count}개",
+        "plan": "분할 계획",
+        "plan_import": "파일에서 가져오기 (CSV/TSV/JSON)...",
+        "plan_export": "파일로 내보내기...",
+        "plan_paste": "클립보드에서 붙여넣기",
+        "plan_copy": "클립보드로 복사",
+        "plan_loaded": "{count}개 행을 불러왔습니다.",
+        "plan_problems_title": "분할 계획 확인",
+        "plan_warnings_continue": "\n\n그래도 계속할까요?",
+        "input_reading": "읽는 중...",
+        "input_pages": "{pages}쪽",
+        "input_unreadable": "PDF를 읽을 수 없음",
+        "plan_ok": "계획 이상 없음",
+        "plan_status": "오류 {errors}개, 경고 {warnings}개 - {first}",
+        "preview": "페이지 미리보기 (행의 첫/마지막 페이지)",
+        "preview_unavailable": "미리보기에는 PyMuPDF 또는 poppler(pdftoppm)가 필요합니다.",
+        "batch_summary": "{total}개 중 {done}개 파일 완료, {pages}페이지 / {seconds:.1f}초 ({rate:.0f} 페이지/초)",
+        "batch_failures": "실패 {count}개:",
+        "batch_cancelled": "취소됨",
+        "batch_progress": "파일 {done}/{total} 완료",
+        "batch_inputs": "PDF {count}개",
+        "err_plan_read": "분할 계획을 읽을 수 없습니다: {detail}",
+        "err_clipboard_empty": "클립보드에 분할 계획이 없습니다.",
+        "plan_every": "N페이지마다 나누기...",
+        "plan_max_size": "최대 파일 크기로 나누기...",
+        "chunk_title": "자동 분할",
+        "chunk_pages_prompt": "파일당 페이지 수:",
+        "chunk_size_prompt": "파일 최대 크기 (MB):",
+        "err_every_min": "N페이지마다 나누기의 N은 1 이상이어야 합니다.",
+        "err_max_size_min": "최대 파일 크기는 0보다 커야 합니다.",
+        "archive": "ZIP 파일 하나로 저장 (아웃풋 폴더에 <인풋 이름>.zip)",
+    },
+    "en": {
+        "title": "PDF Cutter",
+        "input": "Input File",
+        "output": "Output Folder",
+        "browse": "Browse",
+        "filename": "Filename",
+        "start": "Start Page",
+        "end": "End Page",
+        "switch": "Switch",
+        "count": "Page Count",
+        "add_row": "+ Add Row",
+        "offset": "Page Offset (use when PDF page numbers differ)",
+        "append": "Append page range to filename (e.g., Filename_1p_to_5p.pdf)",
+        "run": "Run",
+        "toggle": "A/한",
+        "err_title": "Error",
+        "err_input_required": "Input file is required.",
+        "err_input_not_found": "Input file not found.",
+        "err_output_required": "Output folder is required.",
+        "err_output_create": "Cannot create output folder: {detail}",
+        "err_offset_int": "Page Offset must be an integer.",
+        "err_pdf_open": "Failed to open PDF: {detail}",
+        "err_backend": "PDF backend not available: {name}",
+        "err_row_int": "Row {row}: {field} must be an integer.",
+        "err_row_start_required": "Row {row}: Start Page is required.",
+        "err_row_start_min": "Row {row}: Start Page must be >= 1.",
+        "err_row_end_mode": "Row {row}: Page Count must be empty in End Page mode.",
+        "err_row_count_mode": "Row {row}: End Page must be empty in Page Count mode.",
+        "err_row_end_min": "Row {row}: End Page must be >= 1.",
+        "err_row_end_lt": "Row {row}: End Page cannot be less than Start Page.",
+        "err_row_count_min": "Row {row}: Page Count must be > 0.",
+        "err_row_required": "At least one valid row is required.",
+        "err_start_oob": "Row {row}: Start Page out of range.",
+        "err_end_oob": "Row {row}: End Page out of range.",
+        "err_end_before": "Row {row}: End Page earlier than Start Page after offset.",
+        "err_row_label": "Row {row}: printed page '{label}' not found.",
+        "done_title": "Done",
+        "done_saved": "Saved {count} files to:\n{path}",
+        "cancel": "Cancel",
+        "import_bookmarks": "Import from bookmarks",
+        "detect": "Detect",
+        "detect_labels": "Detected from PageLabels: offset {offset}",
+        "detect_text": "Detected from printed page numbers: offset {offset}",
+        "err_detect_none": "Could not detect page numbers.",
+        "printed": "Start/End are printed page labels (e.g., iv, 12)",
+        "bookmark_depth_title": "Import Bookmarks",
+        "bookmark_depth_prompt": "Outline depth to import (1 = top level only):",
+        "err_no_bookmarks": "No bookmarks to import.",
+        "warn_bookmarks_skipped": "{count} bookmarks before printed page 1 were not imported: {titles}",
+        "optimize": "Optimize output (dedupe shared resources, compress)",
+        "low_memory": "Low-memory mode (for multi-GB PDFs, a bit slower)",
+        "size_summary": "Input {input} -> total output {output}",
+        "incremental": "Only rewrite changed segments (reuse the previous run)",
+        "incremental_summary": "Wrote {written}, skipped {skipped} unchanged, removed {removed} old files",
+        "status_progress": "Files {segments_done}/{segments_total} · Pages {pages_done}/{pages_total} · {size} · ETA {eta}",
+        "cancelled_title": "Cancelled",
+        "cancelled_saved": "Cancelled. {count} finished files were kept in:\n{path}",
+        "err_duplicate_name": "Row {row}: output file name '{name}' is the same as row {other}.",
+        "warn_overlap": "Rows {row} and {other} overlap (pages {first}-{last}).",
+        "warn_gap": "Pages {first}-{last} between rows {row} and {other} are not in any file.",
+        "more_problems": "... and {count} more",
+        "plan": "Split plan",
+        "plan_import": "Import from file (CSV/TSV/JSON)...",
+        "plan_export": "Export to file...",
+        "plan_paste": "Paste from clipboard",
+        "plan_copy": "Copy to clipboard",
+        "plan_loaded": "Loaded {count} rows.",
+        "plan_problems_title": "Check Split Plan",
+        "plan_warnings_continue": "\n\nContinue anyway?",
+        "input_reading": "Reading...",
+        "input_pages": "{pages} pages",
+        "input_unreadable": "Cannot read PDF",
+        "plan_ok": "Plan OK",
+        "plan_status": "{errors} errors, {warnings} warnings - {first}",
+        "preview": "Page preview (first/last page of each row)",
+        "preview_unavailable": "Page previews need PyMuPDF or poppler (pdftoppm).",
+        "batch_summary": "{done} of {total} files split, {pages} pages in {seconds:.1f}s ({rate:.0f} pages/s)",
+        "batch_failures": "{count} failed:",
+        "batch_cancelled": "cancelled",
+        "batch_progress": "{done}/{total} files done",
+        "batch_inputs": "{count} PDFs",
+        "err_plan_read": "Cannot read the split plan: {detail}",
+        "err_clipboard_empty": "The clipboard has no split plan.",
+        "plan_every": "Every N pages...",
+        "plan_max_size": "By max file size...",
+        "chunk_title": "Auto Split",
+        "chunk_pages_prompt": "Pages per file:",
+        "chunk_size_prompt": "Largest file size (MB):",
+        "err_every_min": "Pages per file must be >= 1.",
+        "err_max_size_min": "Largest file size must be > 0.",
+        "archive": "Save as one ZIP file (<input name>.zip in the output folder)",
+    },
+}
+
+
+UNSAFE_FILENAME_CHARS = str.maketrans({ch: "_" for ch in r'\\/:*?"<>|'})
 
 
 def safe_filename(name: str) -> str:
-    bad = r'\\/:*?"<>|'
-    for ch in bad:
-        name = name.replace(ch, "_")
+    name = name.translate(UNSAFE_FILENAME_CHARS)
     name = name.strip()
     return name if name else "untitled"
 
 
-class SplitRow:
-    def __init__(self, parent, row_index, grid_row, on_change, confirm_switch, default_name=None):
-        self.row_index = row_index
-        self.on_change = on_change
-        self.confirm_switch = confirm_switch
+class RowModel:
+    """Split table rows as [filename, start, end, count, mode_use_end] lists.
+
+    Plain strings instead of Tk variables and widgets, so 10,000 rows load
+    in milliseconds; SplitTable only draws the rows that are on screen.
+    """
+
+    FIELDS = ("filename", "start", "end", "count")
+
+    def __init__(self):
+        self.rows = []
+
+    def __len__(self):
+        return len(self.rows)
+
+    def append(self, filename, start="", end="", count="", mode_use_end=True):
+        self.rows.append([filename, start, end, count, mode_use_end])
+
+    def insert(self, index, filename):
+        self.rows.insert(index, [filename, "", "", "", True])
+
+    def delete(self, index):
+        del self.rows[index]
+
+    def load(self, rows):
+        """Replace all rows with validate_rows() style tuples."""
+        self.rows = [list(row) for row in rows]
+
+    def get(self, index, field):
+        return self.rows[index][self.FIELDS.index(field)]
+
+    def set(self, index, field, value):
+        self.rows[index][self.FIELDS.index(field)] = value
+
+    def mode_use_end(self, index):
+        return self.rows[index][4]
+
+    def toggle_mode(self, index):
+        row = self.rows[index]
+        if row[4]:
+            row[2] = ""
+        else:
+            row[3] = ""
+        row[4] = not row[4]
+
+    def values(self):
+        return [tuple(row) for row in self.rows]
+
+
+class SplitTable:
+    """Scrollable split table that only has Treeview items for the visible lines.
+
+    The items are reused while scrolling; the scrollbar, selection and
+    keyboard work on model indexes. Up/Down/PageUp/PageDown/Home/End and
+    Left/Right move, Return, F2 or typing edits the cell, Tab/Shift+Tab go
+    to the next cell while editing, Escape cancels, space switches End Page /
+    Page Count (after confirm_switch, like the old <> button), Insert adds a
+    row and Delete removes one. new_name(index) names inserted rows;
+    on_view() is called whenever the visible lines or the current row
+    change.
+    """
+
+    COLUMNS = ("filename", "start", "end", "switch", "count")
+    EDITABLE = ("filename", "start", "end", "count")
+
+    def __init__(self, parent, model, confirm_switch, new_name, on_change=None, on_view=None):
+        self.model = model
+        self.confirm_switch = confirm_switch
+        self.new_name = new_name
+        self.on_change = on_change or (lambda: None)
+        self.on_view = on_view or (lambda: None)
+        self.top = 0
+        self.lines = 20
+        self.current = 0
+        self.column = "filename"
+        self.editor = None
+
+        self.frame = tk.Frame(parent, bd=1, relief="solid")
+        self.tree = ttk.Treeview(self.frame, columns=self.COLUMNS, show="headings", selectmode="browse", height=1)
+        self.scrollbar = ttk.Scrollbar(self.frame, orient="vertical", command=self.yview)
+        self.tree.grid(row=0, column=0, sticky="nsew")
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+        self.frame.rowconfigure(0, weight=1)
+        self.frame.columnconfigure(0, weight=1)
+
+        self.tree.column("filename", width=320, anchor="w")
+        for column in ("start", "end", "count"):
+            self.tree.column(column, width=70, minwidth=60, anchor="center")
+        self.tree.column("switch", width=40, minwidth=34, anchor="center", stretch=False)
+        self.tree.tag_configure("odd", background="#f5f5f5")
+
+        self.tree.bind("<Configure>", self._on_configure)
+        self.tree.bind("<Button-1>", self._on_click)
+        self.tree.bind("<Double-Button-1>", self._on_double_click)
+        self.tree.bind("<MouseWheel>", lambda e: self.yview("scroll", -1 if e.delta > 0 else 1, "units"))
+        self.tree.bind("<Button-4>", lambda e: self.yview("scroll", -1, "units"))
+        self.tree.bind("<Button-5>", lambda e: self.yview("scroll", 1, "units"))
+        keys = {
+            "<Up>": lambda e: self.focus_row(self.current - 1),
+            "<Down>": lambda e: self.focus_row(self.current + 1),
+            "<Prior>": lambda e: self.focus_row(self.current - self.lines),
+            "<Next>": lambda e: self.focus_row(self.current + self.lines),
+            "<Home>": lambda e: self.focus_row(0),
+            "<End>": lambda e: self.focus_row(len(self.model) - 1),
+            "<Left>": lambda e: self.move_column(-1),
+            "<Right>": lambda e: self.move_column(1),
+            "<Return>": lambda e: self.edit(),
+            "<F2>": lambda e: self.edit(),
+            "<space>": lambda e: self.toggle_mode(),
+            "<Insert>": lambda e: self.insert_row(),
+            "<Delete>": lambda e: self.delete_row(),
+        }
+        for sequence, handler in keys.items():
+            self.tree.bind(sequence, lambda e, handler=handler: handler(e) or "break")
+        self.tree.bind("<Key>", self._on_key)
+
+    def pack(self, **kwargs):
+        self.frame.pack(**kwargs)
+
+    def set_headings(self, filename, start, end, switch, count):
+        for column, text in zip(self.COLUMNS, (filename, start, end, switch, count)):
+            self.tree.heading(column, text=text, anchor="w" if column == "filename" else "center")
+
+    def display(self, index):
+        filename, start, end, count, mode_use_end = self.model.rows[index]
+        return (filename, start, end if mode_use_end else "X", "<>", "X" if mode_use_end else count)
+
+    def refresh(self):
+        """Redraw after the model changed."""
+        self.current = max(0, min(self.current, len(self.model) - 1))
+        self.render()
+
+    def render(self):
+        count = len(self.model)
+        self.top = max(0, min(self.top, count - self.lines))
+        wanted = min(self.lines, count - self.top)
+        items = self.tree.get_children()
+        if len(items) > wanted:
+            self.tree.delete(*items[wanted:])
+        for n in range(len(items), wanted):
+            self.tree.insert("", "end", iid=f"line{n}")
+        for n in range(wanted):
+            index = self.top + n
+            self.tree.item(f"line{n}", values=self.display(index), tags=("odd",) if index % 2 else ())
+        if self.top <= self.current < self.top + wanted:
+            self.tree.selection_set(f"line{self.current - self.top}")
+        else:
+            self.tree.selection_set(())
+        if count:
+            self.scrollbar.set(self.top / count, (self.top + wanted) / count)
+        else:
+            self.scrollbar.set(0, 1)
+        self.on_view()
+
+    def yview(self, *args):
+        self.end_edit()
+        if args[0] == "moveto":
+            self.top = int(float(args[1]) * len(self.model))
+        elif args[0] == "scroll":
+            self.top += int(args[1]) * (self.lines if args[2] == "pages" else 1)
+        self.render()
+
+    def focus_row(self, index):
+        if not len(self.model):
+            return
+        self.current = max(0, min(index, len(self.model) - 1))
+        if self.current < self.top:
+            self.top = self.current
+        elif self.current >= self.top + self.lines:
+            self.top = self.current - self.lines + 1
+        self.render()
+
+    def move_column(self, step):
+        pos = self.EDITABLE.index(self.column) + step
+        self.column = self.EDITABLE[max(0, min(pos, len(self.EDITABLE) - 1))]
+
+    def editable(self, index, column):
+        if column == "end":
+            return self.model.mode_use_end(index)
+        if column == "count":
+            return not self.model.mode_use_end(index)
+        return column in self.EDITABLE
+
+    def edit(self, column=None, text=None):
+        column = column or self.column
+        index = self.current
+        if not 0 <= index < len(self.model) or not self.editable(index, column):
+            self.tree.bell()
+            return
+        self.focus_row(index)
+        bbox = self.tree.bbox(f"line{index - self.top}", column)
+        if not bbox:
+            return
+        self.column = column
+        var = tk.StringVar(value=self.model.get(index, column) if text is None else text)
+        entry = ttk.Entry(self.tree, textvariable=var, justify="left" if column == "filename" else "center")
+        x, y, width, height = bbox
+        entry.place(x=x, y=y, width=width, height=height)
+        entry.focus_set()
+        if text is None:
+            entry.select_range(0, "end")
+        entry.icursor("end")
+        self.editor = (entry, var, index, column)
+        entry.bind("<Return>", lambda e: self._commit_and_move(1))
+        entry.bind("<Tab>", lambda e: self._edit_next(1))
+        entry.bind("<Shift-Tab>", lambda e: self._edit_next(-1))
+        entry.bind("<ISO_Left_Tab>", lambda e: self._edit_next(-1))
+        entry.bind("<Escape>", lambda e: self.end_edit(commit=False))
+        entry.bind("<FocusOut>", lambda e: self.end_edit())
+
+    def end_edit(self, commit=True):
+        if self.editor is None:
+            return
+        entry, var, index, column = self.editor
+        self.editor = None
+        changed = commit and index < len(self.model) and var.get() != self.model.get(index, column)
+        if changed:
+            self.model.set(index, column, var.get())
+        entry.destroy()
+        self.render()
+        self.tree.focus_set()
+        if changed:
+            self.on_change()
+
+    def _commit_and_move(self, step):
+        self.end_edit()
+        self.focus_row(self.current + step)
+        return "break"
+
+    def _edit_next(self, step):
+        self.end_edit()
+        index, pos = self.current, self.EDITABLE.index(self.column)
+        while True:
+            pos += step
+            if pos >= len(self.EDITABLE):
+                index, pos = index + 1, 0
+            elif pos < 0:
+                index, pos = index - 1, len(self.EDITABLE) - 1
+            if not 0 <= index < len(self.model):
+                return "break"
+            if self.editable(index, self.EDITABLE[pos]):
+                break
+        self.current = index
+        self.edit(self.EDITABLE[pos])
+        return "break"
+
+    def toggle_mode(self, index=None):
+        index = self.current if index is None else index
+        if not 0 <= index < len(self.model):
+            return
+        if not self.confirm_switch(self.model.mode_use_end(index)):
+            return
+        self.model.toggle_mode(index)
+        self.render()
+        self.on_change()
+
+    def insert_row(self):
+        index = self.current + 1 if len(self.model) else 0
+        self.model.insert(index, self.new_name(index))
+        self.focus_row(index)
+        self.on_change()
+
+    def delete_row(self):
+        if not len(self.model):
+            return
+        self.model.delete(self.current)
+        self.refresh()
+        self.on_change()
+
+    def _cell(self, event):
+        if self.tree.identify_region(event.x, event.y) != "cell":
+            return None
+        line = self.tree.identify_row(event.y)
+        column = self.tree.identify_column(event.x)
+        if not line or not column:
+            return None
+        return self.top + self.tree.index(line), self.COLUMNS[int(column[1:]) - 1]
+
+    def _on_click(self, event):
+        cell = self._cell(event)
+        if cell is None:
+            return None
+        self.end_edit()
+        self.tree.focus_set()
+        self.current, column = cell
+        self.render()
+        if column == "switch":
+            self.toggle_mode()
+        else:
+            self.column = column
+        return "break"
+
+    def _on_double_click(self, event):
+        cell = self._cell(event)
+        if cell is None or cell[1] == "switch":
+            return None
+        self.edit(cell[1])
+        return "break"
+
+    def _on_key(self, event):
+        # Typing over a cell starts editing it, like a spreadsheet
+        if event.char and event.char.isprintable() and not event.state & 0x4:
+            self.edit(text=event.char)
+            return "break"
+        return None
+
+    def _on_configure(self, event):
+        header, row_height = 24, 20
+        items = self.tree.get_children()
+        bbox = self.tree.bbox(items[0]) if items else None
+        if bbox:
+            header, row_height = bbox[1], bbox[3]
+        lines = max(1, (event.height - header) // max(1, row_height))
+        if lines != self.lines:
+            self.end_edit()
+            self.lines = lines
+            self.render()
+
+
+def format_bytes(n) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if n < 1024 or unit == "GB":
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+
+
+def format_eta(seconds) -> str:
+    if seconds is None:
+        return "--:--"
+    seconds = int(round(seconds))
+    return f"{seconds // 60}:{seconds % 60:02d}"
+
+
+def parse_int(value):
+    if value is None or value == "":
+        return None
+    try:
+        n = int(value)
+    except ValueError:
+        raise ValueError("not_int")
+    return n
+
+
+# ---------------------------------------------------------------------------
+# Split engine (no Tk required)
+# ---------------------------------------------------------------------------
+
+Segment = namedtuple("Segment", "name start end first last")
+
+
+class SplitError(Exception):
+    """Raised by the engine with a message that is already translated."""
+
+
+def translate(code: str, key: str, **kwargs) -> str:
+    return TEXTS[code][key].format(**kwargs)
+
+
+def validate_rows(rows, total_pages, lang="en"):
+    """Check raw table rows.
+
+    rows: iterable of (filename, start, end, count, mode_use_end) where the
+    page fields are the strings typed by the user (or read from a manifest).
+    Returns (specs, errors) exactly like the table validation in the GUI.
+    """
+    numbered, errors = _check_rows(rows, lang)
+    return [spec for _row, spec in numbered], errors
+
+
+def _check_rows(rows, lang):
+    # validate_rows() keeping the table row number of every spec
+    def t(key: str) -> str:
+        return TEXTS[lang][key]
+
+    def msg(key: str, **kwargs) -> str:
+        return translate(lang, key, **kwargs)
+
+    specs = []
+    errors = []
+    for i, (filename, start_s, end_s, count_s, mode_use_end) in enumerate(rows, start=1):
+        filename = filename.strip()
+        start_s = start_s.strip()
+        end_s = end_s.strip()
+        count_s = count_s.strip()
+
+        if not start_s and not end_s and not count_s:
+            # Empty row, skip
+            continue
+
+        try:
+            start = parse_int(start_s)
+        except ValueError:
+            errors.append(msg("err_row_int", row=i, field=t("start")))
+            continue
+        try:
+            end = parse_int(end_s)
+        except ValueError:
+            errors.append(msg("err_row_int", row=i, field=t("end")))
+            continue
+        try:
+            count = parse_int(count_s)
+        except ValueError:
+            errors.append(msg("err_row_int", row=i, field=t("count")))
+            continue
+
+        if start is None:
+            errors.append(msg("err_row_start_required", row=i))
+            continue
+        if start <= 0:
+            errors.append(msg("err_row_start_min", row=i))
+            continue
+
+        if mode_use_end:
+            if count is not None:
+                errors.append(msg("err_row_end_mode", row=i))
+                continue
+        else:
+            if end is not None:
+                errors.append(msg("err_row_count_mode", row=i))
+                continue
+
+        if end is not None:
+            if end <= 0:
+                errors.append(msg("err_row_end_min", row=i))
+                continue
+            if end < start:
+                errors.append(msg("err_row_end_lt", row=i))
+                continue
+        if count is not None:
+            if count <= 0:
+                errors.append(msg("err_row_count_min", row=i))
+                continue
+
+        specs.append((i, (filename, start, end, count, mode_use_end)))
+
+    if not specs:
+        errors.append(msg("err_row_required"))
+
+    return specs, errors
+
+
+def resolve_ends(specs, total_pages, offset=0):
+    # Fill missing end using next row's start - 1, or the last page (in table
+    # terms, so minus offset) for the last row
+    enriched = []
+    for i, (filename, start, end, count, mode_use_end) in enumerate(specs):
+        if end is None and count is None:
+            if i < len(specs) - 1:
+                end = specs[i + 1][1] - 1
+            elif total_pages is not None:
+                end = total_pages - offset
+        if end is None and count is not None:
+            end = start + count - 1
+        enriched.append((filename, start, end))
+    return enriched
+
+
+def segment_name(filename, idx, start, end, append_range=True, offset=0, labels=None):
+    """Output file name of row idx. With labels (the printed label of every
+    physical page) the appended range is printed pages, e.g. _ivp_to_xp, and
+    falls back to the page number where a page has no label."""
+    base_name = safe_filename(filename) if filename else f"Filename_{idx}"
+    if append_range and end is not None:
+        if labels:
+            first, last = (labels[page + offset - 1] if 0 < page + offset <= len(labels) else ""
+                           for page in (start, end))
+            start = first.translate(UNSAFE_FILENAME_CHARS) or start + offset
+            end = last.translate(UNSAFE_FILENAME_CHARS) or end + offset
+        base_name = f"{base_name}_{start}p_to_{end}p"
+    return f"{base_name}.pdf"
+
+
+def plan_segments(enriched, offset, total_pages, append_range=True, lang="en", labels=None):
+    """Turn (filename, start, end) into output names and 0-based page indexes.
+    labels names the files by printed pages (see segment_name())."""
+    segments = []
+    for idx, (filename, start, end) in enumerate(enriched, start=1):
+        first = (start + offset) - 1
+        last = (end + offset) - 1
+
+        if first < 0 or first >= total_pages:
+            raise SplitError(translate(lang, "err_start_oob", row=idx))
+        if last < first:
+            raise SplitError(translate(lang, "err_end_before", row=idx))
+        if last >= total_pages:
+            raise SplitError(translate(lang, "err_end_oob", row=idx))
+
+        name = segment_name(filename, idx, start, end, append_range, offset, labels)
+        segments.append(Segment(name, start, end, first, last))
+    return segments
+
+
+def check_plan(rows, total_pages=None, offset=0, append_range=True, lang="en", labels=None):
+    """Validate a whole plan in one pass and report every problem at once.
+
+    On top of the per-row checks of validate_rows(): ranges that end before
+    they start, pages outside the document after offset (only when
+    total_pages is known; otherwise the last open-ended row is not range
+    checked), and output names that collide after safe_filename()
+    (case-insensitively, as on Windows). Ranges that overlap or leave pages
+    out between them are warnings, since that can be intended. labels are
+    passed to segment_name() for the output names.
+
+    Returns (specs, errors, warnings); specs are the validate_rows() specs.
+    Sorting the ranges is the only super-linear step, so 10,000 rows take a
+    few milliseconds.
+    """
+    numbered, errors = _check_rows(rows, lang)
+    specs = [spec for _row, spec in numbered]
+    warnings = []
+    enriched = resolve_ends(specs, total_pages, offset)
+
+    ranges = []
+    names = {}
+    for idx, ((row, _spec), (filename, start, end)) in enumerate(zip(numbered, enriched), start=1):
+        if total_pages is not None and not 0 <= start + offset - 1 < total_pages:
+            errors.append(translate(lang, "err_start_oob", row=row))
+            end = None
+        elif end is not None and end < start:
+            errors.append(translate(lang, "err_end_before", row=row))
+            end = None
+        elif total_pages is not None and end is not None and end + offset - 1 >= total_pages:
+            errors.append(translate(lang, "err_end_oob", row=row))
+
+        name = segment_name(filename, idx, start, end, append_range, offset, labels)
+        other = names.setdefault(name.casefold(), row)
+        if other != row:
+            errors.append(translate(lang, "err_duplicate_name", row=row, other=other, name=name))
+
+        if end is not None:
+            ranges.append((start, end, row))
+
+    ranges.sort()
+    covered_to, covered_row = None, None
+    for start, end, row in ranges:
+        if covered_to is not None:
+            if start <= covered_to:
+                warnings.append(translate(lang, "warn_overlap", row=min(row, covered_row),
+                                          other=max(row, covered_row), first=start, last=min(end, covered_to)))
+            elif start > covered_to + 1:
+                warnings.append(translate(lang, "warn_gap", row=min(row, covered_row),
+                                          other=max(row, covered_row), first=covered_to + 1, last=start - 1))
+        if covered_to is None or end > covered_to:
+            covered_to, covered_row = end, row
+    return specs, errors, warnings
+
+
+def format_problems(problems, lang="en", limit=30):
+    """Join problems for a dialog, cutting long lists short."""
+    lines = list(problems[:limit])
+    if len(problems) > limit:
+        lines.append(translate(lang, "more_problems", count=len(problems) - limit))
+    return "\n".join(lines)
+
+
+def open_pdf(pdf_path, lang="en", low_memory=False, backend=None):
+    """Open the input with backend (PyPDF2 by default). low_memory reads
+    objects from disk on demand instead of loading the whole file into
+    memory; close_pdf() releases the handle."""
+    if not os.path.isfile(pdf_path):
+        raise SplitError(translate(lang, "err_input_not_found"))
+    try:
+        return (backend or PYPDF2).open(pdf_path, low_memory)
+    except Exception as e:
+        raise SplitError(translate(lang, "err_pdf_open", detail=e))
+
+
+def close_pdf(reader, backend=None):
+    (backend or PYPDF2).close(reader)
+
+
+def release_pages(reader):
+    """Forget every parsed object so the next segment re-reads from disk.
+
+    Keeps peak memory near the largest segment instead of the whole file.
+    The writer and page objects form reference cycles, and a few huge image
+    buffers never reach the collector's allocation threshold on their own,
+    so collect explicitly.
+    """
+    reader.resolved_objects.clear()
+    gc.collect()
+
+
+class PyPDF2Backend:
+    """Reads and writes with PyPDF2 (pure Python, always available).
+
+    A backend opens a document, counts its pages, copies a page range into
+    a new document with a write(stream) method, lists the outline and can
+    drop cached objects between segments. Page labels, text sampling and
+    the size index always read with PyPDF2.
+    """
+
+    name = "pypdf2"
+
+    def open(self, pdf_path, low_memory=False):
+        load_pypdf2()
+        if not low_memory:
+            return PdfReader(pdf_path)
+        f = open(pdf_path, "rb")
+        try:
+            return PdfReader(f)
+        except BaseException:
+            f.close()
+            raise
+
+    def close(self, doc):
+        stream = getattr(doc, "stream", None)
+        if stream is not None and not isinstance(stream, BytesIO):
+            stream.close()
+
+    def page_count(self, doc):
+        return len(doc.pages)
+
+    def copy_range(self, doc, first, last, optimize=False):
+        load_pypdf2()
+        writer = PdfWriter()
+        for p in range(first, last + 1):
+            writer.add_page(doc.pages[p])
+        if optimize:
+            optimize_writer(writer)
+        return writer
+
+    def release(self, doc):
+        release_pages(doc)
+
+    def outline(self, doc, max_depth=1):
+        load_pypdf2()
+        return outline_entries(doc, max_depth)
+
+
+class _PikepdfOutput:
+    def __init__(self, pdf, optimize):
+        self.pdf = pdf
+        self.optimize = optimize
+
+    def write(self, stream):
+        if not hasattr(stream, "seek"):
+            # pikepdf only saves to seekable files; zip entries and pipes are not
+            buf = BytesIO()
+            self.write(buf)
+            stream.write(buf.getbuffer())
+            return
+        if self.optimize:
+            self.pdf.remove_unreferenced_resources()
+            self.pdf.save(stream, compress_streams=True,
+                          object_stream_mode=pikepdf.ObjectStreamMode.generate)
+        else:
+            # Copy streams as they are, like PyPDF2; recompressing them is what optimize is for
+            self.pdf.save(stream, compress_streams=False, recompress_flate=False,
+                          stream_decode_level=pikepdf.StreamDecodeLevel.none)
+
+
+class _PikepdfSource:
+    # low_memory input: qpdf keeps every object it has read, so the file is
+    # reopened after each segment (see PikepdfBackend.release())
+    def __init__(self, pdf_path):
+        self.path = pdf_path
+        self.pdf = pikepdf.open(pdf_path)
+
+    @property
+    def pages(self):
+        return self.pdf.pages
+
+    def reopen(self):
+        self.pdf.close()
+        self.pdf = pikepdf.open(self.path)
+
+    def close(self):
+        self.pdf.close()
+
+
+class PikepdfBackend:
+    """Reads and writes with pikepdf (qpdf, C++), when it is installed.
+
+    qpdf reads objects on demand but keeps them, so with low_memory the
+    input is reopened after every segment; optimize uses qpdf's object
+    streams and stream compression instead of optimize_writer().
+    """
+
+    name = "pikepdf"
+
+    def open(self, pdf_path, low_memory=False):
+        load_pikepdf()
+        return _PikepdfSource(pdf_path) if low_memory else pikepdf.open(pdf_path)
+
+    def close(self, doc):
+        doc.close()
+
+    def page_count(self, doc):
+        return len(doc.pages)
+
+    def copy_range(self, doc, first, last, optimize=False):
+        pdf = pikepdf.new()
+        pdf.pages.extend(doc.pages[first:last + 1])
+        return _PikepdfOutput(pdf, optimize)
+
+    def release(self, doc):
+        if isinstance(doc, _PikepdfSource):
+            doc.reopen()
+
+    def outline(self, doc, max_depth=1):
+        return pikepdf_outline_entries(getattr(doc, "pdf", doc), max_depth)
+
+
+PYPDF2 = PyPDF2Backend()
+BACKENDS = {backend.name: backend for backend in (PYPDF2, PikepdfBackend())}
+BACKEND_ENV = "PDF_CUTTER_BACKEND"
+
+
+def available_backends():
+    return [name for name in BACKENDS if name != "pikepdf" or PIKEPDF_INSTALLED]
+
+
+def get_backend(name=None, lang="en"):
+    """Backend by name. None or "auto" (unless $PDF_CUTTER_BACKEND names
+    one) picks pikepdf when it is installed and PyPDF2 otherwise."""
+    name = (name or os.environ.get(BACKEND_ENV) or "auto").lower()
+    if name == "auto":
+        name = "pikepdf" if PIKEPDF_INSTALLED else PYPDF2.name
+    if name not in available_backends():
+        raise SplitError(translate(lang, "err_backend", name=name))
+    return BACKENDS[name]
+
+
+READER_CACHE_SIZE = 3
+
+
+class ReaderCache:
+    """Parsed inputs kept between runs, keyed by (backend, path, size, mtime).
+
+    Holds at most size readers and forgets the least recently used one. A
+    reader is lent to one caller at a time since readers are not thread
+    safe: a caller arriving while the input is still being parsed waits for
+    the parse (not for the parsing caller's own work), one arriving while
+    the reader is in use gets a private, uncached reader. Forgotten readers
+    are closed, by the current borrower if they are lent out.
+    """
+
+    def __init__(self, size=READER_CACHE_SIZE):
+        self.size = size
+        self.entries = OrderedDict()  # key -> [reader or None, parsing, backend, evicted, lent]
+        self.lock = threading.Lock()
+        self.parsed = threading.Condition(self.lock)
+
+    def clear(self):
+        with self.lock:
+            while self.entries:
+                self._evict(self.entries.popitem(last=False)[1])
+
+    def _evict(self, entry):
+        # With self.lock held; a lent-out reader is closed when it comes back
+        entry[3] = True
+        if not entry[4]:
+            self._close(entry)
+
+    @staticmethod
+    def _close(entry):
+        if entry[0] is not None:
+            close_pdf(entry[0], entry[2])
+            entry[0] = None
+
+    @contextmanager
+    def lease(self, pdf_path, lang="en", backend=None):
+        backend = backend or PYPDF2
+        if not os.path.isfile(pdf_path):
+            raise SplitError(translate(lang, "err_input_not_found"))
+        st = os.stat(pdf_path)
+        key = (backend.name, os.path.abspath(pdf_path), st.st_size, st.st_mtime)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                entry = self.entries[key] = [None, False, backend, False, False]
+                while len(self.entries) > self.size:
+                    self._evict(self.entries.popitem(last=False)[1])
+            self.entries.move_to_end(key)
+            while entry[1]:
+                self.parsed.wait()
+            lent = entry[3] or entry[4]
+            if not lent:
+                entry[4] = True
+                entry[1] = entry[0] is None
+        if lent:
+            reader = open_pdf(pdf_path, lang, backend=backend)
+            try:
+                yield reader
+            finally:
+                close_pdf(reader, backend)
+            return
+        try:
+            if entry[1]:
+                # Parsed without the lock, so other inputs are not held up
+                reader = None
+                try:
+                    reader = open_pdf(pdf_path, lang, backend=backend)
+                finally:
+                    with self.lock:
+                        entry[0] = reader
+                        entry[1] = False
+                        self.parsed.notify_all()
+            yield entry[0]
+        finally:
+            with self.lock:
+                entry[4] = False
+                if entry[3]:
+                    self._close(entry)
+
+
+@contextmanager
+def input_reader(pdf_path, lang="en", low_memory=False, backend=None, cache=None):
+    """The input for one run: leased from cache (a ReaderCache), or opened
+    here and closed afterwards. low_memory readers are never cached."""
+    if cache is not None and not low_memory:
+        with cache.lease(pdf_path, lang, backend) as reader:
+            yield reader
+        return
+    reader = open_pdf(pdf_path, lang, low_memory, backend)
+    try:
+        yield reader
+    finally:
+        close_pdf(reader, backend)
+
+
+def ensure_out_dir(out_dir, lang="en"):
+    if not os.path.isdir(out_dir):
+        try:
+            os.makedirs(out_dir, exist_ok=True)
+        except Exception as e:
+            raise SplitError(translate(lang, "err_output_create", detail=e))
+
+
+RESOURCE_KINDS = ("/Font", "/XObject", "/ExtGState", "/ColorSpace", "/Pattern", "/Shading", "/Properties")
+CONTENT_NAME_RE = re.compile(rb"/([^\s/\[\]<>(){}%]+)")
+# Never merged with a look-alike: pages must stay distinct objects
+KEEP_TYPES = ("/Page", "/Pages", "/Catalog")
+
+
+def _content_bytes(page):
+    contents = page.get("/Contents")
+    if contents is None:
+        return b""
+    contents = contents.get_object()
+    if isinstance(contents, ArrayObject):
+        return b"\n".join(part.get_object().get_data() for part in contents)
+    return contents.get_data()
+
+
+def _prune_resources(page):
+    """Drop /Resources entries the page content never names."""
+    resources = page.get("/Resources")
+    if resources is None:
+        return
+    resources = resources.get_object()
+    data = _content_bytes(page)
+    if b"#" in data:
+        # Escaped names can't be matched reliably; leave this page alone
+        return
+    used = {"/" + name.decode("latin-1") for name in CONTENT_NAME_RE.findall(data)}
+    pruned = DictionaryObject()
+    for key, value in resources.items():
+        entries = value.get_object()
+        if key in RESOURCE_KINDS and isinstance(entries, DictionaryObject):
+            # Shallow copy: a shared dict may still be needed by other pages
+            kept = DictionaryObject()
+            for name, ref in entries.items():
+                if name in used:
+                    kept[NameObject(name)] = ref
+            pruned[NameObject(key)] = kept
+        else:
+            pruned[NameObject(key)] = value
+    page[NameObject("/Resources")] = pruned
+
+
+def _serialize(obj):
+    buf = BytesIO()
+    obj.write_to_stream(buf, None)
+    return buf.getvalue()
+
+
+def _remap_refs(obj, mapping, writer):
+    """Point every indirect reference inside obj at mapping[old idnum]."""
+    if isinstance(obj, DictionaryObject):
+        items = obj.items()
+    elif isinstance(obj, ArrayObject):
+        items = enumerate(obj)
+    else:
+        return
+    for key, value in list(items):
+        if isinstance(value, IndirectObject):
+            if value.idnum in mapping:
+                obj[key] = IndirectObject(mapping[value.idnum], 0, writer)
+        else:
+            _remap_refs(value, mapping, writer)
+
+
+def _dedupe_objects(writer):
+    """Merge byte-identical objects until nothing changes.
+
+    Merging children makes their parents identical too, hence the loop.
+    Merged-away objects are left as None for _compact_objects to drop.
+    """
+    objects = writer._objects
+    while True:
+        seen = {}
+        mapping = {}
+        for i, obj in enumerate(objects):
+            if obj is None:
+                continue
+            if isinstance(obj, DictionaryObject) and obj.get("/Type") in KEEP_TYPES:
+                continue
+            mapping_to = seen.setdefault(_serialize(obj), i + 1)
+            if mapping_to != i + 1:
+                mapping[i + 1] = mapping_to
+        if not mapping:
+            return
+        for obj in objects:
+            if obj is not None:
+                _remap_refs(obj, mapping, writer)
+        for idnum in mapping:
+            objects[idnum - 1] = None
+
+
+def _compact_objects(writer):
+    """Keep only objects reachable from the catalog and info, renumbered 1..n."""
+    objects = writer._objects
+    order = []
+    seen = set()
+    stack = [writer._root.idnum, writer._info.idnum]
+    while stack:
+        idnum = stack.pop()
+        if idnum in seen:
+            continue
+        seen.add(idnum)
+        order.append(idnum)
+        pending = [objects[idnum - 1]]
+        while pending:
+            obj = pending.pop()
+            if isinstance(obj, IndirectObject):
+                stack.append(obj.idnum)
+            elif isinstance(obj, DictionaryObject):
+                pending.extend(obj.values())
+            elif isinstance(obj, ArrayObject):
+                pending.extend(obj)
+
+    order.sort()
+    mapping = {old: new for new, old in enumerate(order, start=1)}
+    writer._objects = [objects[old - 1] for old in order]
+    for new, obj in enumerate(writer._objects, start=1):
+        _remap_refs(obj, mapping, writer)
+        if hasattr(obj, "indirect_reference"):
+            obj.indirect_reference = IndirectObject(new, 0, writer)
+    writer._root = IndirectObject(mapping[writer._root.idnum], 0, writer)
+    writer._info = IndirectObject(mapping[writer._info.idnum], 0, writer)
+    writer._pages = IndirectObject(mapping[writer._pages.idnum], 0, writer)
+    writer._idnum_hash = {}
+
+
+def _flate_encoded(stream):
+    # flate_encode() keeps only /Filter; images and fonts need the rest of the dictionary
+    encoded = stream.flate_encode()
+    for key, value in stream.items():
+        if key not in ("/Length", "/Filter", "/DecodeParms"):
+            encoded[NameObject(key)] = value
+    return encoded
+
+
+def optimize_writer(writer):
+    """Shrink a segment before it is written.
+
+    Unused page resources are dropped, uncompressed streams are Flate
+    encoded, identical objects are merged and unreachable ones removed.
+    """
+    load_pypdf2()
+    for page in writer.pages:
+        _prune_resources(page)
+    # Turn direct streams into objects so the passes below see all of them
+    writer._sweep_indirect_references(writer._root)
+    for i, obj in enumerate(writer._objects):
+        if isinstance(obj, StreamObject) and "/Filter" not in obj:
+            writer._objects[i] = _flate_encoded(obj)
+    _dedupe_objects(writer)
+    _compact_objects(writer)
+
+
+def build_writer(reader, segment, optimize=False, backend=None):
+    return (backend or PYPDF2).copy_range(reader, segment.first, segment.last, optimize)
+
+
+def partial_path(path):
+    # Hidden, so watchers of the output folder do not pick it up
+    folder, name = os.path.split(path)
+    return os.path.join(folder, f".{name}.part")
+
+
+def write_segment(reader, segment, out_dir, optimize=False, backend=None):
+    writer = build_writer(reader, segment, optimize, backend)
+
+    # Written aside and renamed when complete: even a crash never leaves a
+    # half-written PDF under the final name
+    out_path = os.path.join(out_dir, segment.name)
+    tmp = partial_path(out_path)
+    try:
+        with open(tmp, "wb") as f:
+            writer.write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, out_path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    return out_path
+
+
+def size_summary(pdf_path, saved):
+    """Return (input bytes, total output bytes) for the run summary."""
+    return os.path.getsize(pdf_path), sum(output_sizes(saved))
+
+
+class SplitCancelled(Exception):
+    """Raised between segments when the cancel event is set.
+
+    saved holds the files that were completely written before the stop.
+    """
+
+    def __init__(self, saved):
+        super().__init__("cancelled")
+        self.saved = saved
+
+
+class Progress(namedtuple("Progress", "segments_done segments_total pages_done pages_total bytes_written elapsed")):
+    __slots__ = ()
+
+    @property
+    def eta(self):
+        if not self.pages_done:
+            return None
+        return self.elapsed * (self.pages_total - self.pages_done) / self.pages_done
+
+
+class ProgressTracker:
+    def __init__(self, segments, callback=None, on_saved=None):
+        self.callback = callback
+        self.on_saved = on_saved
+        self.segments_total = len(segments)
+        self.pages_total = segment_pages(segments)
+        self.segments_done = 0
+        self.pages_done = 0
+        self.bytes_written = 0
+        self.started = time.perf_counter()
+
+    def add(self, segment, out_path=None, size=None):
+        if self.on_saved is not None and out_path is not None:
+            self.on_saved(segment, out_path)
+        self.segments_done += 1
+        self.pages_done += segment.last - segment.first + 1
+        self.bytes_written += os.path.getsize(out_path) if size is None else size
+        if self.callback:
+            self.callback(Progress(
+                self.segments_done,
+                self.segments_total,
+                self.pages_done,
+                self.pages_total,
+                self.bytes_written,
+                time.perf_counter() - self.started,
+            ))
+
+
+def prepare_split(pdf_path, rows, offset=0, append_range=True, lang="en", printed_labels=False,
+                  low_memory=False, metrics=None, backend=None, reader=None):
+    """Open the input and validate the whole plan before anything is written.
+
+    Returns (reader, segments). Raises SplitError with every row error joined
+    by newlines, the same text the GUI shows in its error dialog. With
+    printed_labels, Start/End are printed page labels, offset is ignored and
+    the appended ranges are printed labels too.
+    An already open reader is used as is and left open on errors.
+    """
+    owned = reader is None
+    if owned:
+        with timed(metrics, "open"):
+            reader = open_pdf(pdf_path, lang, low_memory, backend)
+    backend = backend or PYPDF2
+    try:
+        total_pages = backend.page_count(reader)
+        if metrics is not None:
+            metrics.record["page_count"] = total_pages
+        with timed(metrics, "validate"):
+            labels = None
+            if printed_labels:
+                numbering = page_numbering(pdf_path, reader if backend is PYPDF2 else None)
+                labels = numbering["labels"]
+                rows, errors = labels_to_pages(rows, labels, lang)
+                if errors:
+                    raise SplitError("\n".join(errors))
+                offset = 0
+            specs, errors, _warnings = check_plan(rows, total_pages, offset, append_range, lang, labels)
+            if errors:
+                raise SplitError("\n".join(errors))
+            enriched = resolve_ends(specs, total_pages, offset)
+            segments = plan_segments(enriched, offset, total_pages, append_range, lang, labels)
+    except BaseException:
+        if owned:
+            close_pdf(reader, backend)
+        raise
+    if metrics is not None:
+        metrics.record["segment_count"] = len(segments)
+    return reader, segments
+
+
+_worker_reader = None
+_worker_low_memory = False
+_worker_backend = PYPDF2
+
+
+def _init_worker(pdf_path, low_memory=False, backend_name=PYPDF2.name):
+    # Runs once per worker process: every segment it writes reuses this reader
+    global _worker_reader, _worker_low_memory, _worker_backend
+    _worker_backend = BACKENDS[backend_name]
+    _worker_reader = open_pdf(pdf_path, low_memory=low_memory, backend=_worker_backend)
+    _worker_low_memory = low_memory
+
+
+def _write_in_worker(segment, out_dir, optimize):
+    out_path = write_segment(_worker_reader, segment, out_dir, optimize, _worker_backend)
+    if _worker_low_memory:
+        _worker_backend.release(_worker_reader)
+    return out_path
+
+
+def write_parallel(pdf_path, segments, out_dir, workers, tracker, cancel=None, optimize=False,
+                   low_memory=False, backend=None):
+    """Write segments with a process pool. Returns paths in segment order.
+
+    Segments are queued largest first so the pool stays evenly loaded.
+    """
+    saved = [None] * len(segments)
+    order = sorted(range(len(segments)), key=lambda i: segments[i].last - segments[i].first, reverse=True)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(pdf_path, low_memory, (backend or PYPDF2).name)) as pool:
+        futures = {pool.submit(_write_in_worker, segments[i], out_dir, optimize): i for i in order}
+        for future in as_completed(futures):
+            i = futures[future]
+            saved[i] = future.result()
+            tracker.add(segments[i], saved[i])
+            if cancel is not None and cancel.is_set():
+                # Queued segments are dropped; ones already running finish
+                pool.shutdown(wait=True, cancel_futures=True)
+                for f, j in futures.items():
+                    if saved[j] is None and not f.cancelled() and f.exception() is None:
+                        saved[j] = f.result()
+                        tracker.add(segments[j], saved[j])
+                raise SplitCancelled([path for path in saved if path is not None])
+    return saved
+
+
+def write_segments(reader, pdf_path, segments, out_dir, workers=1, progress=None, cancel=None,
+                   optimize=False, low_memory=False, backend=None, on_saved=None):
+    """Write already planned segments. Returns their paths in the same order.
+
+    on_saved(segment, path) is called in this process as each one lands.
+    """
+    backend = backend or PYPDF2
+    tracker = ProgressTracker(segments, progress, on_saved)
+    if workers > 1 and len(segments) > 1:
+        return write_parallel(pdf_path, segments, out_dir, workers, tracker, cancel, optimize, low_memory,
+                              backend)
+    if low_memory:
+        backend.release(reader)
+    saved = []
+    for segment in segments:
+        if cancel is not None and cancel.is_set():
+            raise SplitCancelled(saved)
+        saved.append(write_segment(reader, segment, out_dir, optimize, backend))
+        if low_memory:
+            backend.release(reader)
+        tracker.add(segment, saved[-1])
+    return saved
+
+
+ARCHIVE_FORMATS = ("zip", "tar", "tar.gz")
+
+
+def archive_format(target, fmt=None):
+    """fmt, else the format named by target's extension (.zip, .tar, .tar.gz/.tgz), else None."""
+    if fmt:
+        return fmt
+    name = target.lower() if isinstance(target, str) else ""
+    if name.endswith(".zip"):
+        return "zip"
+    if name.endswith((".tar.gz", ".tgz")):
+        return "tar.gz"
+    if name.endswith(".tar"):
+        return "tar"
+    return None
+
+
+class _TellWriter:
+    # PdfWriter.write() needs tell(); zip entry streams don't have one
+    def __init__(self, stream):
+        self.stream = stream
+        self.written = 0
+
+    def write(self, data):
+        self.stream.write(data)
+        self.written += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.written
+
+
+class ArchiveWriter:
+    """One zip or tar stream that segments are added to in order.
+
+    target is a path, "-" for stdout or a binary file object; nothing is
+    written to disk besides the archive itself, and tar and zip are written
+    as streams, so pipes work. Zip entries are written straight from
+    PdfWriter; a tar header needs the size first, so a tar entry is built in
+    memory. A path target is written aside and only renamed to target by
+    close(keep=True).
+    """
+
+    def __init__(self, target, fmt):
+        self.fmt = fmt
+        self.target = target
+        self.owns_stream = isinstance(target, str) and target != "-"
+        if target == "-":
+            self.stream = sys.stdout.buffer
+        elif self.owns_stream:
+            self.stream = open(partial_path(target), "wb")
+        else:
+            self.stream = target
+        if fmt == "zip":
+            self.archive = zipfile.ZipFile(self.stream, "w", zipfile.ZIP_DEFLATED)
+        else:
+            self.archive = tarfile.open(fileobj=self.stream, mode="w|gz" if fmt == "tar.gz" else "w|")
+
+    def add_writer(self, name, writer):
+        """Add a backend document's output as name; returns its size in bytes."""
+        if self.fmt != "zip":
+            buf = BytesIO()
+            writer.write(buf)
+            return self.add_bytes(name, buf.getvalue())
+        # force_zip64: the size is not known before the entry is written
+        with self.archive.open(self._zip_info(name), "w", force_zip64=True) as entry:
+            out = _TellWriter(entry)
+            writer.write(out)
+        return out.written
+
+    def _zip_info(self, name):
+        info = zipfile.ZipInfo(name, time.localtime()[:6])
+        info.compress_type = zipfile.ZIP_DEFLATED
+        return info
+
+    def add_bytes(self, name, data):
+        if self.fmt == "zip":
+            with self.archive.open(self._zip_info(name), "w", force_zip64=True) as entry:
+                entry.write(data)
+        else:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mtime = int(time.time())
+            self.archive.addfile(info, BytesIO(data))
+        return len(data)
+
+    def close(self, keep=True):
+        self.archive.close()
+        if not self.owns_stream:
+            self.stream.flush()
+            return
+        if keep:
+            self.stream.flush()
+            os.fsync(self.stream.fileno())
+        self.stream.close()
+        if keep:
+            os.replace(partial_path(self.target), self.target)
+        else:
+            os.remove(partial_path(self.target))
+
+
+def _segment_bytes_in_worker(segment, optimize):
+    buf = BytesIO()
+    build_writer(_worker_reader, segment, optimize, _worker_backend).write(buf)
+    if _worker_low_memory:
+        _worker_backend.release(_worker_reader)
+    return buf.getvalue()
+
+
+def write_archive(reader, pdf_path, segments, target, fmt, workers=1, progress=None, cancel=None,
+                  optimize=False, low_memory=False, backend=None):
+    """Write planned segments into one archive (see ArchiveWriter), in order.
+
+    Returns (names, sizes). workers > 1 builds segments in a process pool,
+    at most two per worker ahead of the one being added. On cancel the
+    archive is closed with the finished entries; on an error a partial
+    archive file is removed.
+    """
+    backend = backend or PYPDF2
+    tracker = ProgressTracker(segments, progress)
+    archive = ArchiveWriter(target, fmt)
+    names = []
+    sizes = []
+    complete = False
+
+    def added(segment, size):
+        names.append(segment.name)
+        sizes.append(size)
+        tracker.add(segment, size=size)
+
+    try:
+        if workers > 1 and len(segments) > 1:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(pdf_path, low_memory, backend.name)) as pool:
+                pending = deque()
+                queued = 0
+                for segment in segments:
+                    while queued < len(segments) and len(pending) < workers * 2:
+                        pending.append(pool.submit(_segment_bytes_in_worker, segments[queued], optimize))
+                        queued += 1
+                    if cancel is not None and cancel.is_set():
+                        for future in pending:
+                            future.cancel()
+                        raise SplitCancelled(names)
+                    added(segment, archive.add_bytes(segment.name, pending.popleft().result()))
+        else:
+            if low_memory:
+                backend.release(reader)
+            for segment in segments:
+                if cancel is not None and cancel.is_set():
+                    raise SplitCancelled(names)
+                added(segment, archive.add_writer(segment.name, build_writer(reader, segment, optimize, backend)))
+                if low_memory:
+                    backend.release(reader)
+        complete = True
+    except SplitCancelled:
+        complete = True
+        raise
+    finally:
+        archive.close(keep=complete)
+    return names, sizes
+
+
+METRICS_ENV = "PDF_CUTTER_METRICS"
+PROFILE_ENV = "PDF_CUTTER_PROFILE"
+
+
+def peak_rss_bytes():
+    """Peak resident memory of this process, or None where unknown."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class RunMetrics:
+    """Collects one structured record per split run."""
+
+    def __init__(self, pdf_path, out_dir, options):
+        self.started = time.perf_counter()
+        self.record = {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "input": os.path.abspath(pdf_path),
+            "input_bytes": os.path.getsize(pdf_path) if os.path.isfile(pdf_path) else None,
+            "out_dir": os.path.abspath(out_dir) if isinstance(out_dir, str) and out_dir != "-" else str(out_dir),
+            "options": options,
+            "page_count": None,
+            "segment_count": None,
+            "stages": {},
+        }
+
+    def add_time(self, stage, seconds):
+        stages = self.record["stages"]
+        stages[stage] = stages.get(stage, 0.0) + seconds
+
+    def finish(self, status, saved, error=None):
+        total = time.perf_counter() - self.started
+        sizes = output_sizes(saved)
+        pages = self.record["page_count"]
+        self.record.update({
+            "status": status,
+            "error": error,
+            "total_seconds": total,
+            "pages_per_second": pages / total if pages and total else None,
+            "files": len(sizes),
+            "bytes_written": sum(sizes),
+            "bytes_per_segment": sizes,
+            "peak_rss_bytes": peak_rss_bytes(),
+        })
+        if isinstance(saved, SplitResult):
+            self.record["written"] = saved.written
+            self.record["skipped"] = saved.skipped
+
+
+@contextmanager
+def timed(metrics, stage):
+    """Add the time spent in the block to metrics (no-op without metrics)."""
+    if metrics is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.add_time(stage, time.perf_counter() - started)
+
+
+def append_metrics(path, record):
+    folder = os.path.dirname(os.path.abspath(path))
+    os.makedirs(folder, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def profile_path(target):
+    if os.path.isdir(target):
+        return os.path.join(target, f"pdf_cutter_{datetime.now():%Y%m%d_%H%M%S}_{os.getpid()}.prof")
+    return target
+
+
+STATE_FILE = ".pdf_cutter_manifest.json"
+
+
+class SplitResult(list):
+    """Saved paths in row order, plus what an incremental run did and how
+    many pages the plan covers.
+
+    For archive output the items are entry names and sizes holds their
+    bytes.
+    """
+
+    def __init__(self, saved, written=None, skipped=0, removed=(), sizes=None, pages=0):
+        super().__init__(saved)
+        self.written = len(saved) if written is None else written
+        self.skipped = skipped
+        self.removed = list(removed)
+        self.sizes = sizes
+        self.pages = pages
+
+
+def segment_pages(segments):
+    return sum(segment.last - segment.first + 1 for segment in segments)
+
+
+def output_sizes(saved):
+    """Bytes of every saved file (or archive entry)."""
+    if isinstance(saved, SplitResult) and saved.sizes is not None:
+        return list(saved.sizes)
+    return [os.path.getsize(path) for path in (saved or []) if os.path.isfile(path)]
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def segment_key(segment, append_range, optimize):
+    # Everything that changes the bytes of an output file
+    return [segment.name, segment.start, segment.end, bool(append_range), segment.first, segment.last, bool(optimize)]
+
+
+def load_split_state(out_dir):
+    """Previous run's manifest in out_dir, or None if missing/unreadable."""
+    try:
+        with open(os.path.join(out_dir, STATE_FILE), "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return state if isinstance(state, dict) and isinstance(state.get("segments"), list) else None
+
+
+def save_split_state(out_dir, state):
+    path = os.path.join(out_dir, STATE_FILE)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def unchanged_segments(previous, input_hash, segments, keys, out_dir):
+    """Indexes of segments whose key and output file match the last run."""
+    if previous is None or previous.get("input_sha256") != input_hash:
+        return set()
+    known = {}
+    for entry in previous["segments"]:
+        if isinstance(entry, dict) and "key" in entry:
+            known[json.dumps(entry["key"])] = entry.get("size")
+    return segments_on_disk(known, segments, keys, out_dir)
+
+
+def segments_on_disk(known, segments, keys, out_dir):
+    """Indexes of segments whose key is in known ({key: size}) and whose
+    output file still has that size."""
+    same = set()
+    for i, segment in enumerate(segments):
+        path = os.path.join(out_dir, segment.name)
+        size = known.get(json.dumps(keys[i]))
+        if size is not None and os.path.isfile(path) and os.path.getsize(path) == size:
+            same.add(i)
+    return same
+
+
+JOURNAL_FILE = ".pdf_cutter_journal.jsonl"
+
+
+def input_identity(pdf_path):
+    # Cheap stand-in for the input hash: an interrupted run is resumed the same night
+    st = os.stat(pdf_path)
+    return {"path": os.path.abspath(pdf_path), "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def load_journal(out_dir, identity):
+    """Segments an interrupted run into out_dir had finished: {key: size}.
+
+    Keys are json.dumps(segment_key(...)). Empty unless the journal was
+    written for the same input (path, size and mtime). A line torn by a
+    crash ends the journal.
+    """
+    try:
+        f = open(os.path.join(out_dir, JOURNAL_FILE), "r", encoding="utf-8")
+    except OSError:
+        return {}
+    done = {}
+    with f:
+        for n, line in enumerate(f):
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                break
+            if not isinstance(entry, dict):
+                break
+            if n == 0:
+                if entry.get("input") != identity:
+                    return {}
+            elif "key" in entry:
+                done[json.dumps(entry["key"])] = entry.get("size")
+    return done
+
+
+class SplitJournal:
+    """Append-only record of the segments a run into out_dir has finished.
+
+    A line is flushed and fsynced as soon as its segment is renamed into
+    place, so after a crash the next run into out_dir skips what is listed
+    (see load_journal()). resume keeps the lines of a matching journal;
+    otherwise it is started over. remove() deletes it once the run is done.
+    """
+
+    def __init__(self, out_dir, identity, resume=False):
+        self.path = os.path.join(out_dir, JOURNAL_FILE)
+        self.file = open(self.path, "a" if resume else "w", encoding="utf-8")
+        if not resume:
+            self._write({"version": 1, "input": identity})
+
+    def _write(self, entry):
+        self.file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def add(self, key, path):
+        self._write({"key": key, "size": os.path.getsize(path)})
+
+    def close(self):
+        self.file.close()
+
+    def remove(self):
+        self.close()
+        os.remove(self.path)
+
+
+def record_split_state(out_dir, previous, input_hash, offset, segments, keys, saved, remove_orphans):
+    """Write the manifest for this run; optionally delete files the plan dropped.
+
+    Only files listed in the previous manifest of the same input are ever
+    removed: the outputs of another PDF split into the same folder are left
+    alone (and no longer tracked). Returns the removed paths.
+    """
+    names = {segment.name for segment in segments}
+    entries = []
+    for segment, key, path in zip(segments, keys, saved):
+        if path is not None:
+            entries.append({"key": key, "size": os.path.getsize(path)})
+    removed = []
+    same_input = previous is not None and previous.get("input_sha256") == input_hash
+    for entry in previous["segments"] if same_input else []:
+        name = entry.get("key", [None])[0] if isinstance(entry, dict) else None
+        if not isinstance(name, str) or name in names or os.path.basename(name) != name:
+            continue
+        path = os.path.join(out_dir, name)
+        if remove_orphans:
+            if os.path.isfile(path):
+                os.remove(path)
+                removed.append(path)
+        else:
+            # Not cleaned up this time (cancelled): keep tracking it
+            entries.append(entry)
+            names.add(name)
+    save_split_state(out_dir, {
+        "version": 1,
+        "input_sha256": input_hash,
+        "offset": offset,
+        "segments": entries,
+    })
+    return removed
+
+
+def split_pdf(pdf_path, out_dir, rows, offset=0, append_range=True, lang="en", workers=1,
+              progress=None, cancel=None, optimize=False, printed_labels=False, low_memory=False,
+              incremental=False, metrics_log=None, profile=None, archive=None, backend=None,
+              reader_cache=None):
+    """Split pdf_path into out_dir following the table rows.
+
+    Returns a SplitResult: the saved paths in row order. workers > 1 writes
+    the segments in that many processes. progress is called with a Progress
+    after every segment; setting the cancel event stops the split between
+    segments and raises SplitCancelled. optimize runs optimize_writer() on
+    every segment before it is saved. printed_labels reads Start/End as
+    printed page labels (see page_numbering()). low_memory streams the input
+    from disk and drops parsed pages after every segment, for inputs too
+    large to hold in memory. incremental keeps a manifest in out_dir and
+    only rewrites segments whose input, range or name changed; files from
+    earlier runs that the plan no longer produces are removed.
+
+    Every file is written under a hidden .part name and renamed when
+    complete, and each finished segment is logged in a journal in out_dir
+    (JOURNAL_FILE) until the run completes. If a run is interrupted
+    (cancel, error or crash), splitting the same input into out_dir again
+    only writes the segments that were not finished.
+
+    archive ("zip", "tar" or "tar.gz") streams every segment into one
+    archive instead: out_dir is then the archive path, "-" for stdout or a
+    binary file object, the result holds entry names (and their sizes) and
+    incremental does not apply.
+
+    backend is a get_backend() name ("pypdf2", "pikepdf" or "auto"; None
+    is auto) used to read the input and write the segments. reader_cache
+    (a ReaderCache) keeps the parsed input for the next run on the same
+    file; it does not apply with low_memory.
+
+    metrics_log (or $PDF_CUTTER_METRICS) appends one JSON line per run with
+    sizes, stage timings and peak memory; profile (or $PDF_CUTTER_PROFILE)
+    runs the split under cProfile and saves a .prof file there (a folder
+    gets a timestamped file name).
+    """
+    metrics_log = metrics_log or os.environ.get(METRICS_ENV) or None
+    profile = profile or os.environ.get(PROFILE_ENV) or None
+    backend = get_backend(backend, lang)
+    metrics = None
+    if metrics_log:
+        metrics = RunMetrics(pdf_path, out_dir, {
+            "workers": workers,
+            "optimize": optimize,
+            "printed_labels": printed_labels,
+            "low_memory": low_memory,
+            "incremental": incremental,
+            "archive": archive,
+            "backend": backend.name,
+        })
+    profiler = cProfile.Profile() if profile else None
+
+    result = None
+    status = "error"
+    error = None
+    if profiler is not None:
+        profiler.enable()
+    try:
+        result = _split_pdf(
+            pdf_path, out_dir, rows, offset, append_range, lang, workers, progress, cancel,
+            optimize, printed_labels, low_memory, incremental, metrics, archive, backend, reader_cache,
+        )
+        status = "ok"
+        return result
+    except SplitCancelled as e:
+        status = "cancelled"
+        result = e.saved
+        raise
+    except Exception as e:
+        error = str(e)
+        raise
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(profile_path(profile))
+        if metrics is not None:
+            metrics.finish(status, result, error)
+            append_metrics(metrics_log, metrics.record)
+
+
+def _split_pdf(pdf_path, out_dir, rows, offset, append_range, lang, workers, progress, cancel,
+               optimize, printed_labels, low_memory, incremental, metrics, archive, backend, reader_cache):
+    with ExitStack() as stack:
+        with timed(metrics, "open"):
+            reader = stack.enter_context(input_reader(pdf_path, lang, low_memory, backend, reader_cache))
+        _reader, segments = prepare_split(
+            pdf_path, rows, offset, append_range, lang, printed_labels, low_memory, metrics, backend, reader,
+        )
+        if archive:
+            with timed(metrics, "write"):
+                names, sizes = write_archive(
+                    reader, pdf_path, segments, out_dir, archive, workers, progress, cancel, optimize, low_memory,
+                    backend,
+                )
+            return SplitResult(names, sizes=sizes, pages=segment_pages(segments))
+
+        ensure_out_dir(out_dir, lang)
+        saved = [None] * len(segments)
+        keys = [segment_key(segment, append_range, optimize) for segment in segments]
+        if incremental:
+            previous = load_split_state(out_dir)
+            with timed(metrics, "hash"):
+                input_hash = file_sha256(pdf_path)
+            for i in unchanged_segments(previous, input_hash, segments, keys, out_dir):
+                saved[i] = os.path.join(out_dir, segments[i].name)
+        # Resume what an interrupted run of the same plan left finished
+        identity = input_identity(pdf_path)
+        journaled = load_journal(out_dir, identity)
+        for i in segments_on_disk(journaled, segments, keys, out_dir):
+            saved[i] = os.path.join(out_dir, segments[i].name)
+        pending = [i for i in range(len(segments)) if saved[i] is None]
+
+        journal = SplitJournal(out_dir, identity, resume=bool(journaled))
+        try:
+            with timed(metrics, "write"):
+                written = write_segments(
+                    reader, pdf_path, [segments[i] for i in pending], out_dir,
+                    workers, progress, cancel, optimize, low_memory, backend,
+                    lambda segment, path: journal.add(segment_key(segment, append_range, optimize), path),
+                )
+        except SplitCancelled as e:
+            # The journal stays, so running the same plan again resumes
+            journal.close()
+            finished = set(e.saved)
+            for i in pending:
+                path = os.path.join(out_dir, segments[i].name)
+                saved[i] = path if path in finished else None
+            if incremental:
+                record_split_state(out_dir, previous, input_hash, offset, segments, keys, saved, False)
+            raise SplitCancelled([path for path in saved if path is not None])
+        except BaseException:
+            journal.close()
+            raise
+
+        for i, path in zip(pending, written):
+            saved[i] = path
+        removed = []
+        if incremental:
+            removed = record_split_state(out_dir, previous, input_hash, offset, segments, keys, saved, True)
+        journal.remove()
+        return SplitResult(saved, written=len(pending), skipped=len(segments) - len(pending), removed=removed,
+                           pages=segment_pages(segments))
+
+
+def page_index_map(reader):
+    """Map page object number -> 0-based page index, built once per reader."""
+    return {page.indirect_reference.idnum: i for i, page in enumerate(reader.pages)}
+
+
+def _outline_page_ref(item, named):
+    """Return the raw page reference an outline item jumps to, or None."""
+    dest = item.get("/Dest")
+    if dest is None:
+        action = item.get("/A")
+        action = action.get_object() if action is not None else None
+        if isinstance(action, DictionaryObject) and action.get("/S") == "/GoTo":
+            dest = action.get("/D")
+    if dest is None:
+        return None
+    dest = dest.get_object()
+    if isinstance(dest, (str, bytes)):
+        # Named destination: only now pay for reading the name tree
+        if named["map"] is None:
+            named["map"] = named["reader"].named_destinations
+        target = named["map"].get(dest if isinstance(dest, str) else dest.decode("latin-1"))
+        return target.get("/Page") if target is not None else None
+    if isinstance(dest, DictionaryObject):
+        dest = dest.get("/D")
+        dest = dest.get_object() if dest is not None else None
+    if isinstance(dest, ArrayObject) and dest:
+        return dest[0]
+    return None
+
+
+def outline_entries(reader, max_depth=1):
+    """Return [(title, page_index, depth)] for outline items up to max_depth.
+
+    Walks /First and /Next directly so items deeper than max_depth are never
+    read, and resolves destinations through page_index_map() instead of
+    scanning the page tree per item. Items pointing nowhere are skipped.
+    """
+    outlines = reader.trailer["/Root"].get("/Outlines")
+    if outlines is None:
+        return []
+    index = page_index_map(reader)
+    named = {"reader": reader, "map": None}
+    entries = []
+    seen = set()
+
+    def walk(ref, depth):
+        while ref is not None:
+            if isinstance(ref, IndirectObject):
+                # Broken files can loop /Next back on itself
+                if ref.idnum in seen:
+                    return
+                seen.add(ref.idnum)
+            item = ref.get_object()
+            if not isinstance(item, DictionaryObject):
+                return
+            page = _outline_page_ref(item, named)
+            if isinstance(page, IndirectObject):
+                page_index = index.get(page.idnum)
+            elif isinstance(page, int) and 0 <= page < len(index):
+                page_index = int(page)
+            else:
+                page_index = None
+            if page_index is not None:
+                title = item["/Title"] if "/Title" in item else ""
+                entries.append((str(title), page_index, depth))
+            if depth < max_depth and item.get("/First") is not None:
+                walk(item.get("/First"), depth + 1)
+            ref = item.get("/Next")
+
+    walk(outlines.get_object().get("/First"), 1)
+    return entries
+
+
+def _pikepdf_named_dest(pdf, name):
+    root = pdf.Root
+    if "/Dests" in root:
+        target = root.Dests.get("/" + name.lstrip("/"))
+        if target is not None:
+            return target
+    names = root.get("/Names")
+    if names is not None and "/Dests" in names:
+        tree = pikepdf.NameTree(names.Dests)
+        if name in tree:
+            return tree[name]
+    return None
+
+
+def pikepdf_outline_entries(pdf, max_depth=1):
+    """outline_entries() for a pikepdf document."""
+    root = pdf.Root
+    if "/Outlines" not in root:
+        return []
+    index = {page.obj.objgen: i for i, page in enumerate(pdf.pages)}
+    entries = []
+    seen = set()
+
+    def page_of(item):
+        dest = item.get("/Dest")
+        if dest is None:
+            action = item.get("/A")
+            if isinstance(action, pikepdf.Dictionary) and action.get("/S") == "/GoTo":
+                dest = action.get("/D")
+        if isinstance(dest, (pikepdf.String, pikepdf.Name)):
+            dest = _pikepdf_named_dest(pdf, str(dest))
+        if isinstance(dest, pikepdf.Dictionary):
+            dest = dest.get("/D")
+        if isinstance(dest, pikepdf.Array) and len(dest):
+            page = dest[0]
+            if isinstance(page, pikepdf.Dictionary):
+                return index.get(page.objgen)
+            if isinstance(page, int) and 0 <= page < len(index):
+                return int(page)
+        return None
+
+    def walk(item, depth):
+        while isinstance(item, pikepdf.Dictionary):
+            if item.is_indirect:
+                # Broken files can loop /Next back on itself
+                if item.objgen in seen:
+                    return
+                seen.add(item.objgen)
+            page_index = page_of(item)
+            if page_index is not None:
+                entries.append((str(item.get("/Title", "")), page_index, depth))
+            if depth < max_depth and "/First" in item:
+                walk(item.First, depth + 1)
+            item = item.get("/Next")
+
+    walk(root.Outlines.get("/First"), 1)
+    return entries
+
+
+def outline_rows(reader, max_depth=1, offset=0, backend=None, skipped=None):
+    """Table rows (filename, start, "", "", True) built from the outline.
+
+    Start pages are given in table terms, i.e. with offset removed again.
+    Entries are ordered by page; when several start on the same page the
+    first (outermost) one wins, so the next-start-minus-one rule still works.
+    Entries before printed page 1 (front matter, with offset > 0) have no
+    table page; their titles go to the skipped list, if one is given.
+    """
+    rows = []
+    last_page = None
+    for title, page_index, depth in sorted((backend or PYPDF2).outline(reader, max_depth), key=lambda e: e[1]):
+        if page_index + 1 - offset < 1:
+            if skipped is not None:
+                skipped.append(title)
+            continue
+        if page_index == last_page:
+            continue
+        last_page = page_index
+        rows.append((title, str(page_index + 1 - offset), "", "", True))
+    return rows
+
+
+def chunk_rows(ranges, name="Filename"):
+    """Table rows (name_#, start, end) for 0-based (first, last) page ranges.
+
+    Pages are physical, so the rows are meant for offset 0.
+    """
+    return [(f"{name}_{i}", str(first + 1), str(last + 1), "", True)
+            for i, (first, last) in enumerate(ranges, start=1)]
+
+
+def stride_ranges(total_pages, pages_per_file):
+    """(first, last) ranges of pages_per_file (>= 1) pages; the last one may be shorter."""
+    return [(first, min(first + pages_per_file, total_pages) - 1)
+            for first in range(0, total_pages, pages_per_file)]
+
+
+# Rough size of the parts of a PdfWriter file that are not page objects
+SIZE_FILE_OVERHEAD = 1024
+# "n 0 obj" / "endobj" around every object plus its xref line
+SIZE_OBJECT_OVERHEAD = 40
+# Keys PdfWriter.add_page() does not copy (at any depth)
+SIZE_SKIP_KEYS = ("/Parent", "/StructParents")
+# Inputs whose size index / page numbering are kept (the watch and serve
+# modes see a new path for every job)
+INFO_CACHE_SIZE = 8
+
+
+class InfoCache:
+    """Small thread-safe LRU of per-input results, keyed by (path, size, mtime)."""
+
+    def __init__(self, size=INFO_CACHE_SIZE):
+        self.size = size
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            value = self.entries.get(key)
+            if value is not None:
+                self.entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+_size_index_cache = InfoCache()
+
+
+def page_size_index(pdf_path, reader=None):
+    """Serialized size of every object and the objects each page pulls in.
+
+    Pages are followed the way PdfWriter.add_page() copies them, so a font
+    or image shared by many pages is one object listed by each of them and
+    counted once per segment. Every object is serialized once; the index is
+    cached per (path, size, mtime) for the last few inputs. Returns (sizes, pages): sizes maps
+    object number -> bytes, pages[i] is the tuple of object numbers page i
+    needs.
+    """
+    st = os.stat(pdf_path)
+    key = (os.path.abspath(pdf_path), st.st_size, st.st_mtime)
+    index = _size_index_cache.get(key)
+    if index is not None:
+        return index
+
+    reader = reader or PYPDF2.open(pdf_path)
+    sizes = {}
+    pages = []
+    for i, page in enumerate(reader.pages):
+        ref = page.indirect_reference
+        # A direct page object gets a key no real object number can have
+        root = ref.idnum if ref is not None else -(i + 1)
+        needed = set()
+        stack = [(root, page)]
+        while stack:
+            idnum, obj = stack.pop()
+            if idnum in needed:
+                continue
+            needed.add(idnum)
+            if idnum not in sizes:
+                sizes[idnum] = len(_serialize(obj))
+            pending = [obj]
+            while pending:
+                value = pending.pop()
+                if isinstance(value, IndirectObject):
+                    if value.idnum not in needed:
+                        stack.append((value.idnum, value.get_object()))
+                elif isinstance(value, DictionaryObject):
+                    pending.extend(v for k, v in value.items() if k not in SIZE_SKIP_KEYS)
+                elif isinstance(value, ArrayObject):
+                    pending.extend(value)
+        pages.append(tuple(needed))
+    index = (sizes, pages)
+    _size_index_cache.put(key, index)
+    return index
+
+
+def size_capped_ranges(index, max_bytes):
+    """Pack consecutive pages into (first, last) ranges under max_bytes.
+
+    Uses page_size_index() estimates; an object already in the current
+    range costs nothing for the next page. A page that is larger than
+    max_bytes on its own still gets a range of its own.
+    """
+    sizes, pages = index
+    ranges = []
+    first = 0
+    needed = set()
+    total = SIZE_FILE_OVERHEAD
+    for p, objects in enumerate(pages):
+        extra = sum(sizes[idnum] + SIZE_OBJECT_OVERHEAD for idnum in objects if idnum not in needed)
+        if p > first and total + extra > max_bytes:
+            ranges.append((first, p - 1))
+            first = p
+            needed = set()
+            total = SIZE_FILE_OVERHEAD
+            extra = sum(sizes[idnum] + SIZE_OBJECT_OVERHEAD for idnum in objects)
+        needed.update(objects)
+        total += extra
+    if pages:
+        ranges.append((first, len(pages) - 1))
+    return ranges
+
+
+def parse_size(text):
+    """Bytes from "10MB", "512 KB", "1.5G" or a plain number of bytes."""
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMG]?)I?B?\s*", text, re.IGNORECASE)
+    if not match:
+        raise ValueError(f"not a size: {text!r}")
+    return int(float(match.group(1)) * 1024 ** " KMG".index(match.group(2).upper() or " "))
+
+
+def chunked_rows(pdf_path, pages_per_file=None, max_bytes=None, lang="en", reader=None):
+    """Rows for stride mode (pages_per_file) or size-capped mode (max_bytes).
+
+    Files are named after the input (name_1, name_2, ...) and the rows are
+    physical pages, so split them with offset 0. reader is the input already
+    opened with PyPDF2, if the caller has it. Raises SplitError when
+    pages_per_file < 1 or max_bytes <= 0.
+    """
+    if pages_per_file is not None and pages_per_file < 1:
+        raise SplitError(translate(lang, "err_every_min"))
+    if max_bytes is not None and max_bytes <= 0:
+        raise SplitError(translate(lang, "err_max_size_min"))
+    reader = reader or open_pdf(pdf_path, lang)
+    if pages_per_file is not None:
+        ranges = stride_ranges(len(reader.pages), pages_per_file)
+    else:
+        ranges = size_capped_ranges(page_size_index(pdf_path, reader), max_bytes)
+    return chunk_rows(ranges, os.path.splitext(os.path.basename(pdf_path))[0])
+
+
+def _roman(n):
+    out = []
+    for value, numeral in ((1000, "m"), (900, "cm"), (500, "d"), (400, "cd"), (100, "c"), (90, "xc"),
+                           (50, "l"), (40, "xl"), (10, "x"), (9, "ix"), (5, "v"), (4, "iv"), (1, "i")):
+        while n >= value:
+            out.append(numeral)
+            n -= value
+    return "".join(out)
+
+
+def _letters(n):
+    # PDF style: 1=a ... 26=z, 27=aa, 28=bb ...
+    return chr(ord("a") + (n - 1) % 26) * ((n - 1) // 26 + 1)
+
+
+def _label_ranges(reader):
+    """Flatten the /PageLabels number tree into sorted (first_index, dict)."""
+    tree = reader.trailer["/Root"].get("/PageLabels")
+    if tree is None:
+        return []
+    ranges = []
+    stack = [tree.get_object()]
+    while stack:
+        node = stack.pop()
+        nums = node.get("/Nums")
+        if nums is not None:
+            nums = nums.get_object()
+            for i in range(0, len(nums) - 1, 2):
+                ranges.append((int(nums[i]), nums[i + 1].get_object()))
+        kids = node.get("/Kids")
+        if kids is not None:
+            stack.extend(kid.get_object() for kid in kids.get_object())
+    ranges.sort(key=lambda r: r[0])
+    return ranges
+
+
+def page_labels(reader):
+    """Printed label of every page from /PageLabels, or None if there is none."""
+    ranges = _label_ranges(reader)
+    if not ranges:
+        return None
+    total = len(reader.pages)
+    labels = [str(i + 1) for i in range(total)]
+    for n, (first, spec) in enumerate(ranges):
+        last = ranges[n + 1][0] if n + 1 < len(ranges) else total
+        style = spec.get("/S")
+        prefix = str(spec["/P"]) if "/P" in spec else ""
+        number = int(spec["/St"]) if "/St" in spec else 1
+        for i in range(max(0, first), min(last, total)):
+            if style == "/D":
+                body = str(number)
+            elif style in ("/R", "/r"):
+                body = _roman(number)
+                body = body.upper() if style == "/R" else body
+            elif style in ("/A", "/a"):
+                body = _letters(number)
+                body = body.upper() if style == "/A" else body
+            else:
+                body = ""
+            labels[i] = prefix + body
+            number += 1
+    return labels
+
+
+PRINTED_NUMBER_RE = re.compile(r"^[\W_]*(?:page|p\.)?\s*(\d{1,5})(?:\s*(?:/|of)\s*\d+)?[\W_]*$", re.IGNORECASE)
+
+
+def _printed_number(text):
+    """Look for a lone page number in the first or last lines of a page."""
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    for line in lines[:2] + lines[-2:]:
+        m = PRINTED_NUMBER_RE.match(line)
+        if m:
+            return int(m.group(1))
+    return None
+
+
+def detect_printed_offset(reader, samples=5):
+    """Guess the offset from page numbers printed on a few sampled pages.
+
+    Only `samples` pages spread over the body of the document are text
+    extracted. Returns the offset two or more samples agree on, else None.
+    """
+    total = len(reader.pages)
+    if total == 0:
+        return None
+    lo, hi = total // 10, max(total // 10, total - 1 - total // 10)
+    if samples <= 1 or hi == lo:
+        picks = [lo]
+    else:
+        picks = sorted({lo + (hi - lo) * k // (samples - 1) for k in range(samples)})
+    votes = {}
+    for i in picks:
+        try:
+            number = _printed_number(reader.pages[i].extract_text() or "")
+        except Exception:
+            continue
+        if number is not None:
+            offset = (i + 1) - number
+            votes[offset] = votes.get(offset, 0) + 1
+    if not votes:
+        return None
+    offset, count = max(votes.items(), key=lambda v: v[1])
+    return offset if count >= min(2, len(picks)) else None
+
+
+_numbering_cache = InfoCache()
+
+
+def page_numbering(pdf_path, reader=None):
+    """Printed page numbering of pdf_path, cached per (path, size, mtime)
+    for the last few inputs.
+
+    Returns {"source": "labels" | "text" | "none", "labels": [...],
+    "offset": int or None}. /PageLabels wins; otherwise a few pages are
+    sampled for printed numbers, and labels are derived from that offset.
+    """
+    st = os.stat(pdf_path)
+    key = (os.path.abspath(pdf_path), st.st_size, st.st_mtime)
+    info = _numbering_cache.get(key)
+    if info is not None:
+        return info
+
+    reader = reader or PYPDF2.open(pdf_path)
+    total = len(reader.pages)
+    labels = page_labels(reader)
+    if labels is not None:
+        votes = {}
+        for i, label in enumerate(labels):
+            if label.isdigit():
+                offset = (i + 1) - int(label)
+                votes[offset] = votes.get(offset, 0) + 1
+        offset = max(votes.items(), key=lambda v: v[1])[0] if votes else None
+        info = {"source": "labels", "labels": labels, "offset": offset}
+    else:
+        offset = detect_printed_offset(reader)
+        if offset is None:
+            info = {"source": "none", "labels": [str(i + 1) for i in range(total)], "offset": None}
+        else:
+            # Pages before printed page 1 (covers etc.) get no label
+            labels = [str(i + 1 - offset) if i + 1 - offset >= 1 else "" for i in range(total)]
+            info = {"source": "text", "labels": labels, "offset": offset}
+    _numbering_cache.put(key, info)
+    return info
+
+
+def label_index(labels):
+    """Map printed label -> 1-based physical page; the first page wins."""
+    index = {}
+    for i, label in enumerate(labels):
+        if label:
+            index.setdefault(label, i + 1)
+    return index
+
+
+def labels_to_pages(rows, labels, lang="en"):
+    """Rewrite Start/End given as printed labels into physical page numbers.
+
+    Page Count values are left alone. Returns (rows, errors); a label that
+    does not exist is an error instead of being read as a physical page.
+    """
+    index = label_index(labels)
+    converted = []
+    errors = []
+    for i, (filename, start_s, end_s, count_s, mode_use_end) in enumerate(rows, start=1):
+        values = []
+        for value in (start_s, end_s):
+            value = value.strip()
+            if value and value not in index:
+                errors.append(translate(lang, "err_row_label", row=i, label=value))
+            values.append(str(index[value]) if value in index else value)
+        converted.append((filename, values[0], values[1], count_s, mode_use_end))
+    return converted, errors
+
+
+def manifest_row(entry):
+    """Convert one manifest entry (dict) to a validate_rows() row tuple."""
+    def field(key):
+        value = entry.get(key)
+        return "" if value is None else str(value)
+
+    mode = field("mode").strip().lower()
+    if mode in ("end", "count"):
+        mode_use_end = mode == "end"
+    else:
+        # Same as the table: End Page mode unless only a page count is given
+        mode_use_end = not field("count").strip()
+    return (field("filename"), field("start"), field("end"), field("count"), mode_use_end)
+
+
+PLAN_COLUMNS = ("filename", "start", "end", "count", "mode")
+
+
+def _plan_header(record):
+    # Map header cells (manifest names or the table headings) to manifest keys
+    names = {key: key for key in PLAN_COLUMNS}
+    for texts in TEXTS.values():
+        for key in ("filename", "start", "end", "count"):
+            names[texts[key].lower()] = key
+    header = [names.get(cell.strip().lower()) for cell in record]
+    return header if "filename" in header or "start" in header else None
+
+
+def parse_plan_text(text, delimiter=None):
+    """Rows from CSV/TSV text, e.g. cells copied from a spreadsheet.
+
+    The delimiter defaults to a tab when the first line has one, otherwise
+    a comma. The header line is optional; without one the columns are
+    filename,start,end,count[,mode].
+    """
+    lines = text.splitlines()
+    if delimiter is None:
+        delimiter = "\t" if lines and "\t" in lines[0] else ","
+    records = [record for record in csv.reader(lines, delimiter=delimiter) if any(cell.strip() for cell in record)]
+    header = _plan_header(records[0]) if records else None
+    if header is None:
+        header = PLAN_COLUMNS
+    else:
+        records = records[1:]
+    return [manifest_row({key: cell for key, cell in zip(header, record) if key}) for record in records]
+
+
+def plan_to_text(rows, delimiter=","):
+    """CSV/TSV text of table rows that parse_plan_text() reads back."""
+    out = StringIO()
+    writer = csv.writer(out, delimiter=delimiter, lineterminator="\n")
+    writer.writerow(PLAN_COLUMNS)
+    for filename, start, end, count, mode_use_end in rows:
+        writer.writerow((filename, start, end, count, "end" if mode_use_end else "count"))
+    return out.getvalue()
+
+
+def plan_flag(value, default=False):
+    """A yes/no plan option: JSON true/false, or 1/0, true/false, yes/no,
+    on/off as text (from a manifest, form or query string). Raises ValueError."""
+    if value is None or value == "":
+        return default
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in ("1", "true", "yes", "on"):
+        return True
+    if text in ("0", "false", "no", "off"):
+        return False
+    raise ValueError(f"not a yes/no value: {value!r}")
+
+
+def manifest_data(data):
+    """(rows, options) of a parsed JSON manifest: a list of rows or
+    {"offset": 0, "append_range": true, "rows": [...]}, each row an object.
+    append_range comes back as a bool (see plan_flag()). Raises ValueError
+    for any other shape."""
+    if isinstance(data, list):
+        data = {"rows": data}
+    if not isinstance(data, dict):
+        raise ValueError("a manifest is a list of rows or an object with \"rows\"")
+    entries = data.get("rows", [])
+    if not isinstance(entries, list):
+        raise ValueError("\"rows\" must be a list")
+    for number, entry in enumerate(entries, start=1):
+        if not isinstance(entry, dict):
+            raise ValueError(f"row {number} is not an object: {entry!r}")
+    options = {k: data[k] for k in ("offset", "append_range") if k in data}
+    if "append_range" in options:
+        options["append_range"] = plan_flag(options["append_range"], True)
+    return [manifest_row(e) for e in entries], options
+
+
+def load_manifest(path):
+    """Read a split plan from .json, .csv or .tsv.
+
+    JSON is either a list of rows or {"offset": 0, "append_range": true,
+    "rows": [...]}; CSV/TSV have an optional header with
+    filename,start,end,count[,mode]. Returns (rows, options).
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".json":
+        with open(path, "r", encoding="utf-8-sig") as f:
+            return manifest_data(json.load(f))
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        text = f.read()
+    return parse_plan_text(text, "\t" if ext == ".tsv" else ","), {}
+
+
+def save_manifest(path, rows, options=None):
+    """Write table rows as a plan that load_manifest() reads back.
+
+    .json keeps options (offset, append_range); .csv/.tsv only the rows.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".json":
+        entries = []
+        for filename, start, end, count, mode_use_end in rows:
+            entry = {"filename": filename, "start": start, "end": end, "count": count}
+            entry = {k: int(v) if v.strip().isdigit() else v for k, v in entry.items() if v.strip()}
+            entry["mode"] = "end" if mode_use_end else "count"
+            entries.append(entry)
+        data = dict(options or {})
+        data["rows"] = entries
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        return
+    # utf-8-sig so Excel opens Korean names correctly
+    with open(path, "w", encoding="utf-8-sig", newline="") as f:
+        f.write(plan_to_text(rows, "\t" if ext == ".tsv" else ","))
+
+
+def row_page_ranges(rows, total_pages=None, offset=0):
+    """{row index: (first, last)} 0-based pages each table row splits out.
+
+    Rows with errors are left out, and so is a first or last page that
+    falls outside the document (None); without total_pages the last
+    open-ended row has no last page.
+    """
+    numbered, _errors = _check_rows(rows, "en")
+    enriched = resolve_ends([spec for _row, spec in numbered], total_pages, offset)
+    ranges = {}
+    for (row, _spec), (_filename, start, end) in zip(numbered, enriched):
+        pages = []
+        for page in (start, end):
+            index = page + offset - 1 if page is not None else None
+            ok = index is not None and index >= 0 and (total_pages is None or index < total_pages)
+            pages.append(index if ok else None)
+        ranges[row - 1] = tuple(pages)
+    return ranges
+
+
+THUMB_HEIGHT = 96
+THUMB_CACHE_BYTES = 16 * 1024 * 1024
+THUMB_DIR_ENV = "PDF_CUTTER_THUMBS"
+
+
+class PyMuPDFRenderer:
+    """Renders pages with PyMuPDF, keeping recent documents open."""
+
+    name = "pymupdf"
+
+    def __init__(self, module):
+        self.module = module
+        self.docs = OrderedDict()
+
+    def render(self, pdf_path, page_index, height):
+        fitz = importlib.import_module(self.module)
+        doc = self.docs.pop(pdf_path, None) or fitz.open(pdf_path)
+        self.docs[pdf_path] = doc
+        while len(self.docs) > 2:
+            self.docs.popitem(last=False)[1].close()
+        page = doc[page_index]
+        zoom = height / page.rect.height
+        return page.get_pixmap(matrix=fitz.Matrix(zoom, zoom)).tobytes("png")
+
+
+class PdftoppmRenderer:
+    """Renders pages with poppler's pdftoppm, one process per page."""
+
+    name = "pdftoppm"
+
+    def __init__(self, exe):
+        self.exe = exe
+
+    def render(self, pdf_path, page_index, height):
+        n = str(page_index + 1)
+        done = subprocess.run(
+            [self.exe, "-png", "-singlefile", "-f", n, "-l", n, "-scale-to-x", "-1", "-scale-to-y", str(height),
+             pdf_path],
+            capture_output=True, check=True, timeout=60,
+        )
+        return done.stdout
+
+
+def thumbnail_renderer():
+    """PyMuPDF if installed, else pdftoppm if on PATH, else None (no previews)."""
+    # PyMuPDF < 1.24 only has the old "fitz" module name
+    for module in ("pymupdf", "fitz"):
+        if importlib.util.find_spec(module) is not None:
+            return PyMuPDFRenderer(module)
+    exe = shutil.which("pdftoppm")
+    return PdftoppmRenderer(exe) if exe else None
+
+
+class ThumbnailCache:
+    """PNG thumbnails keyed by (input file key, page index, height), where the
+    file key is (path, size, mtime).
+
+    Memory holds at most max_bytes, dropping the least recently used first.
+    With disk_dir (or $PDF_CUTTER_THUMBS) thumbnails are also kept there as
+    files named by the input's sha256, so they survive restarts and renamed
+    copies of the same input; get() and put() only use the disk when given
+    that digest.
+    """
+
+    def __init__(self, max_bytes=THUMB_CACHE_BYTES, disk_dir=None):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir or os.environ.get(THUMB_DIR_ENV) or None
+        self.items = OrderedDict()
+        self.size = 0
+        self.lock = threading.Lock()
+
+    def _disk_path(self, key, digest):
+        _file_key, page_index, height = key
+        return os.path.join(self.disk_dir, f"{digest}_{page_index}_{height}.png")
+
+    def peek(self, key):
+        """Memory only, so it never blocks on the disk."""
+        with self.lock:
+            return self.items.get(key)
+
+    def get(self, key, digest=None):
+        with self.lock:
+            data = self.items.get(key)
+            if data is not None:
+                self.items.move_to_end(key)
+                return data
+        if self.disk_dir and digest:
+            try:
+                with open(self._disk_path(key, digest), "rb") as f:
+                    data = f.read()
+            except OSError:
+                return None
+            self._remember(key, data)
+        return data
+
+    def put(self, key, data, digest=None):
+        self._remember(key, data)
+        if self.disk_dir and digest:
+            self._save(key, digest, data)
+
+    def save(self, file_key, digest):
+        """Write the thumbnails of one input still in memory to disk, once
+        its digest is known."""
+        if not self.disk_dir:
+            return
+        with self.lock:
+            items = [(key, data) for key, data in self.items.items() if key[0] == file_key]
+        for key, data in items:
+            self._save(key, digest, data)
+
+    def _save(self, key, digest, data):
+        try:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            with open(self._disk_path(key, digest), "wb") as f:
+                f.write(data)
+        except OSError:
+            pass  # the disk cache is only a speed-up
+
+    def _remember(self, key, data):
+        with self.lock:
+            old = self.items.pop(key, None)
+            if old is not None:
+                self.size -= len(old)
+            self.items[key] = data
+            self.size += len(data)
+            while self.size > self.max_bytes and len(self.items) > 1:
+                self.size -= len(self.items.popitem(last=False)[1])
+
+
+class ThumbnailLoader:
+    """Renders thumbnails on one background thread.
+
+    request() replaces whatever is still waiting, so pages of rows that
+    were scrolled out of view are never rendered. Finished thumbnails are
+    put on results as (pdf_path, page_index, png bytes or None). The input's
+    sha256 is only needed for the disk cache, so it is computed on a thread
+    of its own and never delays a thumbnail.
+    """
+
+    def __init__(self, renderer, cache=None, height=THUMB_HEIGHT):
+        self.renderer = renderer
+        self.cache = cache or ThumbnailCache()
+        self.height = height
+        self.results = queue.Queue()
+        self.wanted = []
+        self.rendering = False
+        self.digests = {}  # (path, size, mtime) -> sha256, for the disk cache
+        self.hashing = set()
+        self.cond = threading.Condition()
+        self.thread = None
+
+    def _file_key(self, pdf_path):
+        st = os.stat(pdf_path)
+        return (os.path.abspath(pdf_path), st.st_size, st.st_mtime)
+
+    def cached(self, pdf_path, page_index):
+        """Thumbnail already in memory, without waiting for the thread."""
+        try:
+            file_key = self._file_key(pdf_path)
+        except OSError:
+            return None
+        return self.cache.peek((file_key, page_index, self.height))
+
+    def busy(self):
+        with self.cond:
+            return bool(self.wanted) or self.rendering
+
+    def request(self, pdf_path, pages):
+        with self.cond:
+            self.wanted = [(pdf_path, page_index) for page_index in pages]
+            self.cond.notify()
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, daemon=True)
+            self.thread.start()
+
+    def _run(self):
+        while True:
+            with self.cond:
+                self.rendering = False
+                while not self.wanted:
+                    self.cond.wait()
+                pdf_path, page_index = self.wanted.pop(0)
+                self.rendering = True
+            try:
+                data = self._thumbnail(pdf_path, page_index)
+            except Exception:
+                data = None
+            # Put before rendering is cleared, so busy() never misses the last result
+            self.results.put((pdf_path, page_index, data))
+
+    def _thumbnail(self, pdf_path, page_index):
+        file_key = self._file_key(pdf_path)
+        digest = self.digests.get(file_key)
+        if digest is None and self.cache.disk_dir:
+            self._hash_later(pdf_path, file_key)
+        key = (file_key, page_index, self.height)
+        data = self.cache.get(key, digest)
+        if data is None:
+            data = self.renderer.render(pdf_path, page_index, self.height)
+            self.cache.put(key, data, digest)
+        return data
+
+    def _hash_later(self, pdf_path, file_key):
+        with self.cond:
+            if file_key in self.hashing:
+                return
+            self.hashing.add(file_key)
+        threading.Thread(target=self._hash, args=(pdf_path, file_key), daemon=True).start()
+
+    def _hash(self, pdf_path, file_key):
+        try:
+            digest = file_sha256(pdf_path)
+        except OSError:
+            return
+        self.digests[file_key] = digest
+        # Thumbnails rendered while hashing only reached memory so far
+        self.cache.save(file_key, digest)
+
+
+def resolve_plan(pdf_path, rows, offset=0, bookmarks=1, lang="en", every=None, max_bytes=None, skipped=None,
+                 reader=None):
+    """Rows and offset for one input of a saved rule set.
+
+    rows are a manifest's rows, or None to take them from the outline down
+    to bookmarks levels (see outline_rows() for skipped), or to cut the
+    input every N pages / under max_bytes (see chunked_rows(); offset is 0
+    then). offset may be "auto" to detect it from the input. reader is the
+    input already opened with PyPDF2, if the caller has it. Raises
+    SplitError.
+    """
+    if rows is not None and offset != "auto":
+        return rows, int(offset)
+    if rows is None and (every is not None or max_bytes is not None):
+        return chunked_rows(pdf_path, every, max_bytes, lang, reader), 0
+    # One parse of the input serves offset detection and the outline
+    owned = reader is None
+    if owned:
+        reader = open_pdf(pdf_path, lang)
+    try:
+        if offset == "auto":
+            offset = page_numbering(pdf_path, reader)["offset"]
+            if offset is None:
+                raise SplitError(translate(lang, "err_detect_none"))
+        offset = int(offset)
+        if rows is None:
+            rows = outline_rows(reader, bookmarks, offset, skipped=skipped)
+    finally:
+        if owned:
+            close_pdf(reader)
+    return rows, offset
+
+
+WATCH_DONE_DIR = "done"
+WATCH_FAILED_DIR = "failed"
+
+
+def _ignore_sigint():
+    # Ctrl+C goes to the whole process group; let the service decide when jobs stop
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def split_plan(rows, offset=0, append_range=True, lang="en", split=None, bookmarks=None, every=None,
+               max_bytes=None):
+    """A saved rule set for split_job(): the resolve_plan() arguments, plus
+    split (a dict of split_pdf() keyword options)."""
+    return {
+        "rows": rows,
+        "offset": offset,
+        "bookmarks": bookmarks,
+        "every": every,
+        "max_bytes": max_bytes,
+        "append_range": append_range,
+        "lang": lang,
+        "split": dict(split or {}),
+    }
+
+
+def split_job(pdf_path, out_dir, plan):
+    """Split one input with a saved rule set (see split_plan()). Returns the
+    SplitResult."""
+    rows, offset = resolve_plan(pdf_path, plan["rows"], plan["offset"], plan["bookmarks"], plan["lang"],
+                                plan["every"], plan["max_bytes"])
+    return split_pdf(pdf_path, out_dir, rows, offset, plan["append_range"], plan["lang"], **plan["split"])
+
+
+def move_aside(path, folder):
+    """Move path into folder without overwriting an earlier file of the same name."""
+    os.makedirs(folder, exist_ok=True)
+    base, ext = os.path.splitext(os.path.basename(path))
+    target = os.path.join(folder, base + ext)
+    n = 1
+    while os.path.exists(target):
+        target = os.path.join(folder, f"{base}_{n}{ext}")
+        n += 1
+    os.replace(path, target)
+    return target
+
+
+class WatchService:
+    """Split every PDF dropped into in_dir with one saved plan.
+
+    plan holds resolve_plan() and split_pdf() arguments (see run_cli()).
+    A file is queued once its size and mtime have not changed for settle
+    seconds, so files still being copied are left alone; dot files are
+    ignored. The job queue holds at most queue_size files and scanning waits
+    for the next poll while it is full. workers threads take jobs and run
+    them in a process pool of the same size.
+
+    Outputs go to out_dir/<input name>/ and the input moves to in_dir/done.
+    A failed job is retried after retry_delay * attempt seconds; after
+    retries retries the input moves to in_dir/failed with the error in a
+    .error.txt next to it. stop() lets running jobs finish and leaves queued
+    files where they are for the next start.
+    """
+
+    def __init__(self, in_dir, out_dir, plan, workers=2, queue_size=100, retries=2, retry_delay=30.0,
+                 settle=2.0, poll=1.0, report_every=60.0):
+        self.in_dir = in_dir
+        self.out_dir = out_dir
+        self.plan = plan
+        self.workers = max(1, workers)
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.settle = settle
+        self.poll = poll
+        self.report_every = report_every
+        self.jobs = queue.Queue(maxsize=max(1, queue_size))
+        self.stopping = threading.Event()
+        self.lock = threading.Lock()
+        self.pool = None
+        self.seen = {}  # path -> ((size, mtime), first seen with that size/mtime)
+        self.claimed = set()  # queued or running
+        self.retry_at = {}  # path -> (attempt, not before)
+        self.finished = deque()  # completion times of the last minute
+        self.active = 0
+        self.done = 0
+        self.failed = 0
+
+    def log(self, message):
+        print(f"{datetime.now():%Y-%m-%d %H:%M:%S} {message}", file=sys.stderr, flush=True)
+
+    def stop(self):
+        self.stopping.set()
+
+    def stats(self):
+        now = time.monotonic()
+        with self.lock:
+            while self.finished and now - self.finished[0] > 60:
+                self.finished.popleft()
+            return {
+                "queued": self.jobs.qsize(),
+                "running": self.active,
+                "retrying": len(self.retry_at),
+                "done": self.done,
+                "failed": self.failed,
+                "jobs_per_minute": len(self.finished),
+            }
+
+    def report(self):
+        self.log(" ".join(f"{key}={value}" for key, value in self.stats().items()))
+
+    def idle(self):
+        with self.lock:
+            return not self.seen and not self.claimed and not self.retry_at
+
+    def scan(self):
+        """Queue the inputs that are ready; returns how many were queued."""
+        now = time.monotonic()
+        try:
+            entries = list(os.scandir(self.in_dir))
+        except OSError as e:
+            self.log(f"cannot read {self.in_dir}: {e}")
+            return 0
+        present = set()
+        queued = 0
+        for entry in entries:
+            if entry.name.startswith(".") or not entry.name.lower().endswith(".pdf"):
+                continue
+            try:
+                if not entry.is_file():
+                    continue
+                stat = entry.stat()
+            except OSError:
+                continue
+            path = entry.path
+            present.add(path)
+            with self.lock:
+                if path in self.claimed:
+                    continue
+                attempt, not_before = self.retry_at.get(path, (0, 0.0))
+            signature = (stat.st_size, stat.st_mtime_ns)
+            seen = self.seen.get(path)
+            if seen is None or seen[0] != signature:
+                self.seen[path] = (signature, now)
+                continue
+            if stat.st_size == 0 or now - seen[1] < self.settle or now < not_before:
+                continue
+            with self.lock:
+                self.claimed.add(path)
+            try:
+                self.jobs.put_nowait((path, attempt))
+            except queue.Full:
+                with self.lock:
+                    self.claimed.discard(path)
+                break
+            del self.seen[path]
+            queued += 1
+
+        for path in [p for p in self.seen if p not in present]:
+            del self.seen[path]
+        with self.lock:
+            for path in [p for p in self.retry_at if p not in present and p not in self.claimed]:
+                del self.retry_at[path]
+        return queued
+
+    def _submit(self, path, out_dir):
+        with self.lock:
+            pool = self.pool
+        try:
+            return pool, pool.submit(split_job, path, out_dir, self.plan)
+        except BrokenProcessPool:
+            self._restart_pool(pool)
+            raise
+
+    def _restart_pool(self, broken):
+        with self.lock:
+            if self.pool is broken:
+                self.log("worker process died, restarting the pool")
+                self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_ignore_sigint)
+        broken.shutdown(wait=False)
+
+    def _run_job(self, path, attempt):
+        name = os.path.splitext(os.path.basename(path))[0]
+        out_dir = os.path.join(self.out_dir, safe_filename(name))
+        started = time.monotonic()
+        try:
+            pool, future = self._submit(path, out_dir)
+            try:
+                count = len(future.result())
+            except BrokenProcessPool:
+                self._restart_pool(pool)
+                raise
+        except Exception as e:
+            error = str(e) or type(e).__name__
+            if attempt < self.retries and os.path.exists(path):
+                with self.lock:
+                    self.retry_at[path] = (attempt + 1, time.monotonic() + self.retry_delay * (attempt + 1))
+                self.log(f"retry {attempt + 1}/{self.retries} later: {path}: {error}")
+                return
+            with self.lock:
+                self.retry_at.pop(path, None)
+                self.failed += 1
+            try:
+                target = move_aside(path, os.path.join(self.in_dir, WATCH_FAILED_DIR))
+                with open(target + ".error.txt", "w", encoding="utf-8") as f:
+                    f.write(error + "\n")
+            except OSError as move_error:
+                self.log(f"cannot move {path}: {move_error}")
+            self.log(f"failed: {path}: {error}")
+            return
+
+        with self.lock:
+            self.retry_at.pop(path, None)
+            self.done += 1
+            self.finished.append(time.monotonic())
+        try:
+            move_aside(path, os.path.join(self.in_dir, WATCH_DONE_DIR))
+        except OSError as e:
+            self.log(f"cannot move {path}: {e}")
+        self.log(f"done: {path} -> {out_dir} ({count} files, {time.monotonic() - started:.1f}s)")
+
+    def _work(self):
+        while True:
+            try:
+                path, attempt = self.jobs.get(timeout=self.poll)
+            except queue.Empty:
+                if self.stopping.is_set():
+                    return
+                continue
+            if self.stopping.is_set():
+                with self.lock:
+                    self.claimed.discard(path)
+                continue
+            with self.lock:
+                self.active += 1
+            try:
+                self._run_job(path, attempt)
+            finally:
+                with self.lock:
+                    self.active -= 1
+                    self.claimed.discard(path)
+
+    def run(self, once=False):
+        """Watch until stop(); with once, until in_dir has nothing left to split."""
+        os.makedirs(self.out_dir, exist_ok=True)
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_ignore_sigint)
+        threads = [threading.Thread(target=self._work, daemon=True) for _ in range(self.workers)]
+        for thread in threads:
+            thread.start()
+        self.log(f"watching {self.in_dir} -> {self.out_dir} ({self.workers} workers)")
+        next_report = time.monotonic() + self.report_every
+        try:
+            while not self.stopping.is_set():
+                self.scan()
+                if once and self.idle():
+                    break
+                if self.report_every and time.monotonic() >= next_report:
+                    self.report()
+                    next_report = time.monotonic() + self.report_every
+                self.stopping.wait(self.poll)
+        finally:
+            self.stopping.set()
+            if self.active:
+                self.log(f"stopping, waiting for {self.active} running jobs")
+            for thread in threads:
+                thread.join()
+            self.pool.shutdown()
+            self.report()
+
+
+def expand_inputs(text):
+    """Input PDFs named by text: paths or glob patterns separated by
+    os.pathsep (or a list of them). An existing file is taken as it is,
+    even when its name has [, * or ?. Sorted, without duplicates."""
+    patterns = text.split(os.pathsep) if isinstance(text, str) else text
+    found = {}
+    for pattern in patterns:
+        pattern = pattern.strip()
+        if not pattern:
+            continue
+        if os.path.isfile(pattern) or not glob.has_magic(pattern):
+            paths = [pattern]
+        else:
+            paths = glob.glob(pattern)
+        for path in paths:
+            if os.path.isfile(path) and path.lower().endswith(".pdf"):
+                found.setdefault(os.path.abspath(path), path)
+    return sorted(found.values())
+
+
+def batch_targets(inputs, out_dir, archive=None):
+    """out_dir/<input name> for every input (like the watch service), with
+    _2, _3... when names collide; out_dir/<input name>.<archive> with archive."""
+    targets = []
+    taken = set()
+    for pdf_path in inputs:
+        base = safe_filename(os.path.splitext(os.path.basename(pdf_path))[0])
+        name, n = base, 1
+        while name.casefold() in taken:
+            n += 1
+            name = f"{base}_{n}"
+        taken.add(name.casefold())
+        targets.append(os.path.join(out_dir, f"{name}.{archive}" if archive else name))
+    return targets
+
+
+def batch_rows_base(inputs):
+    """Base name of the first input (in expand_inputs() order) that a batch's rows are named after."""
+    return os.path.splitext(os.path.basename(inputs[0]))[0] if inputs else ""
+
+
+def renamed_rows(rows, base, old_base=""):
+    """Rows with default names (Filename_#, 파일명_# or old_base_#) named base_# instead."""
+    names = ["Filename", "파일명"] + ([re.escape(old_base)] if old_base else [])
+    pattern = re.compile(rf"(?:{'|'.join(names)})_(\d+)")
+    renamed = []
+    for row in rows:
+        match = pattern.fullmatch(row[0].strip())
+        renamed.append((f"{base}_{match.group(1)}",) + tuple(row[1:]) if match else tuple(row))
+    return renamed
+
+
+BatchItem = namedtuple("BatchItem", "input target result error")
+
+
+class BatchResult(list):
+    """BatchItems in input order, plus the wall time of the whole batch."""
+
+    def __init__(self, items, elapsed):
+        super().__init__(items)
+        self.elapsed = elapsed
+
+    @property
+    def failures(self):
+        return [item for item in self if item.error is not None]
+
+    @property
+    def pages(self):
+        return sum(item.result.pages for item in self if item.result is not None)
+
+    @property
+    def pages_per_second(self):
+        return self.pages / self.elapsed if self.elapsed else 0.0
+
+
+def split_batch(inputs, out_dir, plan, jobs=2, progress=None, cancel=None, rows_base=None):
+    """Split every input with one plan (see split_job()), jobs files at a time.
+
+    Each input goes to its own batch_targets() subfolder (or archive, when
+    plan["split"] has one); rows with default names, or named rows_base_#
+    (default: after the first input, as batch_rows_base() picks it), are
+    renamed after each input. progress(done, total, item) is called as each
+    file finishes.
+    Setting cancel drops the files that have not started; running ones
+    finish and the result lists the dropped ones as cancelled. Failures do
+    not stop the batch. Returns a BatchResult.
+    """
+    started = time.perf_counter()
+    ensure_out_dir(out_dir, plan["lang"])
+    targets = batch_targets(inputs, out_dir, plan["split"].get("archive"))
+    if rows_base is None:
+        rows_base = batch_rows_base(inputs)
+    items = [None] * len(inputs)
+    with ProcessPoolExecutor(max_workers=max(1, jobs)) as pool:
+        futures = {}
+        for i, (pdf_path, target) in enumerate(zip(inputs, targets)):
+            job_plan = dict(plan)
+            if plan["rows"] is not None:
+                base = os.path.splitext(os.path.basename(pdf_path))[0]
+                job_plan["rows"] = renamed_rows(plan["rows"], base, rows_base)
+            futures[pool.submit(split_job, pdf_path, target, job_plan)] = i
+        done = 0
+        pending = set(futures)
+        while pending:
+            finished, pending = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+            if cancel is not None and cancel.is_set():
+                for future in pending:
+                    future.cancel()
+            for future in finished:
+                i = futures[future]
+                if future.cancelled():
+                    continue
+                try:
+                    items[i] = BatchItem(inputs[i], targets[i], future.result(), None)
+                except Exception as e:
+                    items[i] = BatchItem(inputs[i], targets[i], None, str(e) or type(e).__name__)
+                done += 1
+                if progress is not None:
+                    progress(done, len(inputs), items[i])
+    cancelled = translate(plan["lang"], "batch_cancelled")
+    items = [item or BatchItem(inputs[i], targets[i], None, cancelled) for i, item in enumerate(items)]
+    return BatchResult(items, time.perf_counter() - started)
+
+
+def batch_summary(result, lang="en"):
+    """One report for a whole batch: totals, pages per second and every failure."""
+    lines = [translate(lang, "batch_summary", done=len(result) - len(result.failures), total=len(result),
+                       pages=result.pages, seconds=result.elapsed, rate=result.pages_per_second)]
+    if result.failures:
+        lines.append(translate(lang, "batch_failures", count=len(result.failures)))
+        lines.append(format_problems([f"{os.path.basename(item.input)}: {item.error}"
+                                      for item in result.failures], lang))
+    return "\n".join(lines)
+
+
+SERVE_CHUNK = 64 * 1024
+SERVE_HEADER_LIMIT = 64 * 1024
+SERVE_CONTENT_TYPES = {"zip": "application/zip", "tar": "application/x-tar", "tar.gz": "application/gzip"}
+SERVE_FORMATS = ARCHIVE_FORMATS + ("files",)
+
 
-        self.mode_use_end = True
-        default = default_name if default_name else f"Filename_{row_index + 1}"
-        self.filename_var = tk.StringVar(value=default)
-        self.start_var = tk.StringVar()
-        self.end_var = tk.StringVar()
-        self.count_var = tk.StringVar()
-
-        self.filename_entry = ttk.Entry(parent, textvariable=self.filename_var, width=28, justify="left")
-        self.start_entry = ttk.Entry(parent, textvariable=self.start_var, width=4, justify="center")
-        self.end_frame = ttk.Frame(parent)
-        self.count_frame = ttk.Frame(parent)
-        self.end_entry = ttk.Entry(self.end_frame, textvariable=self.end_var, width=4, justify="center")
-        self.count_entry = ttk.Entry(self.count_frame, textvariable=self.count_var, width=4, justify="center")
-        self.end_block = tk.Label(self.end_frame, text="X", fg="#9a9a9a")
-        self.count_block = tk.Label(self.count_frame, text="X", fg="#9a9a9a")
-        self.switch_btn = ttk.Button(parent, text="<>", width=3, command=self.toggle_mode)
-        self.vline_1 = tk.Frame(parent, bg="#d0d0d0", width=1)
-        self.vline_2 = tk.Frame(parent, bg="#d0d0d0", width=1)
-        self.vline_3 = tk.Frame(parent, bg="#d0d0d0", width=1)
-        self.vline_4 = tk.Frame(parent, bg="#d0d0d0", width=1)
-
-        self.filename_entry.grid(row=grid_row, column=0, padx=4, pady=2, sticky="we")
-        self.vline_1.grid(row=grid_row, column=1, sticky="nsew")
-        self.start_entry.grid(row=grid_row, column=2, padx=4, pady=2, sticky="we")
-        self.vline_2.grid(row=grid_row, column=3, sticky="nsew")
-        self.end_frame.grid(row=grid_row, column=4, padx=2, pady=2, sticky="nsew")
-        self.vline_3.grid(row=grid_row, column=5, sticky="nsew")
-        self.switch_btn.grid(row=grid_row, column=6, padx=2, pady=2)
-        self.vline_4.grid(row=grid_row, column=7, sticky="nsew")
-        self.count_frame.grid(row=grid_row, column=8, padx=2, pady=2, sticky="nsew")
-
-        self.end_frame.columnconfigure(0, weight=1)
-        self.count_frame.columnconfigure(0, weight=1)
-
-        self.end_entry.grid(row=0, column=0, sticky="we")
-        self.count_entry.grid(row=0, column=0, sticky="we")
-
-        # Overlay X centered within the entry area
-        self.end_block.place(relx=0.5, rely=0.5, anchor="center")
-        self.count_block.place(relx=0.5, rely=0.5, anchor="center")
-
-    def set_mode(self, use_end: bool):
-        self.mode_use_end = use_end
-        if use_end:
-            self.end_entry.state(["!disabled"])
-            self.count_entry.state(["disabled"])
-            self.end_block.place_forget()
-            self.count_block.place(relx=0.5, rely=0.5, anchor="center")
-        else:
-            self.end_entry.state(["disabled"])
-            self.count_entry.state(["!disabled"])
-            self.count_block.place_forget()
-            self.end_block.place(relx=0.5, rely=0.5, anchor="center")
+class ServeError(Exception):
+    """A request the server answers with status and a JSON error message."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def request_plan(data, lang="en"):
+    """split_job() plan of a JSON request body.
+
+    data is a manifest (see manifest_data()) that may also hold offset
+    ("auto" allowed), bookmarks, every, max_size (bytes or e.g. "10MB"),
+    optimize and printed_pages; exactly one of rows, bookmarks, every or
+    max_size says where to cut. Raises ServeError(400).
+    """
+    if not isinstance(data, (dict, list)):
+        raise ServeError(400, "plan must be a JSON object or a list of rows")
+    try:
+        rows, options = manifest_data(data)
+    except ValueError as e:
+        raise ServeError(400, f"bad plan: {e}")
+    data = data if isinstance(data, dict) else {}
+    rows = rows or None
+    bookmarks, every, max_bytes = data.get("bookmarks"), data.get("every"), data.get("max_size")
+    if sum(value is not None for value in (rows, bookmarks, every, max_bytes)) != 1:
+        raise ServeError(400, "plan needs exactly one of rows, bookmarks, every or max_size")
+    try:
+        bookmarks = None if bookmarks is None else int(bookmarks)
+        every = None if every is None else int(every)
+        max_bytes = None if max_bytes is None else parse_size(str(max_bytes))
+        split = {"optimize": plan_flag(data.get("optimize")), "printed_labels": plan_flag(data.get("printed_pages"))}
+    except (TypeError, ValueError) as e:
+        raise ServeError(400, str(e))
+    if every is not None and every < 1:
+        raise ServeError(400, translate(lang, "err_every_min"))
+    if max_bytes is not None and max_bytes <= 0:
+        raise ServeError(400, translate(lang, "err_max_size_min"))
+    offset = options.get("offset", 0)
+    if offset != "auto":
+        try:
+            offset = int(offset)
+        except (TypeError, ValueError):
+            raise ServeError(400, translate(lang, "err_offset_int"))
+    return split_plan(rows, offset, options.get("append_range", True), lang, split, bookmarks, every,
+                      max_bytes)
+
+
+class _ResponseStream:
+    # Binary file object for the split thread: an archive written to it goes
+    # out as HTTP chunks from the event loop, SERVE_CHUNK bytes at a time
+    def __init__(self, loop, send):
+        self.loop = loop
+        self.send = send
+        self.buffer = bytearray()
+        self.aborted = False
+
+    def write(self, data):
+        if self.aborted:
+            return len(data)
+        self.buffer += data
+        if len(self.buffer) >= SERVE_CHUNK:
+            self.flush()
+        return len(data)
+
+    def flush(self):
+        if self.buffer and not self.aborted:
+            data = bytes(self.buffer)
+            self.buffer.clear()
+            try:
+                asyncio.run_coroutine_threadsafe(self.send(data), self.loop).result()
+            except BaseException:
+                # The client is gone; let the split fail without sending any more
+                self.aborted = True
+                raise
+
+
+class SplitServer:
+    """Local HTTP API around split_pdf() for other tools.
+
+    POST /split?format=zip|tar|tar.gz|files&name=NAME with the PDF as the
+    request body and the plan (see request_plan()) as JSON in the
+    X-Split-Plan header or the plan query parameter; NAME (default
+    "document") stands in for the input file name in segment and archive
+    names. The upload is streamed to a file in work_dir, never held in
+    memory, and the split runs in a thread pool
+    off the event loop. Archive formats stream back as the segments are
+    written (chunked); "files" answers with JSON listing the segments,
+    which are then fetched with GET /jobs/<id>/<name> and removed with
+    DELETE /jobs/<id> or after keep seconds. GET /health reports the load.
+
+    At most limit splits run at once and queue_size more requests wait;
+    beyond that the server answers 503. read_timeout bounds every read of
+    the request, timeout a whole split (504, or a cut-off stream once the
+    archive has started). Every connection serves one request.
+    """
+
+    def __init__(self, host="127.0.0.1", port=8765, limit=2, queue_size=8, timeout=300.0, read_timeout=30.0,
+                 max_upload=1 << 30, keep=600.0, workers=1, backend=None, lang="en", work_dir=None,
+                 access_log=True):
+        load_asyncio()
+        self.host = host
+        self.port = port
+        self.limit = max(1, limit)
+        self.queue_size = max(0, queue_size)
+        self.timeout = timeout
+        self.read_timeout = read_timeout
+        self.max_upload = max_upload
+        self.keep = keep
+        self.workers = max(1, workers)
+        self.backend = get_backend(backend, lang).name
+        self.lang = lang
+        self.access_log = access_log
+        self.own_work_dir = work_dir is None
+        self.work_dir = work_dir or tempfile.mkdtemp(prefix="pdf_cutter_serve_")
+        self.executor = None
+        self.loop = None
+        self.stopping = None
+        self.slots = None
+        self.admitted = 0  # running or waiting splits
+        self.running = 0
+        self.served = 0
+        self.jobs = {}  # id -> (folder, created)
+        self.connections = set()
+        self.cancels = {}  # cancel event -> _ResponseStream (or None) of the running splits
+
+    def log(self, message):
+        print(f"{datetime.now():%Y-%m-%d %H:%M:%S} {message}", file=sys.stderr, flush=True)
+
+    def stop(self):
+        """Stop accepting requests and cancel running splits; safe to call from any thread."""
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self.stopping.set)
+
+    def run(self):
+        """Serve until SIGINT/SIGTERM (or stop())."""
+        try:
+            asyncio.run(self.serve(signals=True))
+        except KeyboardInterrupt:
+            pass
+
+    async def serve(self, ready=None, signals=False):
+        """Serve until stop(). ready (a threading.Event) is set once self.port is listening."""
+        self.loop = asyncio.get_running_loop()
+        self.stopping = asyncio.Event()
+        self.slots = asyncio.Semaphore(self.limit)
+        self.executor = ThreadPoolExecutor(max_workers=self.limit, thread_name_prefix="split")
+        os.makedirs(os.path.join(self.work_dir, "jobs"), exist_ok=True)
+        os.makedirs(os.path.join(self.work_dir, "uploads"), exist_ok=True)
+        if signals:
+            for signum in (signal.SIGINT, signal.SIGTERM):
+                try:
+                    self.loop.add_signal_handler(signum, self.stopping.set)
+                except (NotImplementedError, RuntimeError):
+                    pass  # Windows: Ctrl+C raises KeyboardInterrupt instead
+        server = await asyncio.start_server(self._connection, self.host, self.port, limit=SERVE_HEADER_LIMIT)
+        self.port = server.sockets[0].getsockname()[1]
+        if self.access_log:
+            self.log(f"serving on http://{self.host}:{self.port} ({self.limit} splits at once, "
+                     f"{self.queue_size} waiting)")
+        if ready is not None:
+            ready.set()
+        try:
+            async with server:
+                await self.stopping.wait()
+                server.close()
+                # Running splits stop between segments
+                for cancel, stream in self.cancels.items():
+                    if stream is not None:
+                        stream.aborted = True
+                    cancel.set()
+                if self.connections:
+                    await asyncio.wait(list(self.connections))
+        finally:
+            self.executor.shutdown(wait=True)
+            if self.own_work_dir:
+                shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def stats(self):
+        return {"running": self.running, "waiting": self.admitted - self.running, "limit": self.limit,
+                "queue_size": self.queue_size, "served": self.served, "jobs": len(self.jobs)}
+
+    async def _connection(self, reader, writer):
+        task = asyncio.current_task()
+        self.connections.add(task)
+        started = time.perf_counter()
+        request = status = None
+        try:
+            request = await self._read_head(reader)
+            status = await self._route(request, reader, writer)
+        except ServeError as e:
+            status = e.status
+            await self._send_error(writer, e.status, str(e))
+        except (ConnectionError, asyncio.IncompleteReadError):
+            status = "disconnected"
+        except Exception as e:
+            status = 500
+            await self._send_error(writer, 500, self._client_text(str(e)) or type(e).__name__)
+        finally:
+            self.connections.discard(task)
+            self.served += 1
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+            if self.access_log:
+                what = f"{request[0]} {request[1]}" if request else "-"
+                self.log(f"{what} {status} {time.perf_counter() - started:.3f}s")
+
+    async def _read(self, awaitable):
+        try:
+            return await asyncio.wait_for(awaitable, self.read_timeout)
+        except asyncio.TimeoutError:
+            raise ServeError(408, "request timed out")
 
-    def toggle_mode(self):
-        if not self.confirm_switch(self.mode_use_end):
+    async def _read_head(self, reader):
+        try:
+            head = await self._read(reader.readuntil(b"\r\n\r\n"))
+        except asyncio.LimitOverrunError:
+            raise ServeError(431, "request head too large")
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, target, _version = lines[0].split(" ", 2)
+        except ValueError:
+            raise ServeError(400, "bad request line")
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            if name:
+                headers[name.strip().lower()] = value.strip()
+        url = urllib.parse.urlsplit(target)
+        query = {key: values[-1] for key, values in urllib.parse.parse_qs(url.query).items()}
+        return method.upper(), url.path, query, headers
+
+    async def _route(self, request, reader, writer):
+        method, path, query, headers = request
+        self._expire_jobs()
+        parts = [urllib.parse.unquote(part) for part in path.strip("/").split("/")]
+        if parts == ["health"] and method == "GET":
+            return await self._send_json(writer, 200, dict(self.stats(), status="ok"))
+        if parts == ["split"] and method == "POST":
+            return await self._split(query, headers, reader, writer)
+        if len(parts) == 3 and parts[0] == "jobs" and method == "GET":
+            return await self._send_file(writer, parts[1], parts[2])
+        if len(parts) == 2 and parts[0] == "jobs" and method == "DELETE":
+            if self.jobs.pop(parts[1], None) is None:
+                raise ServeError(404, "no such job")
+            shutil.rmtree(os.path.join(self.work_dir, "jobs", parts[1]), ignore_errors=True)
+            return await self._send_json(writer, 200, {"deleted": parts[1]})
+        raise ServeError(404, f"no route for {method} {path}")
+
+    def _split_request(self, query, headers):
+        # (format, plan, upload length) of a POST /split, checked before the upload is read
+        fmt = query.get("format", "zip")
+        if fmt not in SERVE_FORMATS:
+            raise ServeError(400, f"format must be one of {', '.join(SERVE_FORMATS)}")
+        try:
+            plan = request_plan(json.loads(headers.get("x-split-plan") or query.get("plan") or "null"), self.lang)
+        except json.JSONDecodeError as e:
+            raise ServeError(400, f"plan is not JSON: {e}")
+        if "chunked" in headers.get("transfer-encoding", "").lower() or "content-length" not in headers:
+            raise ServeError(411, "send the PDF with a Content-Length")
+        try:
+            length = int(headers["content-length"])
+        except ValueError:
+            raise ServeError(400, "bad Content-Length")
+        if length > self.max_upload:
+            raise ServeError(413, f"PDF larger than {format_bytes(self.max_upload)}")
+        if self.admitted >= self.limit + self.queue_size:
+            raise ServeError(503, "server busy, try again later")
+        return fmt, plan, length
+
+    async def _split(self, query, headers, reader, writer):
+        try:
+            fmt, plan, length = self._split_request(query, headers)
+        except ServeError:
+            await self._discard(reader, headers)
+            raise
+        job = os.urandom(8).hex()
+        name = os.path.splitext(query.get("name", "").strip())[0].strip()
+        name = safe_filename(name) if name else "document"
+        upload = os.path.join(self.work_dir, "uploads", job, name + ".pdf")
+        os.makedirs(os.path.dirname(upload))
+        self.admitted += 1
+        try:
+            if headers.get("expect", "").lower() == "100-continue":
+                writer.write(b"HTTP/1.1 100 Continue\r\n\r\n")
+                await writer.drain()
+            await self._receive(reader, upload, length)
+            async with self.slots:
+                self.running += 1
+                try:
+                    if fmt == "files":
+                        return await self._split_files(upload, job, plan, writer)
+                    return await self._split_archive(upload, fmt, plan, writer)
+                finally:
+                    self.running -= 1
+        finally:
+            self.admitted -= 1
+            shutil.rmtree(os.path.dirname(upload), ignore_errors=True)
+
+    async def _discard(self, reader, headers):
+        # Read a refused upload, so closing the connection does not reset it before the client has the answer
+        if headers.get("expect", "").lower() == "100-continue":
             return
-        if self.mode_use_end:
-            self.end_var.set("")
-            self.set_mode(False)
-        else:
-            self.count_var.set("")
-            self.set_mode(True)
-        self.on_change()
+        try:
+            remaining = int(headers.get("content-length", 0))
+        except ValueError:
+            return
+        if remaining > self.max_upload:
+            return
+        try:
+            while remaining:
+                chunk = await self._read(reader.read(min(SERVE_CHUNK, remaining)))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+        except ServeError:
+            pass
 
-    def destroy(self):
-        self.filename_entry.destroy()
-        self.start_entry.destroy()
-        self.end_frame.destroy()
-        self.switch_btn.destroy()
-        self.count_frame.destroy()
-        self.vline_1.destroy()
-        self.vline_2.destroy()
-        self.vline_3.destroy()
-        self.vline_4.destroy()
+    async def _receive(self, reader, path, length):
+        # The upload goes to disk as it arrives
+        with open(path, "wb") as f:
+            remaining = length
+            while remaining:
+                chunk = await self._read(reader.read(min(SERVE_CHUNK, remaining)))
+                if not chunk:
+                    raise ServeError(400, "upload ended before Content-Length bytes")
+                f.write(chunk)
+                remaining -= len(chunk)
 
+    async def _run_split(self, upload, target, plan, stream=None):
+        # split_job() in the pool; past timeout the split is cancelled between segments
+        cancel = threading.Event()
+        self.cancels[cancel] = stream
+        plan = dict(plan, split=dict(plan["split"], cancel=cancel, workers=self.workers, backend=self.backend))
+        if stream is not None:
+            plan["split"]["archive"] = target
+            target = stream
+        future = self.loop.run_in_executor(self.executor, split_job, upload, target, plan)
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), self.timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            cancel.set()
+            if stream is not None:
+                stream.aborted = True
+            try:
+                await future
+            except Exception:
+                pass
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            raise ServeError(504, f"split took longer than {self.timeout:g}s")
+        except SplitCancelled:
+            raise ServeError(503, "server stopping")
+        except SplitError as e:
+            raise ServeError(422, self._client_text(str(e), upload))
+        finally:
+            self.cancels.pop(cancel, None)
+
+    def _client_text(self, text, upload=None):
+        # Error text for the client: files under work_dir go by their own name
+        # (the upload by the name it was sent with), never by server path
+        if upload:
+            text = text.replace(upload, os.path.basename(upload))
+        for root in {self.work_dir, os.path.realpath(self.work_dir)}:
+            text = re.sub(re.escape(root) + r"[^\s'\"]*", lambda m: os.path.basename(m.group(0)), text)
+        return text
+
+    async def _split_archive(self, upload, fmt, plan, writer):
+        name = os.path.splitext(os.path.basename(upload))[0]
+        sent = {"head": False}
+
+        async def send(data):
+            if not sent["head"]:
+                sent["head"] = True
+                writer.write(self._head(200, SERVE_CONTENT_TYPES[fmt], {
+                    "Transfer-Encoding": "chunked",
+                    "Content-Disposition": f"attachment; filename*=UTF-8''{urllib.parse.quote(name)}.{fmt}",
+                }))
+            writer.write(b"%x\r\n%s\r\n" % (len(data), data))
+            await self._read(writer.drain())
+
+        stream = _ResponseStream(self.loop, send)
+        try:
+            await self._run_split(upload, fmt, plan, stream)
+        except Exception as e:
+            if not sent["head"]:
+                raise
+            # The status line is gone: end without the last chunk so the client sees a broken download
+            stream.aborted = True
+            return f"{getattr(e, 'status', 500)} after streaming"
+        if not sent["head"]:
+            await send(b"")
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+        return 200
+
+    async def _split_files(self, upload, job, plan, writer):
+        out_dir = os.path.join(self.work_dir, "jobs", job)
+        started = time.perf_counter()
+        try:
+            result = await self._run_split(upload, out_dir, plan)
+        except BaseException:
+            shutil.rmtree(out_dir, ignore_errors=True)
+            raise
+        self.jobs[job] = (out_dir, time.monotonic())
+        files = [{"name": os.path.basename(path), "size": os.path.getsize(path),
+                  "url": f"/jobs/{job}/{urllib.parse.quote(os.path.basename(path))}"} for path in result]
+        return await self._send_json(writer, 200, {
+            "job": job, "files": files, "pages": result.pages,
+            "seconds": round(time.perf_counter() - started, 3), "expires_in": self.keep,
+        })
+
+    def _expire_jobs(self):
+        now = time.monotonic()
+        for job, (out_dir, created) in list(self.jobs.items()):
+            if now - created > self.keep:
+                del self.jobs[job]
+                shutil.rmtree(out_dir, ignore_errors=True)
+
+    async def _send_file(self, writer, job, name):
+        entry = self.jobs.get(job)
+        if entry is None or name.startswith(".") or name != os.path.basename(name):
+            raise ServeError(404, "no such file")
+        path = os.path.join(entry[0], name)
+        if not os.path.isfile(path):
+            raise ServeError(404, "no such file")
+        with open(path, "rb") as f:
+            writer.write(self._head(200, "application/pdf", {
+                "Content-Length": str(os.fstat(f.fileno()).st_size),
+                "Content-Disposition": f"attachment; filename*=UTF-8''{urllib.parse.quote(name)}",
+            }))
+            while True:
+                chunk = f.read(SERVE_CHUNK)
+                if not chunk:
+                    break
+                writer.write(chunk)
+                await self._read(writer.drain())
+        return 200
+
+    def _head(self, status, content_type, headers=None):
+        lines = [f"HTTP/1.1 {status} {HTTPStatus(status).phrase}", f"Content-Type: {content_type}",
+                 "Connection: close"]
+        lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+    async def _send_json(self, writer, status, data):
+        body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        writer.write(self._head(status, "application/json; charset=utf-8", {"Content-Length": str(len(body))}) + body)
+        await self._read(writer.drain())
+        return status
+
+    async def _send_error(self, writer, status, message):
+        try:
+            await self._send_json(writer, status, {"error": message})
+        except (ConnectionError, ServeError):
+            pass
+
+
+def _positive(parse, what):
+    # argparse type: parse(text) that must come out above 0
+    def check(text):
+        value = parse(text)
+        if value <= 0:
+            raise argparse.ArgumentTypeError(f"{what} must be > 0: {text!r}")
+        return value
+    check.__name__ = parse.__name__  # argparse names the type in "invalid <name> value"
+    return check
+
+
+def add_plan_arguments(sp):
+    """Arguments shared by the split, watch and batch commands."""
+    plan = sp.add_mutually_exclusive_group(required=True)
+    plan.add_argument("--manifest", help="split plan (.json or .csv)")
+    plan.add_argument("--bookmarks", type=int, metavar="DEPTH", help="one file per outline item down to DEPTH")
+    plan.add_argument("--every", type=_positive(int, "N"), metavar="N", help="one file per N pages")
+    plan.add_argument("--max-size", type=_positive(parse_size, "SIZE"), metavar="SIZE",
+                      help="files no larger than SIZE (e.g. 10MB), estimated without trial writes")
+    sp.add_argument("--offset", default=None, help="page offset, or 'auto' to detect it (overrides the manifest)")
+    sp.add_argument("--printed-pages", action="store_true",
+                    help="Start/End are printed page labels (e.g. iv, 12), also in the appended ranges")
+    sp.add_argument("--no-append-range", action="store_true", help="do not append _Xp_to_Yp to file names")
+    sp.add_argument("--optimize", action="store_true", help="dedupe shared objects and compress each output")
+    sp.add_argument("--incremental", action="store_true",
+                    help=f"only rewrite segments that changed since the last run ({STATE_FILE})")
+    sp.add_argument("--low-memory", action="store_true", help="stream the input from disk (for multi-GB files)")
+    sp.add_argument("--backend", choices=["auto"] + sorted(BACKENDS), default=None,
+                    help=f"PDF library (default: pikepdf when installed, or ${BACKEND_ENV})")
+    sp.add_argument("--metrics-log", help=f"append a JSON line with run metrics (or set ${METRICS_ENV})")
+    sp.add_argument("--profile", help=f"save a cProfile .prof file or folder (or set ${PROFILE_ENV})")
+    sp.add_argument("--lang", choices=sorted(TEXTS), default="en")
+
+
+def plan_from_args(args):
+    """Read the manifest and offset of the plan arguments.
+
+    Returns (rows, offset, append_range); rows is None for --bookmarks and
+    offset may be "auto". Raises ValueError with a printable message.
+    """
+    if args.manifest:
+        try:
+            rows, options = load_manifest(args.manifest)
+        except (OSError, ValueError) as e:
+            raise ValueError(f"Cannot read manifest: {e}")
+    else:
+        rows, options = None, {}
+
+    offset = args.offset if args.offset is not None else options.get("offset", 0)
+    if offset != "auto":
+        try:
+            offset = int(offset)
+        except (TypeError, ValueError):
+            raise ValueError(translate(args.lang, "err_offset_int"))
+    append_range = options.get("append_range", True) and not args.no_append_range
+    return rows, offset, append_range
+
+
+def split_options(args):
+    return {
+        "optimize": args.optimize,
+        "printed_labels": args.printed_pages,
+        "low_memory": args.low_memory,
+        "incremental": args.incremental,
+        "backend": args.backend,
+        "metrics_log": args.metrics_log,
+        "profile": args.profile,
+    }
+
+
+def run_cli(argv):
+    parser = argparse.ArgumentParser(prog="PDF_Cutter.py", description="Split a PDF without the GUI.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sp = sub.add_parser("split", help="split a PDF using a manifest (.json or .csv)")
+    add_plan_arguments(sp)
+    sp.add_argument("--input", required=True, help="input PDF")
+    target = sp.add_mutually_exclusive_group(required=True)
+    target.add_argument("--out", help="output folder")
+    target.add_argument("--archive", metavar="PATH",
+                        help="write all segments into one .zip/.tar/.tar.gz instead, '-' for stdout")
+    sp.add_argument("--archive-format", choices=ARCHIVE_FORMATS,
+                    help="archive format when PATH has no such extension (default zip)")
+    sp.add_argument("--workers", type=int, default=1, help="write segments in N processes (default 1)")
+
+    cp = sub.add_parser("check", help="report every problem of a plan at once")
+    cp.add_argument("--manifest", required=True, help="split plan (.json, .csv or .tsv)")
+    cp.add_argument("--input", help="input PDF, to check the pages against its page count")
+    cp.add_argument("--offset", default=None, help="page offset, or 'auto' to detect it (needs --input)")
+    cp.add_argument("--no-append-range", action="store_true", help="do not append _Xp_to_Yp to file names")
+    cp.add_argument("--lang", choices=sorted(TEXTS), default="en")
+
+    wp = sub.add_parser("watch", help="split every PDF dropped into a folder")
+    add_plan_arguments(wp)
+    wp.add_argument("--dir", required=True, help="folder to watch")
+    wp.add_argument("--out", required=True, help="output folder (one subfolder per input)")
+    wp.add_argument("--workers", type=int, default=2, help="split N files at a time (default 2)")
+    wp.add_argument("--queue-size", type=int, default=100, help="most files waiting at once (default 100)")
+    wp.add_argument("--retries", type=int, default=2, help="retries of a failed file (default 2)")
+    wp.add_argument("--retry-delay", type=float, default=30.0, help="seconds before the first retry (default 30)")
+    wp.add_argument("--settle", type=float, default=2.0,
+                    help="seconds a file's size must stay the same before it is split (default 2)")
+    wp.add_argument("--poll", type=float, default=1.0, help="seconds between folder scans (default 1)")
+    wp.add_argument("--report-every", type=float, default=60.0,
+                    help="seconds between queue depth / jobs per minute reports, 0 to disable (default 60)")
+    wp.add_argument("--once", action="store_true", help="exit when the folder has nothing left to split")
+
+    bp = sub.add_parser("batch", help="split many PDFs with the same plan")
+    add_plan_arguments(bp)
+    bp.add_argument("--input", required=True, nargs="+", metavar="PDF",
+                    help="input PDFs or glob patterns (e.g. 'scans/*.pdf')")
+    bp.add_argument("--out", required=True, help="output folder (one subfolder or archive per input)")
+    bp.add_argument("--archive-format", choices=ARCHIVE_FORMATS,
+                    help="write each input's segments into one archive of this format")
+    bp.add_argument("--jobs", type=int, default=2, help="split N files at a time (default 2)")
+
+    hp = sub.add_parser("serve", help="HTTP API for other tools (POST /split)")
+    hp.add_argument("--host", default="127.0.0.1", help="address to listen on (default 127.0.0.1)")
+    hp.add_argument("--port", type=int, default=8765, help="port (default 8765, 0 picks a free one)")
+    hp.add_argument("--limit", type=int, default=2, help="splits running at once (default 2)")
+    hp.add_argument("--queue-size", type=int, default=8,
+                    help="requests waiting for a split slot before the server answers 503 (default 8)")
+    hp.add_argument("--timeout", type=float, default=300.0, help="seconds a split may take (default 300)")
+    hp.add_argument("--read-timeout", type=float, default=30.0,
+                    help="seconds to wait on each read of a request (default 30)")
+    hp.add_argument("--max-upload", type=parse_size, default=1 << 30, metavar="SIZE",
+                    help="largest PDF accepted (default 1GB)")
+    hp.add_argument("--keep", type=float, default=600.0,
+                    help="seconds format=files results stay downloadable (default 600)")
+    hp.add_argument("--workers", type=int, default=1, help="write each split's segments in N processes (default 1)")
+    hp.add_argument("--work-dir", help="folder for uploads and results (default: a temporary folder)")
+    hp.add_argument("--backend", choices=["auto"] + sorted(BACKENDS), default=None,
+                    help=f"PDF library (default: pikepdf when installed, or ${BACKEND_ENV})")
+    hp.add_argument("--quiet", action="store_true", help="do not log every request to stderr")
+    hp.add_argument("--lang", choices=sorted(TEXTS), default="en")
+    args = parser.parse_args(argv)
+    archive = None
+    if args.command == "split" and args.archive:
+        if args.incremental:
+            parser.error("--incremental needs --out")
+        archive = archive_format(args.archive, args.archive_format)
+        if archive is None:
+            if args.archive != "-":
+                parser.error("--archive needs a .zip, .tar or .tar.gz name, or --archive-format")
+            archive = "zip"
+    if args.command != "check":
+        try:
+            get_backend(args.backend, args.lang)
+        except SplitError as e:
+            print(e, file=sys.stderr)
+            return 2
+    if args.command == "serve":
+        return run_serve(args)
 
-def parse_int(value):
-    if value is None or value == "":
-        return None
     try:
-        n = int(value)
-    except ValueError:
-        raise ValueError("not_int")
-    return n
+        rows, offset, append_range = plan_from_args(args)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+
+    if args.command == "watch":
+        return run_watch(args, rows, offset, append_range)
+    if args.command == "batch":
+        return run_batch(args, rows, offset, append_range)
+    if args.command == "check":
+        return run_check(args, rows, offset, append_range)
+
+    skipped = []
+    try:
+        rows, offset = resolve_plan(args.input, rows, offset, args.bookmarks, args.lang, args.every, args.max_size,
+                                    skipped)
+        if skipped:
+            print(translate(args.lang, "warn_bookmarks_skipped", count=len(skipped), titles=", ".join(skipped)),
+                  file=sys.stderr)
+        saved = split_pdf(
+            args.input, args.archive or args.out, rows, offset, append_range, args.lang, max(1, args.workers),
+            archive=archive, **split_options(args),
+        )
+    except SplitError as e:
+        print(e, file=sys.stderr)
+        return 1
+
+    if args.archive != "-":
+        for path in saved:
+            print(path)
+    in_bytes, out_bytes = size_summary(args.input, saved)
+    print(translate(args.lang, "size_summary", input=format_bytes(in_bytes), output=format_bytes(out_bytes)),
+          file=sys.stderr)
+    if args.incremental or saved.skipped:
+        print(translate(args.lang, "incremental_summary", written=saved.written, skipped=saved.skipped,
+                        removed=len(saved.removed)), file=sys.stderr)
+    return 0
+
+
+def run_check(args, rows, offset, append_range):
+    total_pages = None
+    try:
+        if args.input:
+            reader = open_pdf(args.input, args.lang)
+            try:
+                rows, offset = resolve_plan(args.input, rows, offset, lang=args.lang, reader=reader)
+                total_pages = len(reader.pages)
+            finally:
+                close_pdf(reader)
+        elif offset == "auto":
+            print("--offset auto needs --input", file=sys.stderr)
+            return 2
+    except SplitError as e:
+        print(e, file=sys.stderr)
+        return 1
+    _specs, errors, warnings = check_plan(rows, total_pages, offset, append_range, args.lang)
+    for line in errors:
+        print(line)
+    for line in warnings:
+        print(f"warning: {line}")
+    print(f"{len(rows)} rows, {len(errors)} errors, {len(warnings)} warnings", file=sys.stderr)
+    return 1 if errors else 0
+
+
+def run_batch(args, rows, offset, append_range):
+    if args.incremental and args.archive_format:
+        print("--incremental cannot be used with --archive-format", file=sys.stderr)
+        return 2
+    inputs = expand_inputs(args.input)
+    if not inputs:
+        print("No PDF matches --input", file=sys.stderr)
+        return 2
+    plan = split_plan(rows, offset, append_range, args.lang, dict(split_options(args), archive=args.archive_format),
+                      args.bookmarks, args.every, args.max_size)
+
+    def report(done, total, item):
+        status = "ok" if item.error is None else f"FAILED: {item.error}"
+        print(f"[{done}/{total}] {item.input} -> {item.target}: {status}", file=sys.stderr)
+
+    try:
+        result = split_batch(inputs, args.out, plan, args.jobs, report)
+    except SplitError as e:
+        print(e, file=sys.stderr)
+        return 1
+    for item in result:
+        if item.error is None:
+            print(item.target)
+    print(batch_summary(result, args.lang), file=sys.stderr)
+    return 1 if result.failures else 0
+
+
+def run_serve(args):
+    server = SplitServer(
+        args.host, args.port, args.limit, args.queue_size, args.timeout, args.read_timeout, args.max_upload,
+        args.keep, args.workers, args.backend, args.lang, args.work_dir, access_log=not args.quiet,
+    )
+    try:
+        server.run()
+    except OSError as e:
+        print(f"Cannot serve on {args.host}:{args.port}: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def run_watch(args, rows, offset, append_range):
+    if not os.path.isdir(args.dir):
+        print(f"Not a folder: {args.dir}", file=sys.stderr)
+        return 2
+    plan = split_plan(rows, offset, append_range, args.lang, split_options(args), args.bookmarks, args.every,
+                      args.max_size)
+    service = WatchService(
+        args.dir, args.out, plan, args.workers, args.queue_size, args.retries, args.retry_delay,
+        args.settle, args.poll, args.report_every,
+    )
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: service.stop())
+    service.run(once=args.once)
+    return 0
 
 
 def build_ui():
+    load_tk()
     root = tk.Tk()
     root.title("PDF Cutter")
-    root.geometry("860x520")
+    root.geometry("860x680")
 
     main = ttk.Frame(root, padding=10)
     main.pack(fill="both", expand=True)
 
     lang = {"code": "ko"}
-    texts = {
-        "ko": {
-            "title": "PDF Cutter",
-            "input": "인풋 파일",
-            "output": "아웃풋 경로",
-            "browse": "찾기",
-            "filename": "파일명",
-            "start": "시작 페이지",
-            "end": "종료 페이지",
-            "switch": "전환",
-            "count": "페이지 수",
-            "add_row": "+ 행 추가",
-            "offset": "페이지 오프셋 (PDF와 목차 페이지가 다를 때)",
-            "append": "파일명에 페이지 범위 추가 (예: Filename_1p_to_5p.pdf)",
-            "run": "실행",
-            "toggle": "한/A",
-            "err_title": "오류",
-            "err_input_required": "인풋 파일을 선택하세요.",
-            "err_input_not_found": "인풋 파일을 찾을 수 없습니다.",
-            "err_output_required": "아웃풋 경로를 선택하세요.",
-            "err_output_create": "아웃풋 폴더 생성 실패: {detail}",
-            "err_offset_int": "페이지 오프셋은 정수여야 합니다.",
-            "err_pdf_open": "PDF 열기 실패: {detail}",
-            "err_row_int": "행 {row}: {field}은(는) 정수여야 합니다.",
-            "err_row_start_required": "행 {row}: 시작 페이지는 필수입니다.",
-            "err_row_start_min": "행 {row}: 시작 페이지는 1 이상이어야 합니다.",
-            "err_row_end_mode": "행 {row}: End Page 모드에서는 페이지 수를 비워야 합니다.",
-            "err_row_count_mode": "행 {row}: 페이지 수 모드에서는 End Page를 비워야 합니다.",
-            "err_row_end_min": "행 {row}: 종료 페이지는 1 이상이어야 합니다.",
-            "err_row_end_lt": "행 {row}: 종료 페이지는 시작 페이지보다 작을 수 없습니다.",
-            "err_row_count_min": "행 {row}: 페이지 수는 1 이상이어야 합니다.",
-            "err_row_required": "최소 1개 이상의 유효한 행이 필요합니다.",
-            "err_start_oob": "행 {row}: 시작 페이지가 범위를 벗어났습니다.",
-            "err_end_oob": "행 {row}: 종료 페이지가 범위를 벗어났습니다.",
-            "err_end_before": "행 {row}: 보정 후 종료 페이지가 시작 페이지보다 이릅니다.",
-            "done_title": "완료",
-            "done_saved": "{count}개 파일을 저장했습니다:\n{path}",
-        },
-        "en": {
-            "title": "PDF Cutter",
-            "input": "Input File",
-            "output": "Output Folder",
-            "browse": "Browse",
-            "filename": "Filename",
-            "start": "Start Page",
-            "end": "End Page",
-            "switch": "Switch",
-            "count": "Page Count",
-            "add_row": "+ Add Row",
-            "offset": "Page Offset (use when PDF page numbers differ)",
-            "append": "Append page range to filename (e.g., Filename_1p_to_5p.pdf)",
-            "run": "Run",
-            "toggle": "A/한",
-            "err_title": "Error",
-            "err_input_required": "Input file is required.",
-            "err_input_not_found": "Input file not found.",
-            "err_output_required": "Output folder is required.",
-            "err_output_create": "Cannot create output folder: {detail}",
-            "err_offset_int": "Page Offset must be an integer.",
-            "err_pdf_open": "Failed to open PDF: {detail}",
-            "err_row_int": "Row {row}: {field} must be an integer.",
-            "err_row_start_required": "Row {row}: Start Page is required.",
-            "err_row_start_min": "Row {row}: Start Page must be >= 1.",
-            "err_row_end_mode": "Row {row}: Page Count must be empty in End Page mode.",
-            "err_row_count_mode": "Row {row}: End Page must be empty in Page Count mode.",
-            "err_row_end_min": "Row {row}: End Page must be >= 1.",
-            "err_row_end_lt": "Row {row}: End Page cannot be less than Start Page.",
-            "err_row_count_min": "Row {row}: Page Count must be > 0.",
-            "err_row_required": "At least one valid row is required.",
-            "err_start_oob": "Row {row}: Start Page out of range.",
-            "err_end_oob": "Row {row}: End Page out of range.",
-            "err_end_before": "Row {row}: End Page earlier than Start Page after offset.",
-            "done_title": "Done",
-            "done_saved": "Saved {count} files to:\n{path}",
-        },
-    }
 
     def t(key: str) -> str:
-        return texts[lang["code"]][key]
+        return TEXTS[lang["code"]][key]
 
     def msg(key: str, **kwargs) -> str:
-        template = texts[lang["code"]][key]
+        template = TEXTS[lang["code"]][key]
         return template.format(**kwargs)
 
     def apply_texts():
@@ -206,15 +4088,29 @@ def build_ui():
         output_label_var.set(t("output"))
         browse_in_var.set(t("browse"))
         browse_out_var.set(t("browse"))
-        header_filename_var.set(t("filename"))
-        header_start_var.set(t("start"))
-        header_end_var.set(t("end"))
-        header_switch_var.set(t("switch"))
-        header_count_var.set(t("count"))
+        table.set_headings(t("filename"), t("start"), t("end"), t("switch"), t("count"))
         add_row_var.set(t("add_row"))
+        import_bookmarks_var.set(t("import_bookmarks"))
+        plan_var.set(t("plan"))
+        for index, key in enumerate(("plan_import", "plan_export", "plan_paste", "plan_copy", None,
+                                     "plan_every", "plan_max_size")):
+            if key:
+                plan_menu.entryconfigure(index, label=t(key))
         offset_label_var.set(t("offset"))
+        detect_var.set(t("detect"))
+        detect_status_var.set("")
+        printed_label_var.set(t("printed"))
         append_label_var.set(t("append"))
+        optimize_label_var.set(t("optimize"))
+        low_memory_label_var.set(t("low_memory"))
+        incremental_label_var.set(t("incremental"))
+        archive_label_var.set(t("archive"))
+        preview_label_var.set(t("preview"))
+        update_preview()
         run_var.set(t("run"))
+        cancel_var.set(t("cancel"))
+        show_input_info()
+        validate_live()
         # language buttons are handled separately
 
     def set_lang(code: str):
@@ -259,18 +4155,109 @@ def build_ui():
     input_entry.grid(row=0, column=1, padx=6, pady=4, sticky="we")
 
     def pick_input():
-        path = filedialog.askopenfilename(title="Select PDF", filetypes=[("PDF files", "*.pdf")])
-        if path:
-            input_var.set(path)
-            base = os.path.splitext(os.path.basename(path))[0]
+        # Several files make a batch: the table is applied to each of them
+        paths = filedialog.askopenfilenames(title="Select PDF", filetypes=[("PDF files", "*.pdf")])
+        if paths:
+            if len(paths) == 1:
+                input_var.set(paths[0])
+            else:
+                # Escaped so names with [, * or ? are not read as patterns
+                input_var.set(os.pathsep.join(glob.escape(path) for path in paths))
+            # Rows are named after the first input as split_batch() orders them
+            base = batch_rows_base(expand_inputs(list(paths)))
+            # Rows still named after the previous input follow the new one too
+            names = ["Filename", "파일명"] + ([re.escape(input_base["value"])] if input_base["value"] else [])
+            pattern = re.compile(rf"(?:{'|'.join(names)})_\d+")
             input_base["value"] = base
-            pattern = re.compile(r"(Filename|파일명)_\d+")
-            for idx, row in enumerate(rows, start=1):
-                current = row.filename_var.get().strip()
+            for idx, row in enumerate(model.rows, start=1):
+                current = row[0].strip()
                 if (not current) or pattern.fullmatch(current):
-                    row.filename_var.set(f"{base}_{idx}")
+                    row[0] = f"{base}_{idx}"
+            table.refresh()
+            validate_live()
 
     ttk.Button(io_frame, textvariable=browse_in_var, command=pick_input).grid(row=0, column=2, padx=4)
+    input_info_var = tk.StringVar()
+    ttk.Label(io_frame, textvariable=input_info_var, foreground="#606060", width=12).grid(row=0, column=3, sticky="w")
+
+    reader_cache = ReaderCache()
+    input_info = {"path": None, "file": None, "count": 0, "pages": None, "error": False, "pending": 0}
+    prefetched = queue.Queue()
+
+    def prefetch(pdf_path, code):
+        # Parse the input while the table is being filled in; the split reuses the cached reader
+        try:
+            backend = get_backend(lang=code)
+            with reader_cache.lease(pdf_path, code, backend) as reader:
+                prefetched.put((pdf_path, backend.page_count(reader)))
+        except Exception:
+            prefetched.put((pdf_path, None))
+
+    def poll_prefetch():
+        while True:
+            try:
+                pdf_path, pages = prefetched.get_nowait()
+            except queue.Empty:
+                break
+            input_info["pending"] -= 1
+            # A result for an input that was replaced meanwhile only warms the cache
+            if pdf_path == input_info["file"]:
+                input_info["pages"] = pages
+                input_info["error"] = pages is None
+                show_input_info()
+                validate_live()
+        if input_info["pending"]:
+            root.after(100, poll_prefetch)
+
+    def input_paths():
+        # The input box takes one PDF, or several / glob patterns joined by os.pathsep
+        text = input_var.get().strip()
+        if os.path.isfile(text):
+            return [text]
+        if os.pathsep in text or glob.has_magic(text):
+            return expand_inputs(text)
+        return [text] if text else []
+
+    def current_input():
+        # Page counts, previews and bookmarks come from the first input of a batch
+        paths = input_paths()
+        return paths[0] if paths else ""
+
+    def on_input_change(*_):
+        text = input_var.get().strip()
+        if text == input_info["path"]:
+            return
+        paths = input_paths()
+        pdf_path = paths[0] if paths else ""
+        input_info.update(path=text, file=pdf_path, count=len(paths), pages=None, error=False)
+        preview["failed"].clear()
+        if os.path.isfile(pdf_path):
+            input_info["pending"] += 1
+            if input_info["pending"] == 1:
+                root.after(100, poll_prefetch)
+            threading.Thread(target=prefetch, args=(pdf_path, lang["code"]), daemon=True).start()
+        show_input_info()
+        validate_live()
+
+    def show_input_info():
+        if input_info["count"] > 1:
+            input_info_var.set(msg("batch_inputs", count=input_info["count"]))
+        elif input_info["pages"] is not None:
+            input_info_var.set(msg("input_pages", pages=input_info["pages"]))
+        elif input_info["error"]:
+            input_info_var.set(t("input_unreadable"))
+        elif input_info["file"] and os.path.isfile(input_info["file"]):
+            input_info_var.set(t("input_reading"))
+        else:
+            input_info_var.set("")
+
+    def input_pages():
+        # Known once the prefetch of the current input has finished
+        if input_info["path"] == input_var.get().strip():
+            return input_info["pages"]
+        return None
+
+    input_var.trace_add("write", on_input_change)
 
     ttk.Label(io_frame, textvariable=output_label_var).grid(row=1, column=0, sticky="w")
     output_entry = ttk.Entry(io_frame, textvariable=output_var, width=70)
@@ -288,62 +4275,325 @@ def build_ui():
     ttk.Separator(main, orient="horizontal").pack(fill="x", pady=8)
 
     # Table
-    table_frame = tk.Frame(main, bd=1, relief="solid")
-    table_frame.pack(fill="both", expand=True)
-
-    table_frame.columnconfigure(0, weight=3)
-    table_frame.columnconfigure(1, weight=0)
-    table_frame.columnconfigure(2, weight=1, minsize=60, uniform="pagecols")
-    table_frame.columnconfigure(3, weight=0)
-    table_frame.columnconfigure(4, weight=1, minsize=60, uniform="pagecols")
-    table_frame.columnconfigure(5, weight=0)
-    table_frame.columnconfigure(6, weight=0, minsize=34)
-    table_frame.columnconfigure(7, weight=0)
-    table_frame.columnconfigure(8, weight=1, minsize=60, uniform="pagecols")
-
-    header_filename_var = tk.StringVar()
-    header_start_var = tk.StringVar()
-    header_end_var = tk.StringVar()
-    header_switch_var = tk.StringVar()
-    header_count_var = tk.StringVar()
-
-    tk.Label(table_frame, textvariable=header_filename_var, bg="#efefef", anchor="w").grid(row=0, column=0, padx=6, pady=4, sticky="we")
-    tk.Frame(table_frame, bg="#d0d0d0", width=1).grid(row=0, column=1, sticky="nsew")
-    tk.Label(table_frame, textvariable=header_start_var, bg="#efefef", anchor="center").grid(row=0, column=2, padx=6, pady=4, sticky="we")
-    tk.Frame(table_frame, bg="#d0d0d0", width=1).grid(row=0, column=3, sticky="nsew")
-    tk.Label(table_frame, textvariable=header_end_var, bg="#efefef", anchor="center").grid(row=0, column=4, padx=6, pady=4, sticky="we")
-    tk.Frame(table_frame, bg="#d0d0d0", width=1).grid(row=0, column=5, sticky="nsew")
-    tk.Label(table_frame, textvariable=header_switch_var, bg="#efefef", anchor="center").grid(row=0, column=6, padx=2, pady=4, sticky="we")
-    tk.Frame(table_frame, bg="#d0d0d0", width=1).grid(row=0, column=7, sticky="nsew")
-    tk.Label(table_frame, textvariable=header_count_var, bg="#efefef", anchor="center").grid(row=0, column=8, padx=6, pady=4, sticky="we")
-
-    ttk.Separator(table_frame, orient="horizontal").grid(row=1, column=0, columnspan=9, sticky="we")
-
-    rows = []
+    model = RowModel()
     input_base = {"value": ""}
 
+    def default_name(idx):
+        if input_base["value"]:
+            return f"{input_base['value']}_{idx + 1}"
+        return f"Filename_{idx + 1}"
+
     def on_row_change():
-        pass
+        validate_live()
+
+    table_row = ttk.Frame(main)
+    table_row.pack(fill="both", expand=True)
+    table = SplitTable(table_row, model, confirm_switch, default_name, on_row_change, lambda: update_preview())
+    table.pack(side="left", fill="both", expand=True)
+    preview_canvas = tk.Canvas(table_row, width=2 * THUMB_HEIGHT + 14, background="#ffffff",
+                               highlightthickness=0)
+    preview_canvas.bind("<Configure>", lambda e: update_preview())
+    renderer = thumbnail_renderer()
+    loader = ThumbnailLoader(renderer) if renderer is not None else None
+    preview = {"ranges": {}, "images": {}, "failed": set(), "polling": False}
+    preview_var = tk.BooleanVar(value=loader is not None)
+    preview_row_height = THUMB_HEIGHT + 22
+
+    def update_preview():
+        # Thumbnails of the first and last page of the rows in view; missing
+        # ones are requested from the loader thread and drawn when they arrive
+        if not preview_var.get():
+            return
+        canvas = preview_canvas
+        canvas.delete("all")
+        if loader is None:
+            canvas.create_text(6, 6, anchor="nw", width=2 * THUMB_HEIGHT, text=t("preview_unavailable"))
+            return
+        pdf_path = current_input()
+        if not os.path.isfile(pdf_path):
+            return
+        fit = max(1, canvas.winfo_height() // preview_row_height)
+        first_row = max(table.top, table.current - fit + 1)
+        images = {}
+        wanted = []
+        y = 4
+        for index in range(first_row, min(first_row + fit, len(model))):
+            color = "#0050b0" if index == table.current else "#303030"
+            canvas.create_text(4, y, anchor="nw", fill=color, text=f"{index + 1}. {model.rows[index][0]}"[:32])
+            for slot, page in enumerate(preview["ranges"].get(index, (None, None))):
+                x = 4 + slot * (THUMB_HEIGHT + 6)
+                top = y + 16
+                if page is None:
+                    canvas.create_text(x + THUMB_HEIGHT // 2, top + THUMB_HEIGHT // 2, text="-", fill="#a0a0a0")
+                    continue
+                key = (pdf_path, page)
+                image = preview["images"].get(key)
+                if image is None:
+                    data = loader.cached(pdf_path, page)
+                    if data is not None:
+                        image = tk.PhotoImage(data=base64.b64encode(data))
+                if image is not None:
+                    images[key] = image
+                    canvas.create_image(x, top, anchor="nw", image=image)
+                else:
+                    canvas.create_rectangle(x, top, x + THUMB_HEIGHT * 3 // 4, top + THUMB_HEIGHT, outline="#c0c0c0")
+                    canvas.create_text(x + THUMB_HEIGHT * 3 // 8, top + THUMB_HEIGHT // 2, fill="#a0a0a0",
+                                       text="?" if key in preview["failed"] else "...")
+                    if key not in preview["failed"]:
+                        wanted.append(page)
+            y += preview_row_height
+        # Only the images on screen stay referenced
+        preview["images"] = images
+        if wanted:
+            loader.request(pdf_path, list(dict.fromkeys(wanted)))
+            if not preview["polling"]:
+                preview["polling"] = True
+                root.after(100, poll_thumbnails)
+
+    def poll_thumbnails():
+        arrived = False
+        while True:
+            try:
+                pdf_path, page, data = loader.results.get_nowait()
+            except queue.Empty:
+                break
+            arrived = True
+            if data is None:
+                preview["failed"].add((pdf_path, page))
+        preview["polling"] = False
+        if arrived:
+            update_preview()
+        if not preview["polling"] and (loader.busy() or not loader.results.empty()):
+            preview["polling"] = True
+            root.after(100, poll_thumbnails)
+
+    def refresh_preview():
+        # Row ranges change with the rows, the offset and the page count
+        try:
+            offset = int(offset_var.get().strip() or "0")
+        except ValueError:
+            offset = None
+        if not preview_var.get() or offset is None or printed_var.get():
+            preview["ranges"] = {}
+        else:
+            preview["ranges"] = row_page_ranges(model.values(), input_pages(), offset)
+        update_preview()
+
+    def toggle_preview():
+        if preview_var.get():
+            preview_canvas.pack(side="right", fill="y", padx=(6, 0))
+            refresh_preview()
+        else:
+            preview_canvas.pack_forget()
+    plan_status_var = tk.StringVar()
+    ttk.Label(main, textvariable=plan_status_var, foreground="#606060", anchor="w").pack(fill="x")
+    live = {"after": None}
+
+    def validate_live():
+        # Coalesce bursts of changes (pasting, typing in the offset) into one check
+        if live["after"] is not None:
+            root.after_cancel(live["after"])
+        live["after"] = root.after(200, show_plan_status)
+
+    def show_plan_status():
+        live["after"] = None
+        refresh_preview()
+        rows_data = model.values()
+        # Nothing to say about a table that has no start pages yet
+        if printed_var.get() or not any(str(row[1]).strip() for row in rows_data):
+            plan_status_var.set("")
+            return
+        try:
+            offset = int(offset_var.get().strip() or "0")
+        except ValueError:
+            plan_status_var.set(msg("err_offset_int"))
+            return
+        _specs, errors, warnings = check_plan(rows_data, input_pages(), offset, append_var.get(), lang["code"])
+        problems = errors + warnings
+        if problems:
+            plan_status_var.set(msg("plan_status", errors=len(errors), warnings=len(warnings),
+                                    first=problems[0].replace("\n", " ")))
+        else:
+            plan_status_var.set(t("plan_ok"))
 
     def add_row():
-        idx = len(rows)
-        grid_row = 2 + idx
-        default_name = None
-        if input_base["value"]:
-            default_name = f"{input_base['value']}_{idx + 1}"
-        row = SplitRow(table_frame, idx, grid_row, on_row_change, confirm_switch, default_name=default_name)
-        rows.append(row)
-        row.set_mode(True)
+        model.append(default_name(len(model)))
+        table.focus_row(len(model) - 1)
+        validate_live()
 
     add_row()
 
+    def import_bookmarks():
+        pdf_path = current_input()
+        if not pdf_path:
+            messagebox.showerror(msg("err_title"), msg("err_input_required"))
+            return
+        try:
+            offset = int(offset_var.get().strip() or "0")
+        except ValueError:
+            messagebox.showerror(msg("err_title"), msg("err_offset_int"))
+            return
+        depth = simpledialog.askinteger(
+            t("bookmark_depth_title"), t("bookmark_depth_prompt"),
+            initialvalue=1, minvalue=1, maxvalue=10, parent=root,
+        )
+        if depth is None:
+            return
+        skipped = []
+        try:
+            backend = get_backend(lang=lang["code"])
+            with reader_cache.lease(pdf_path, lang["code"], backend) as reader:
+                imported = outline_rows(reader, depth, offset, backend, skipped)
+        except SplitError as e:
+            messagebox.showerror(msg("err_title"), str(e))
+            return
+        if not imported:
+            messagebox.showerror(msg("err_title"), msg("err_no_bookmarks"))
+            return
+
+        model.load(imported)
+        table.current = table.top = 0
+        table.refresh()
+        validate_live()
+        if skipped:
+            messagebox.showwarning(t("bookmark_depth_title"), msg("warn_bookmarks_skipped", count=len(skipped),
+                                                                   titles=", ".join(skipped)))
+
+    def detect_offset():
+        pdf_path = current_input()
+        if not pdf_path:
+            messagebox.showerror(msg("err_title"), msg("err_input_required"))
+            return
+        try:
+            with reader_cache.lease(pdf_path, lang["code"]) as reader:
+                info = page_numbering(pdf_path, reader)
+        except SplitError as e:
+            messagebox.showerror(msg("err_title"), str(e))
+            return
+        if info["offset"] is None:
+            detect_status_var.set(msg("err_detect_none"))
+            return
+        offset_var.set(str(info["offset"]))
+        detect_status_var.set(msg("detect_" + info["source"], offset=info["offset"]))
+
+    def plan_problems(rows_data):
+        # Page ranges are only checked once the prefetch knows the page count;
+        # the split itself checks them again
+        if printed_var.get():
+            return [], []
+        try:
+            offset = int(offset_var.get().strip() or "0")
+        except ValueError:
+            offset = 0
+        _specs, errors, warnings = check_plan(rows_data, input_pages(), offset, append_var.get(), lang["code"])
+        return errors, warnings
+
+    def load_plan(rows_data, options):
+        model.load(rows_data)
+        table.current = table.top = 0
+        table.refresh()
+        if "offset" in options:
+            offset_var.set(str(options["offset"]))
+        if "append_range" in options:
+            append_var.set(bool(options["append_range"]))
+        errors, warnings = plan_problems(rows_data)
+        validate_live()
+        status_var.set(msg("plan_loaded", count=len(rows_data)))
+        if errors or warnings:
+            messagebox.showwarning(msg("plan_problems_title"), format_problems(errors + warnings, lang["code"]))
+
+    def import_plan():
+        path = filedialog.askopenfilename(
+            title=t("plan_import"),
+            filetypes=[("Split plan", "*.csv *.tsv *.json"), ("All files", "*.*")],
+        )
+        if not path:
+            return
+        try:
+            rows_data, options = load_manifest(path)
+        except (OSError, ValueError, csv.Error) as e:
+            messagebox.showerror(msg("err_title"), msg("err_plan_read", detail=e))
+            return
+        load_plan(rows_data, options)
+
+    def export_plan():
+        path = filedialog.asksaveasfilename(
+            title=t("plan_export"),
+            defaultextension=".csv",
+            filetypes=[("CSV", "*.csv"), ("TSV", "*.tsv"), ("JSON", "*.json")],
+        )
+        if not path:
+            return
+        options = {"append_range": append_var.get()}
+        try:
+            options["offset"] = int(offset_var.get().strip() or "0")
+        except ValueError:
+            pass
+        try:
+            save_manifest(path, model.values(), options)
+        except OSError as e:
+            messagebox.showerror(msg("err_title"), str(e))
+
+    def paste_plan():
+        try:
+            rows_data = parse_plan_text(root.clipboard_get())
+        except (tk.TclError, csv.Error):
+            rows_data = []
+        if not rows_data:
+            messagebox.showerror(msg("err_title"), msg("err_clipboard_empty"))
+            return
+        load_plan(rows_data, {})
+
+    def chunk_plan(kind):
+        pdf_path = current_input()
+        if not pdf_path:
+            messagebox.showerror(msg("err_title"), msg("err_input_required"))
+            return
+        if kind == "pages":
+            value = simpledialog.askinteger(t("chunk_title"), t("chunk_pages_prompt"),
+                                            initialvalue=10, minvalue=1, parent=root)
+            options = {"pages_per_file": value}
+        else:
+            value = simpledialog.askfloat(t("chunk_title"), t("chunk_size_prompt"),
+                                          initialvalue=10.0, minvalue=0.01, parent=root)
+            options = {"max_bytes": int((value or 0) * 1024 * 1024)}
+        if value is None:
+            return
+        try:
+            rows_data = chunked_rows(pdf_path, lang=lang["code"], **options)
+        except SplitError as e:
+            messagebox.showerror(msg("err_title"), str(e))
+            return
+        # Chunks are physical pages
+        printed_var.set(False)
+        load_plan(rows_data, {"offset": 0})
+
+    def copy_plan():
+        # Tab separated, so it pastes straight into spreadsheet cells
+        root.clipboard_clear()
+        root.clipboard_append(plan_to_text(model.values(), "\t"))
+
     # Controls under table
     controls = ttk.Frame(main)
     controls.pack(fill="x", pady=6)
 
+    row_buttons = ttk.Frame(controls)
+    row_buttons.pack(fill="x")
     add_row_var = tk.StringVar()
-    add_btn = ttk.Button(controls, textvariable=add_row_var, command=add_row)
-    add_btn.pack(fill="x")
+    add_btn = ttk.Button(row_buttons, textvariable=add_row_var, command=add_row)
+    add_btn.pack(side="left", fill="x", expand=True)
+    import_bookmarks_var = tk.StringVar()
+    ttk.Button(row_buttons, textvariable=import_bookmarks_var, command=import_bookmarks).pack(side="left", padx=(6, 0))
+    plan_var = tk.StringVar()
+    plan_btn = ttk.Menubutton(row_buttons, textvariable=plan_var)
+    plan_menu = tk.Menu(plan_btn, tearoff=0)
+    for command in (import_plan, export_plan, paste_plan, copy_plan):
+        plan_menu.add_command(label="", command=command)
+    plan_menu.add_separator()
+    plan_menu.add_command(label="", command=lambda: chunk_plan("pages"))
+    plan_menu.add_command(label="", command=lambda: chunk_plan("size"))
+    plan_btn["menu"] = plan_menu
+    plan_btn.pack(side="left", padx=(6, 0))
 
     ttk.Separator(controls, orient="horizontal").pack(fill="x", pady=6)
 
@@ -353,6 +4603,19 @@ def build_ui():
     offset_label_var = tk.StringVar()
     ttk.Label(offset_row, textvariable=offset_label_var).pack(side="left")
     ttk.Entry(offset_row, textvariable=offset_var, width=8, justify="center").pack(side="left", padx=6)
+    detect_var = tk.StringVar()
+    ttk.Button(offset_row, textvariable=detect_var, command=detect_offset).pack(side="left")
+    detect_status_var = tk.StringVar()
+    ttk.Label(offset_row, textvariable=detect_status_var, foreground="#606060").pack(side="left", padx=6)
+
+    printed_row = ttk.Frame(controls)
+    printed_row.pack(fill="x")
+    printed_var = tk.BooleanVar(value=False)
+    printed_label_var = tk.StringVar()
+    ttk.Label(printed_row, textvariable=printed_label_var).pack(side="left")
+    ttk.Checkbutton(printed_row, text="", variable=printed_var).pack(side="left", padx=(8, 0))
+    for var in (offset_var, printed_var):
+        var.trace_add("write", lambda *_: validate_live())
 
     ttk.Separator(controls, orient="horizontal").pack(fill="x", pady=6)
 
@@ -362,76 +4625,49 @@ def build_ui():
     append_label_var = tk.StringVar()
     ttk.Label(append_row, textvariable=append_label_var).pack(side="left")
     ttk.Checkbutton(append_row, text="", variable=append_var).pack(side="left", padx=(8, 0))
+    append_var.trace_add("write", lambda *_: validate_live())
 
-    def validate_rows(total_pages):
-        specs = []
-        errors = []
-        for i, row in enumerate(rows, start=1):
-            filename = row.filename_var.get().strip()
-            start_s = row.start_var.get().strip()
-            end_s = row.end_var.get().strip()
-            count_s = row.count_var.get().strip()
-
-            if not start_s and not end_s and not count_s:
-                # Empty row, skip
-                continue
-
-            try:
-                start = parse_int(start_s)
-            except ValueError:
-                errors.append(msg("err_row_int", row=i, field=t("start")))
-                continue
-            try:
-                end = parse_int(end_s)
-            except ValueError:
-                errors.append(msg("err_row_int", row=i, field=t("end")))
-                continue
-            try:
-                count = parse_int(count_s)
-            except ValueError:
-                errors.append(msg("err_row_int", row=i, field=t("count")))
-                continue
-
-            if start is None:
-                errors.append(msg("err_row_start_required", row=i))
-                continue
-            if start <= 0:
-                errors.append(msg("err_row_start_min", row=i))
-                continue
-
-            if row.mode_use_end:
-                if count is not None:
-                    errors.append(msg("err_row_end_mode", row=i))
-                    continue
-            else:
-                if end is not None:
-                    errors.append(msg("err_row_count_mode", row=i))
-                    continue
+    optimize_row = ttk.Frame(controls)
+    optimize_row.pack(fill="x")
+    optimize_var = tk.BooleanVar(value=False)
+    optimize_label_var = tk.StringVar()
+    ttk.Label(optimize_row, textvariable=optimize_label_var).pack(side="left")
+    ttk.Checkbutton(optimize_row, text="", variable=optimize_var).pack(side="left", padx=(8, 0))
 
-            if end is not None:
-                if end <= 0:
-                    errors.append(msg("err_row_end_min", row=i))
-                    continue
-                if end < start:
-                    errors.append(msg("err_row_end_lt", row=i))
-                    continue
-            if count is not None:
-                if count <= 0:
-                    errors.append(msg("err_row_count_min", row=i))
-                    continue
+    low_memory_row = ttk.Frame(controls)
+    low_memory_row.pack(fill="x")
+    low_memory_var = tk.BooleanVar(value=False)
+    low_memory_label_var = tk.StringVar()
+    ttk.Label(low_memory_row, textvariable=low_memory_label_var).pack(side="left")
+    ttk.Checkbutton(low_memory_row, text="", variable=low_memory_var).pack(side="left", padx=(8, 0))
 
-            specs.append((filename, start, end, count, row.mode_use_end))
+    incremental_row = ttk.Frame(controls)
+    incremental_row.pack(fill="x")
+    incremental_var = tk.BooleanVar(value=False)
+    incremental_label_var = tk.StringVar()
+    ttk.Label(incremental_row, textvariable=incremental_label_var).pack(side="left")
+    ttk.Checkbutton(incremental_row, text="", variable=incremental_var).pack(side="left", padx=(8, 0))
 
-        if not specs:
-            errors.append(msg("err_row_required"))
+    archive_row = ttk.Frame(controls)
+    archive_row.pack(fill="x")
+    archive_var = tk.BooleanVar(value=False)
+    archive_label_var = tk.StringVar()
+    ttk.Label(archive_row, textvariable=archive_label_var).pack(side="left")
+    ttk.Checkbutton(archive_row, text="", variable=archive_var).pack(side="left", padx=(8, 0))
 
-        return specs, errors
+    preview_row = ttk.Frame(controls)
+    preview_row.pack(fill="x")
+    preview_label_var = tk.StringVar()
+    ttk.Label(preview_row, textvariable=preview_label_var).pack(side="left")
+    ttk.Checkbutton(preview_row, text="", variable=preview_var, command=toggle_preview).pack(side="left", padx=(8, 0))
+    toggle_preview()
 
     def run_split():
-        pdf_path = input_var.get().strip()
+        inputs = input_paths()
+        pdf_path = inputs[0] if inputs else ""
         out_dir = output_var.get().strip()
 
-        if not pdf_path:
+        if not input_var.get().strip():
             messagebox.showerror(msg("err_title"), msg("err_input_required"))
             return
         if not os.path.isfile(pdf_path):
@@ -453,68 +4689,161 @@ def build_ui():
             messagebox.showerror(msg("err_title"), msg("err_offset_int"))
             return
 
-        try:
-            reader = PdfReader(pdf_path)
-        except Exception as e:
-            messagebox.showerror(msg("err_title"), msg("err_pdf_open", detail=e))
-            return
-
-        total_pages = len(reader.pages)
-        specs, errors = validate_rows(total_pages)
+        rows_data = model.values()
+        errors, warnings = plan_problems(rows_data)
         if errors:
-            messagebox.showerror(msg("err_title"), "\n".join(errors))
+            messagebox.showerror(msg("err_title"), format_problems(errors, lang["code"]))
             return
+        if warnings and not messagebox.askyesno(
+            msg("plan_problems_title"), format_problems(warnings, lang["code"]) + msg("plan_warnings_continue")
+        ):
+            return
+        code = lang["code"]
+        append = append_var.get()
+        optimize = optimize_var.get()
+        printed = printed_var.get()
+        low_memory = low_memory_var.get()
+        incremental = incremental_var.get()
+        rows_base = input_base["value"] or None
+        archive = "zip" if archive_var.get() else None
+        target = out_dir
+        if archive:
+            target = os.path.join(out_dir, os.path.splitext(os.path.basename(pdf_path))[0] + ".zip")
+            incremental = False
+        cancel = threading.Event()
 
-        # Fill missing end using next row's start - 1, or total pages for last row
-        enriched = []
-        for i, (filename, start, end, count, mode_use_end) in enumerate(specs):
-            if end is None and count is None:
-                if i < len(specs) - 1:
-                    end = specs[i + 1][1] - 1
-                else:
-                    end = total_pages
-            if end is None and count is not None:
-                end = start + count - 1
-            enriched.append((filename, start, end))
+        def work_batch():
+            plan = split_plan(rows_data, offset, append, code, {
+                "optimize": optimize, "printed_labels": printed, "low_memory": low_memory,
+                "incremental": incremental, "archive": archive,
+            })
+            try:
+                result = split_batch(inputs, out_dir, plan,
+                                     progress=lambda done, total, _item: events.put(("batch_progress", (done, total))),
+                                     cancel=cancel, rows_base=rows_base)
+            except Exception as e:
+                events.put(("error", str(e)))
+            else:
+                events.put(("batch_done", result))
+
+        def work():
+            try:
+                saved = split_pdf(
+                    pdf_path, target, rows_data, offset, append, code,
+                    progress=lambda p: events.put(("progress", p)),
+                    cancel=cancel,
+                    optimize=optimize,
+                    printed_labels=printed,
+                    low_memory=low_memory,
+                    incremental=incremental,
+                    archive=archive,
+                    reader_cache=reader_cache,
+                )
+            except SplitCancelled as e:
+                events.put(("cancelled", e.saved))
+            except Exception as e:
+                events.put(("error", str(e)))
+            else:
+                events.put(("done", saved))
 
-        saved = []
-        for idx, (filename, start, end) in enumerate(enriched, start=1):
+        job["cancel"] = cancel
+        job["thread"] = threading.Thread(target=work_batch if len(inputs) > 1 else work)
+        set_running(True)
+        progress_var.set(0)
+        status_var.set("")
+        job["thread"].start()
+        root.after(100, poll_events, pdf_path, target)
 
-            start_idx = (start + offset) - 1
-            end_idx = (end + offset) - 1
+    def set_running(running: bool):
+        run_btn.state(["disabled"] if running else ["!disabled"])
+        cancel_btn.state(["!disabled"] if running else ["disabled"])
 
-            if start_idx < 0 or start_idx >= total_pages:
-                messagebox.showerror(msg("err_title"), msg("err_start_oob", row=idx))
-                return
-            if end_idx < start_idx:
-                messagebox.showerror(msg("err_title"), msg("err_end_before", row=idx))
-                return
-            if end_idx >= total_pages:
-                messagebox.showerror(msg("err_title"), msg("err_end_oob", row=idx))
-                return
+    def cancel_split():
+        if job["cancel"] is not None:
+            job["cancel"].set()
 
-            writer = PdfWriter()
-            for p in range(start_idx, end_idx + 1):
-                writer.add_page(reader.pages[p])
+    def show_progress(p):
+        progress_var.set(100.0 * p.pages_done / max(1, p.pages_total))
+        status_var.set(msg(
+            "status_progress",
+            segments_done=p.segments_done,
+            segments_total=p.segments_total,
+            pages_done=p.pages_done,
+            pages_total=p.pages_total,
+            size=format_bytes(p.bytes_written),
+            eta=format_eta(p.eta),
+        ))
 
-            base_name = safe_filename(filename) if filename else f"Filename_{idx}"
-            if append_var.get():
-                base_name = f"{base_name}_{start}p_to_{end}p"
+    def poll_events(pdf_path, out_dir):
+        # Worker thread -> Tk: only the main thread touches widgets
+        finished = None
+        while True:
+            try:
+                kind, payload = events.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "progress":
+                show_progress(payload)
+            elif kind == "batch_progress":
+                done, total = payload
+                progress_var.set(100.0 * done / max(1, total))
+                status_var.set(msg("batch_progress", done=done, total=total))
+            else:
+                finished = (kind, payload)
+        if finished is None:
+            root.after(100, poll_events, pdf_path, out_dir)
+            return
 
-            out_path = os.path.join(out_dir, f"{base_name}.pdf")
-            with open(out_path, "wb") as f:
-                writer.write(f)
+        job["thread"].join()
+        job["cancel"] = None
+        job["thread"] = None
+        set_running(False)
+        kind, payload = finished
+        if kind == "done":
+            in_bytes, out_bytes = size_summary(pdf_path, payload)
+            summary = msg("size_summary", input=format_bytes(in_bytes), output=format_bytes(out_bytes))
+            if payload.skipped or payload.removed:
+                summary += "\n" + msg("incremental_summary", written=payload.written, skipped=payload.skipped,
+                                      removed=len(payload.removed))
+            messagebox.showinfo(msg("done_title"), msg("done_saved", count=len(payload), path=out_dir) + "\n\n" + summary)
+        elif kind == "batch_done":
+            # One report for the whole batch instead of a dialog per file
+            if payload.failures:
+                messagebox.showwarning(msg("done_title"), batch_summary(payload, lang["code"]))
+            else:
+                messagebox.showinfo(msg("done_title"), batch_summary(payload, lang["code"]))
+        elif kind == "cancelled":
+            messagebox.showinfo(msg("cancelled_title"), msg("cancelled_saved", count=len(payload), path=out_dir))
+        else:
+            messagebox.showerror(msg("err_title"), payload)
 
-            saved.append(out_path)
+    def on_close():
+        # Let the current segment finish (or clean up) before the window goes away
+        if job["thread"] is not None:
+            job["cancel"].set()
+            job["thread"].join()
+        reader_cache.clear()
+        root.destroy()
 
-        messagebox.showinfo(msg("done_title"), msg("done_saved", count=len(saved), path=out_dir))
+    job = {"cancel": None, "thread": None}
+    events = queue.Queue()
 
     ttk.Separator(main, orient="horizontal").pack(fill="x", pady=8)
 
     run_frame = ttk.Frame(main)
     run_frame.pack(fill="x")
     run_var = tk.StringVar()
-    ttk.Button(run_frame, textvariable=run_var, command=run_split).pack(side="right")
+    cancel_var = tk.StringVar()
+    run_btn = ttk.Button(run_frame, textvariable=run_var, command=run_split)
+    run_btn.pack(side="right")
+    cancel_btn = ttk.Button(run_frame, textvariable=cancel_var, command=cancel_split)
+    cancel_btn.pack(side="right", padx=(0, 6))
+    cancel_btn.state(["disabled"])
+
+    status_var = tk.StringVar()
+    ttk.Label(main, textvariable=status_var, anchor="e").pack(fill="x", pady=(4, 0))
+
+    root.protocol("WM_DELETE_WINDOW", on_close)
 
     # Language toggle buttons (bottom-left)
     lang_wrap = ttk.Frame(run_frame)
@@ -524,13 +4853,19 @@ def build_ui():
     btn_en.pack(side="left")
     btn_ko.pack(side="left")
 
+    progress_var = tk.DoubleVar(value=0)
+    ttk.Progressbar(run_frame, variable=progress_var, maximum=100).pack(side="right", fill="x", expand=True, padx=6)
+
     apply_texts()
     set_lang("en")
 
     return root
 
 
-def main():
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv:
+        sys.exit(run_cli(argv))
     root = build_ui()
     root.mainloop()
 
@@ -0,0 +1,154 @@
+"""Split time and output correctness of every installed PDF backend.
+
+    python benchmarks/bench_backends.py
+    python benchmarks/bench_backends.py --shapes text --sizes 1000 --repeat 1
+
+Every case (shape x pages x plan, as in bench_suite.py) is split once per
+backend with split_pdf(). Each output is then checked: its page count
+matches the segment, its pages carry the input's "(Page N)" markers in
+order (text and shared shapes), it opens in every installed backend and
+every page still has the images and fonts of its input page, with the
+dictionary entries they need to render. Each case is also split once with
+optimize=True and checked the same way. Exits 1 when a check fails.
+"""
+import argparse
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PDF_Cutter import BACKENDS, available_backends, split_pdf
+from bench_suite import plan_rows
+from synthetic import SHAPES, make_pdf
+
+# Entries an image / font needs to render, compared with the input's
+IMAGE_KEYS = ("/Subtype", "/Width", "/Height", "/ColorSpace", "/BitsPerComponent")
+FONT_KEYS = ("/Subtype", "/BaseFont", "/FontDescriptor")
+PAGE_MARK = re.compile(rb"\(Page (\d+)\)")
+# Shapes whose pages carry a "(Page N)" marker in their content stream
+MARKED_SHAPES = ("text", "shared")
+
+
+def expected_ranges(rows, pages):
+    starts = [int(row[1]) for row in rows]
+    return [(start, nxt - 1) for start, nxt in zip(starts, starts[1:] + [pages + 1])]
+
+
+def page_marks(path):
+    """1-based input page number printed on each page of path (None if missing)."""
+    doc = BACKENDS["pypdf2"].open(path)
+    marks = []
+    for page in doc.pages:
+        match = PAGE_MARK.search(page.get_contents().get_data())
+        marks.append(int(match.group(1)) if match else None)
+    return marks
+
+
+def page_resources(page):
+    """Sorted descriptions of the images and fonts a page uses."""
+    resources = page.get("/Resources")
+    resources = resources.get_object() if resources is not None else {}
+    found = []
+    for kind, keys in (("/XObject", IMAGE_KEYS), ("/Font", FONT_KEYS)):
+        entries = resources.get(kind)
+        for obj in (entries.get_object().values() if entries is not None else ()):
+            obj = obj.get_object()
+            found.append((kind,) + tuple(str(obj.get(key)) if key in obj else None for key in keys))
+    return sorted(found, key=str)
+
+
+def resource_problems(path, first, source):
+    """Pages of path whose images/fonts differ from source pages first, first+1, ..."""
+    doc = BACKENDS["pypdf2"].open(path)
+    return [f"{os.path.basename(path)}: page {i + 1} lost image/font entries"
+            for i, page in enumerate(doc.pages)
+            if page_resources(page) != page_resources(source.pages[first - 1 + i])]
+
+
+def check_outputs(paths, ranges, shape, source):
+    problems = []
+    for path, (first, last) in zip(paths, ranges):
+        name = os.path.basename(path)
+        for backend_name in available_backends():
+            backend = BACKENDS[backend_name]
+            try:
+                doc = backend.open(path)
+            except Exception as e:
+                problems.append(f"{name}: does not open in {backend_name}: {e}")
+                continue
+            try:
+                count = backend.page_count(doc)
+            finally:
+                backend.close(doc)
+            if count != last - first + 1:
+                problems.append(f"{name}: {count} pages in {backend_name}, expected {last - first + 1}")
+        if shape in MARKED_SHAPES and page_marks(path) != list(range(first, last + 1)):
+            problems.append(f"{name}: pages out of order")
+        problems += resource_problems(path, first, source)
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--shapes", default=",".join(SHAPES))
+    parser.add_argument("--sizes", default="100,1000")
+    parser.add_argument("--plans", default="many,few")
+    parser.add_argument("--backends", default=",".join(available_backends()))
+    parser.add_argument("--repeat", type=int, default=3, help="keep the fastest of N runs per case")
+    args = parser.parse_args()
+
+    backends = args.backends.split(",")
+    missing = [name for name in backends if name not in available_backends()]
+    if missing:
+        print(f"Not installed: {', '.join(missing)}", file=sys.stderr)
+        return 2
+
+    tmp = tempfile.mkdtemp(prefix="pdfcutter_backends_")
+    problems = []
+    try:
+        print(f"{'case':<20} {'segs':>5} " + " ".join(f"{name + ' s':>11} {'MB':>7}" for name in backends))
+        for shape in args.shapes.split(","):
+            for pages in (int(size) for size in args.sizes.split(",")):
+                pdf_path = make_pdf(shape, os.path.join(tmp, f"{shape}_{pages}.pdf"), pages)
+                source = BACKENDS["pypdf2"].open(pdf_path)
+                for plan in args.plans.split(","):
+                    rows = plan_rows(pages, plan)
+                    ranges = expected_ranges(rows, pages)
+                    cells = []
+                    for name in backends:
+                        out_dir = os.path.join(tmp, f"out_{name}")
+                        best = None
+                        for _ in range(args.repeat):
+                            shutil.rmtree(out_dir, ignore_errors=True)
+                            started = time.perf_counter()
+                            result = split_pdf(pdf_path, out_dir, rows, append_range=False, backend=name)
+                            elapsed = time.perf_counter() - started
+                            best = elapsed if best is None else min(best, elapsed)
+                        size = sum(os.path.getsize(path) for path in result)
+                        cells.append(f"{best:>11.3f} {size / 1e6:>7.2f}")
+                        problems += [f"{shape}-{pages}-{plan} {name}: {line}"
+                                     for line in check_outputs(result, ranges, shape, source)]
+                        shutil.rmtree(out_dir, ignore_errors=True)
+                        result = split_pdf(pdf_path, out_dir, rows, append_range=False, optimize=True, backend=name)
+                        problems += [f"{shape}-{pages}-{plan} {name} optimized: {line}"
+                                     for line in check_outputs(result, ranges, shape, source)]
+                    print(f"{f'{shape}-{pages}-{plan}':<20} {len(rows):>5} " + " ".join(cells))
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    if problems:
+        print("\nProblems:")
+        for line in problems:
+            print("  " + line)
+        return 1
+    print("\nEvery output (plain and optimized) has the right pages in order with their images and fonts, "
+          "and opens in " + ", ".join(available_backends()) + ".")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
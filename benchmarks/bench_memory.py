@@ -0,0 +1,70 @@
+"""Peak RSS of a split with and without --low-memory on a large synthetic PDF.
+
+    python benchmarks/bench_memory.py --pages 300 --image-kb 1024 --segments 30
+
+Each mode runs in its own child process so the peaks don't mix (Linux/macOS).
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PDF_Cutter import peak_rss_bytes, split_pdf
+from synthetic import make_image_pdf
+
+
+def peak_rss_mb():
+    # Same probe as the metrics log; VmHWM on Linux because ru_maxrss
+    # survives exec and would report the parent's peak (the generated PDF)
+    return (peak_rss_bytes() or 0) / (1024 * 1024)
+
+
+def child(pdf_path, out_dir, segments, low_memory):
+    pages = int(os.environ["BENCH_PAGES"])
+    step = max(1, pages // segments)
+    rows = [(f"Seg_{i + 1}", str(1 + i * step), "", "", True) for i in range(segments) if i * step < pages]
+    started = time.perf_counter()
+    split_pdf(pdf_path, out_dir, rows, low_memory=low_memory)
+    print(f"{time.perf_counter() - started:.3f} {peak_rss_mb():.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=300)
+    parser.add_argument("--image-kb", type=int, default=1024)
+    parser.add_argument("--segments", type=int, default=30)
+    parser.add_argument("--child", nargs=3, metavar=("PDF", "OUT", "MODE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        pdf_path, out_dir, mode = args.child
+        child(pdf_path, out_dir, args.segments, mode == "low")
+        return
+
+    tmp = tempfile.mkdtemp(prefix="pdfcutter_mem_")
+    try:
+        pdf_path = make_image_pdf(os.path.join(tmp, "input.pdf"), args.pages, args.image_kb)
+        size_mb = os.path.getsize(pdf_path) / (1024 * 1024)
+        print(f"input: {args.pages} pages, {size_mb:.0f} MB, {args.segments} segments")
+        print(f"{'mode':>8} {'seconds':>9} {'peak RSS MB':>12}")
+        env = dict(os.environ, BENCH_PAGES=str(args.pages))
+        for mode in ("default", "low"):
+            out_dir = os.path.join(tmp, f"out_{mode}")
+            result = subprocess.run(
+                [sys.executable, __file__, "--segments", str(args.segments), "--child", pdf_path, out_dir, mode],
+                env=env, capture_output=True, text=True, check=True,
+            )
+            seconds, peak = result.stdout.split()
+            print(f"{mode:>8} {float(seconds):>9.3f} {float(peak):>12.1f}")
+            shutil.rmtree(out_dir, ignore_errors=True)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""How segment writing scales from 1 to N worker processes.
+
+    python benchmarks/bench_parallel.py --pages 870 --segments 120 --max-workers 8
+    python benchmarks/bench_parallel.py --backend pikepdf
+
+Runs on PyPDF2 unless --backend says otherwise, so the numbers stay
+comparable with earlier runs whatever backend "auto" would pick.
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PDF_Cutter import available_backends, split_pdf
+from synthetic import make_text_pdf
+
+
+def even_rows(pages, segments):
+    step = max(1, pages // segments)
+    return [(f"Seg_{i + 1}", str(1 + i * step), "", "", True) for i in range(segments) if i * step < pages]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=870)
+    parser.add_argument("--segments", type=int, default=120)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--backend", choices=available_backends(), default="pypdf2")
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="pdfcutter_bench_")
+    try:
+        pdf_path = make_text_pdf(os.path.join(tmp, "input.pdf"), args.pages)
+        rows = even_rows(args.pages, args.segments)
+        baseline = None
+        print(f"{args.pages} pages, {len(rows)} segments, {args.backend} backend")
+        print(f"{'workers':>7} {'seconds':>9} {'pages/s':>9} {'speedup':>8}")
+        for workers in range(1, args.max_workers + 1):
+            best = None
+            for _ in range(args.repeat):
+                out_dir = os.path.join(tmp, f"out_{workers}")
+                shutil.rmtree(out_dir, ignore_errors=True)
+                started = time.perf_counter()
+                split_pdf(pdf_path, out_dir, rows, workers=workers, backend=args.backend)
+                elapsed = time.perf_counter() - started
+                best = elapsed if best is None else min(best, elapsed)
+            baseline = baseline or best
+            print(f"{workers:>7} {best:>9.3f} {args.pages / best:>9.1f} {baseline / best:>7.2f}x")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""Load test of the HTTP API (PDF_Cutter.py serve).
+
+    python benchmarks/bench_server.py --requests 100 --concurrency 8
+    python benchmarks/bench_server.py --url http://127.0.0.1:8765 --format files
+
+Without --url a SplitServer is started in this process on a free loopback
+port with --limit and --queue-size. Every client thread posts the same
+generated PDF with an every-N-pages plan, reads the whole response and
+records its latency; the run reports requests per second, latency
+percentiles and the count of every non-200 status. Exits 1 when a request
+failed (503s from a full queue count as failures).
+"""
+import argparse
+import asyncio
+import http.client
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PDF_Cutter import SERVE_FORMATS, SplitServer
+from synthetic import SHAPES, make_pdf
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def post_split(host, port, body, plan, fmt, timeout):
+    """(status, response bytes) of one POST /split; downloads the files of format=files too."""
+    conn = http.client.HTTPConnection(host, port, timeout=timeout)
+    try:
+        query = urllib.parse.urlencode({"format": fmt, "name": "bench"})
+        conn.request("POST", f"/split?{query}", body=body,
+                     headers={"Content-Type": "application/pdf", "X-Split-Plan": json.dumps(plan)})
+        response = conn.getresponse()
+        data = response.read()
+    finally:
+        conn.close()
+    if response.status != 200 or fmt != "files":
+        return response.status, len(data)
+    size = 0
+    for entry in json.loads(data)["files"]:
+        conn = http.client.HTTPConnection(host, port, timeout=timeout)
+        try:
+            conn.request("GET", entry["url"])
+            size += len(conn.getresponse().read())
+        finally:
+            conn.close()
+    return 200, size
+
+
+def start_server(args, work_dir):
+    server = SplitServer("127.0.0.1", 0, args.limit, args.queue_size, args.timeout, work_dir=work_dir,
+                         access_log=False)
+    ready = threading.Event()
+    thread = threading.Thread(target=lambda: asyncio.run(server.serve(ready)), daemon=True)
+    thread.start()
+    ready.wait()
+    return server, thread
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", help="server to test (default: start one in this process)")
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=4, help="client threads")
+    parser.add_argument("--shape", choices=sorted(SHAPES), default="text")
+    parser.add_argument("--pages", type=int, default=100)
+    parser.add_argument("--every", type=int, default=10, help="pages per segment")
+    parser.add_argument("--format", choices=SERVE_FORMATS, default="zip")
+    parser.add_argument("--limit", type=int, default=2, help="splits at once of the in-process server")
+    parser.add_argument("--queue-size", type=int, default=64, help="waiting requests of the in-process server")
+    parser.add_argument("--timeout", type=float, default=300.0)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="pdfcutter_serve_bench_")
+    server = thread = None
+    try:
+        pdf_path = make_pdf(args.shape, os.path.join(tmp, "input.pdf"), args.pages)
+        with open(pdf_path, "rb") as f:
+            body = f.read()
+        if args.url:
+            url = urllib.parse.urlsplit(args.url)
+            host, port = url.hostname, url.port or 80
+        else:
+            server, thread = start_server(args, os.path.join(tmp, "server"))
+            host, port = "127.0.0.1", server.port
+
+        plan = {"every": args.every}
+        latencies = []
+        statuses = Counter()
+        received = [0]
+        lock = threading.Lock()
+        remaining = [args.requests]
+
+        def client():
+            while True:
+                with lock:
+                    if not remaining[0]:
+                        return
+                    remaining[0] -= 1
+                started = time.perf_counter()
+                try:
+                    status, size = post_split(host, port, body, plan, args.format, args.timeout)
+                except (OSError, http.client.HTTPException) as e:
+                    status, size = type(e).__name__, 0
+                elapsed = time.perf_counter() - started
+                with lock:
+                    statuses[status] += 1
+                    received[0] += size
+                    if status == 200:
+                        latencies.append(elapsed)
+
+        started = time.perf_counter()
+        clients = [threading.Thread(target=client) for _ in range(max(1, args.concurrency))]
+        for t in clients:
+            t.start()
+        for t in clients:
+            t.join()
+        wall = time.perf_counter() - started
+    finally:
+        if server is not None:
+            server.stop()
+            thread.join()
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    ok = statuses.pop(200, 0)
+    print(f"{args.requests} requests, {args.concurrency} clients, {args.pages}-page {args.shape} PDF "
+          f"({len(body) / 1e6:.2f} MB), every {args.every} pages, format {args.format}")
+    print(f"  requests/s   {ok / wall:>9.2f}  ({ok} ok in {wall:.2f}s)")
+    print(f"  pages/s      {ok * args.pages / wall:>9.0f}")
+    print(f"  received     {received[0] / 1e6:>9.2f} MB")
+    if latencies:
+        print(f"  latency p50  {percentile(latencies, 0.50) * 1000:>9.1f} ms")
+        print(f"  latency p95  {percentile(latencies, 0.95) * 1000:>9.1f} ms")
+        print(f"  latency max  {max(latencies) * 1000:>9.1f} ms")
+    for status, count in sorted(statuses.items(), key=str):
+        print(f"  {status}: {count}")
+    return 1 if statuses else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+"""Stage-level timings of the split pipeline on generated PDFs.
+
+    python benchmarks/bench_suite.py --out results.json
+    python benchmarks/bench_suite.py --baseline results.json --threshold 0.2
+
+Every case is shape x pages x plan:
+  shapes  text (per-page font copies), images (32 KB image per page),
+          shared (one font and one logo image on every page)
+  pages   100, 1000, 10000
+  plans   many (5-page segments) or few (4 segments)
+
+Timed stages: PdfReader open, validate_rows, range enrichment
+(resolve_ends + plan_segments), PdfWriter build and PdfWriter write,
+the last two summed over all segments. Results are written as JSON; with
+--baseline the run fails (exit 1) when a stage got slower than the
+threshold allows.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import PyPDF2
+from PyPDF2 import PdfReader
+
+from PDF_Cutter import build_writer, plan_segments, resolve_ends, validate_rows
+from synthetic import SHAPES, make_pdf
+
+STAGES = ("open", "validate", "enrich", "build", "write")
+# Stages faster than this are noise, not regressions
+MIN_COMPARABLE_SECONDS = 0.005
+
+
+def plan_rows(pages, plan):
+    if plan == "many":
+        step = 5
+    else:
+        step = max(1, -(-pages // 4))
+    return [(f"Seg_{i + 1}", str(start), "", "", True) for i, start in enumerate(range(1, pages + 1, step))]
+
+
+def run_case(pdf_path, pages, plan, scratch):
+    rows = plan_rows(pages, plan)
+    timings = {}
+
+    started = time.perf_counter()
+    reader = PdfReader(pdf_path)
+    total_pages = len(reader.pages)
+    timings["open"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    specs, errors = validate_rows(rows, total_pages)
+    timings["validate"] = time.perf_counter() - started
+    if errors:
+        raise RuntimeError("\n".join(errors))
+
+    started = time.perf_counter()
+    segments = plan_segments(resolve_ends(specs, total_pages), 0, total_pages)
+    timings["enrich"] = time.perf_counter() - started
+
+    build = write = 0.0
+    for segment in segments:
+        started = time.perf_counter()
+        writer = build_writer(reader, segment)
+        build += time.perf_counter() - started
+        started = time.perf_counter()
+        with open(os.path.join(scratch, segment.name), "wb") as f:
+            writer.write(f)
+        write += time.perf_counter() - started
+    timings["build"] = build
+    timings["write"] = write
+    return len(segments), timings
+
+
+def compare(cases, baseline, threshold):
+    """Return human-readable regressions of cases against a baseline run."""
+    old = {case["name"]: case for case in baseline.get("cases", [])}
+    regressions = []
+    for case in cases:
+        before = old.get(case["name"])
+        if before is None:
+            continue
+        for stage in STAGES + ("total",):
+            was = before["stages"].get(stage)
+            now = case["stages"][stage]
+            if was is None or was < MIN_COMPARABLE_SECONDS:
+                continue
+            if now > was * (1 + threshold):
+                regressions.append(f"{case['name']} {stage}: {was:.4f}s -> {now:.4f}s (+{now / was - 1:.0%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--shapes", default=",".join(SHAPES))
+    parser.add_argument("--sizes", default="100,1000,10000")
+    parser.add_argument("--plans", default="many,few")
+    parser.add_argument("--repeat", type=int, default=3, help="keep the fastest of N runs per case")
+    parser.add_argument("--out", help="write results JSON here")
+    parser.add_argument("--baseline", help="earlier results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown per stage (0.2 = 20%%)")
+    parser.add_argument("--cache-dir", help="keep generated PDFs here between runs")
+    args = parser.parse_args()
+
+    shapes = args.shapes.split(",")
+    sizes = [int(size) for size in args.sizes.split(",")]
+    plans = args.plans.split(",")
+
+    cache_dir = args.cache_dir or tempfile.mkdtemp(prefix="pdfcutter_suite_")
+    os.makedirs(cache_dir, exist_ok=True)
+    scratch = tempfile.mkdtemp(prefix="pdfcutter_out_")
+    cases = []
+    try:
+        print(f"{'case':<22} {'segs':>5} " + " ".join(f"{s:>9}" for s in STAGES) + f" {'pages/s':>9}")
+        for shape in shapes:
+            for pages in sizes:
+                pdf_path = os.path.join(cache_dir, f"{shape}_{pages}.pdf")
+                if not os.path.isfile(pdf_path):
+                    make_pdf(shape, pdf_path, pages)
+                for plan in plans:
+                    best = None
+                    for _ in range(args.repeat):
+                        count, timings = run_case(pdf_path, pages, plan, scratch)
+                        if best is None:
+                            best = timings
+                        else:
+                            best = {stage: min(best[stage], timings[stage]) for stage in STAGES}
+                    best["total"] = sum(best[stage] for stage in STAGES)
+                    case = {
+                        "name": f"{shape}-{pages}-{plan}",
+                        "shape": shape,
+                        "pages": pages,
+                        "plan": plan,
+                        "segments": count,
+                        "input_bytes": os.path.getsize(pdf_path),
+                        "stages": best,
+                        "pages_per_second": pages / best["total"] if best["total"] else None,
+                    }
+                    cases.append(case)
+                    print(f"{case['name']:<22} {count:>5} "
+                          + " ".join(f"{best[s]:>9.4f}" for s in STAGES)
+                          + f" {case['pages_per_second']:>9.0f}")
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+        if not args.cache_dir:
+            shutil.rmtree(cache_dir, ignore_errors=True)
+
+    results = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "pypdf2": PyPDF2.__version__,
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+        },
+        "cases": cases,
+    }
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(cases, baseline, args.threshold)
+        if regressions:
+            print("\nRegressions:")
+            for line in regressions:
+                print("  " + line)
+            return 1
+        print(f"\nNo stage slower than the baseline by more than {args.threshold:.0%}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
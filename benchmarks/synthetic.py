@@ -0,0 +1,138 @@
+"""Offline synthetic PDF generator for the benchmarks (needs only PyPDF2)."""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyPDF2 import PdfWriter
+from PyPDF2.generic import (
+    DecodedStreamObject,
+    DictionaryObject,
+    NameObject,
+    NumberObject,
+)
+
+LOREM = (
+    "Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod "
+    "tempor incididunt ut labore et dolore magna aliqua."
+)
+
+
+def _font(writer):
+    font = DictionaryObject()
+    font[NameObject("/Type")] = NameObject("/Font")
+    font[NameObject("/Subtype")] = NameObject("/Type1")
+    font[NameObject("/BaseFont")] = NameObject("/Helvetica")
+    return writer._add_object(font)
+
+
+def _text_stream(page_no, lines):
+    ops = ["BT", "/F1 10 Tf", "40 800 Td", "12 TL"]
+    ops.append(f"(Page {page_no}) Tj T*")
+    for i in range(lines):
+        ops.append(f"({LOREM} {i}) Tj T*")
+    ops.append("ET")
+    stream = DecodedStreamObject()
+    stream.set_data("\n".join(ops).encode("latin-1"))
+    return stream
+
+
+def _image(writer, side, data=None):
+    image = DecodedStreamObject()
+    image.set_data(data if data is not None else os.urandom(side * side))
+    image[NameObject("/Type")] = NameObject("/XObject")
+    image[NameObject("/Subtype")] = NameObject("/Image")
+    image[NameObject("/Width")] = NumberObject(side)
+    image[NameObject("/Height")] = NumberObject(side)
+    image[NameObject("/ColorSpace")] = NameObject("/DeviceGray")
+    image[NameObject("/BitsPerComponent")] = NumberObject(8)
+    return writer._add_object(image)
+
+
+def _new_page(writer):
+    writer.add_blank_page(595, 842)
+    # add_blank_page returns a copy; edit the page the writer will save
+    return writer.pages[-1]
+
+
+def _save(writer, path):
+    with open(path, "wb") as f:
+        writer.write(f)
+    return path
+
+
+def make_text_pdf(path, pages, lines=40, shared_font=True):
+    """Write a text-only PDF.
+
+    With shared_font every page points at one font object; without it each
+    page carries its own identical copy, as some producers do.
+    """
+    writer = PdfWriter()
+    font_ref = _font(writer)
+    for n in range(1, pages + 1):
+        page = _new_page(writer)
+        resources = DictionaryObject()
+        fonts = DictionaryObject()
+        fonts[NameObject("/F1")] = font_ref if shared_font or n == 1 else _font(writer)
+        resources[NameObject("/Font")] = fonts
+        page[NameObject("/Resources")] = resources
+        page[NameObject("/Contents")] = writer._add_object(_text_stream(n, lines))
+    return _save(writer, path)
+
+
+def make_image_pdf(path, pages, image_kb=1024):
+    """Write an image-heavy PDF: one incompressible gray image per page.
+
+    The file is about pages * image_kb KB, which is what makes a reader that
+    keeps every page in memory grow with the document.
+    """
+    side = int((image_kb * 1024) ** 0.5)
+    writer = PdfWriter()
+    for n in range(1, pages + 1):
+        page = _new_page(writer)
+        xobjects = DictionaryObject()
+        xobjects[NameObject("/Im1")] = _image(writer, side)
+        resources = DictionaryObject()
+        resources[NameObject("/XObject")] = xobjects
+        page[NameObject("/Resources")] = resources
+        contents = DecodedStreamObject()
+        contents.set_data(b"q 595 0 0 842 0 0 cm /Im1 Do Q")
+        page[NameObject("/Contents")] = writer._add_object(contents)
+    return _save(writer, path)
+
+
+def make_shared_pdf(path, pages, logo_kb=64, lines=20):
+    """Write text pages that all share one font and one logo image.
+
+    Every segment written from it has to carry the shared objects once.
+    """
+    side = int((logo_kb * 1024) ** 0.5)
+    writer = PdfWriter()
+    font_ref = _font(writer)
+    logo_ref = _image(writer, side)
+    for n in range(1, pages + 1):
+        page = _new_page(writer)
+        fonts = DictionaryObject()
+        fonts[NameObject("/F1")] = font_ref
+        xobjects = DictionaryObject()
+        xobjects[NameObject("/Logo")] = logo_ref
+        resources = DictionaryObject()
+        resources[NameObject("/Font")] = fonts
+        resources[NameObject("/XObject")] = xobjects
+        page[NameObject("/Resources")] = resources
+        text = _text_stream(n, lines)
+        text.set_data(b"q 80 0 0 80 480 740 cm /Logo Do Q\n" + text.get_data())
+        page[NameObject("/Contents")] = writer._add_object(text)
+    return _save(writer, path)
+
+
+SHAPES = {
+    "text": lambda path, pages: make_text_pdf(path, pages, shared_font=False),
+    "images": lambda path, pages: make_image_pdf(path, pages, image_kb=32),
+    "shared": make_shared_pdf,
+}
+
+
+def make_pdf(shape, path, pages):
+    """Generate one of the SHAPES at path with the given page count."""
+    return SHAPES[shape](path, pages)
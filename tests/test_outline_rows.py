@@ -0,0 +1,43 @@
+import os
+import sys
+
+import pytest
+from PyPDF2 import PdfReader, PdfWriter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PDF_Cutter import available_backends, check_plan, get_backend, outline_rows
+
+
+@pytest.fixture
+def front_matter_pdf(tmp_path):
+    # Cover and Preface sit before printed page 1 (physical page 5, so offset 4)
+    writer = PdfWriter()
+    for _ in range(10):
+        writer.add_blank_page(200, 200)
+    for title, page_index in (("Cover", 0), ("Preface", 2), ("Chapter 1", 4), ("Chapter 2", 7)):
+        writer.add_outline_item(title, page_index)
+    path = tmp_path / "book.pdf"
+    with open(path, "wb") as f:
+        writer.write(f)
+    return str(path)
+
+
+@pytest.mark.parametrize("backend_name", available_backends())
+def test_bookmarks_before_printed_page_one_are_skipped(front_matter_pdf, backend_name):
+    backend = get_backend(backend_name)
+    reader = backend.open(front_matter_pdf)
+    skipped = []
+    try:
+        rows = outline_rows(reader, 1, 4, backend, skipped)
+    finally:
+        backend.close(reader)
+    assert [row[:2] for row in rows] == [("Chapter 1", "1"), ("Chapter 2", "4")]
+    assert skipped == ["Cover", "Preface"]
+    _specs, errors, _warnings = check_plan(rows, 10, 4)
+    assert errors == []
+
+
+def test_offset_zero_keeps_every_bookmark(front_matter_pdf):
+    rows = outline_rows(PdfReader(front_matter_pdf), 1, 0)
+    assert [row[1] for row in rows] == ["1", "3", "5", "8"]